@@ -6,10 +6,20 @@ Website: https://github.com/adambullmer/sublime-docblockr-python
 Credit to `spadgos` and the team at DocBlockr for providing some source code
 to support this project
 """
+import logging
+
 import sublime
 
+from .commands import cache_manager, get_locator, load_settings, parser_settings, project_settings_of
+from .core.settings import DEFAULTS
+from .core.warmup import warm_up
 from .formatters.registry import populate_registry
 
+log = logging.getLogger(__name__)
+
+# Milliseconds to let the editor settle before warming up
+WARM_UP_DELAY = 500
+
 plugin_is_loaded = False
 
 
@@ -21,3 +31,31 @@ def plugin_loaded():
     plugin_is_loaded = True
 
     sublime.active_window()
+
+    settings = load_settings()
+    cache_size = settings.get('cache_size')
+    if not isinstance(cache_size, (int, float)) or cache_size <= 0:
+        cache_size = DEFAULTS['cache_size']
+
+    cache_manager.max_bytes = int(cache_size * 1024 * 1024)
+
+    if settings.get('warm_up'):
+        sublime.set_timeout_async(warm_up_editor, WARM_UP_DELAY)
+
+
+def warm_up_editor():
+    """Warm up with the settings of the active view, and index its docstrings.
+
+    Runs off the main thread, so that the first docstring of the session, rather
+    than the editor start, is spared the cost.
+    """
+    window = sublime.active_window()
+    view = window.active_view() if window is not None else None
+
+    if view is None or not view.score_selector(0, 'source.python'):
+        seconds = warm_up(load_settings())
+    else:
+        seconds = warm_up(parser_settings(view), project_settings_of(view))
+        get_locator(view).docstrings()
+
+    log.debug('warmed up in {:.1f} ms'.format(seconds * 1000))
@@ -6,17 +6,95 @@ Website: https://github.com/adambullmer/sublime-docblockr-python
 Credit to `spadgos` and the team at DocBlockr for providing some source code
 to support this project
 """
+import cProfile
 import logging
+import os
 import re
+import time
 
 import sublime
 import sublime_plugin
 
-from .formatters.utils import get_formatter, get_setting
-from .parsers.parser import get_parser
+from .formatters.regenerate import diff, template
+from .core import profiling
+from .core.settings import DEFAULTS, Settings
+from .formatters.utils import count_fields, create_snippet, escape, get_formatter_instance, plain_text
+from .parsers.cache import CacheManager, ViewCache
+from .parsers.context import analyze_view
+from .parsers.locator import ScopeLocator
+from .parsers.parser import PythonParser
+from .parsers.scanner import classify_rows, scan_definitions, strip_comment
 
 log = logging.getLogger(__name__)
 
+# Profile of the next runs of the docstring command, armed by `docblockr_python_profile`
+profile_session = None
+
+# Last invocation of the docstring command profiled or recorded
+last_invocation = None
+
+RECORDING_NAME = 'invocations.jsonl.gz'
+
+PLATFORM_NAMES = {
+    'osx': 'OSX',
+    'windows': 'Windows',
+    'linux': 'Linux',
+}
+
+# Budget of the caches of the commands and the listeners, and the scope locators
+# they share
+cache_manager = CacheManager()
+locators = ViewCache('locators', cache_manager)
+
+
+def load_settings(project_settings=None):
+    """Stack the package settings of the editor, from the defaults to the project.
+
+    Merges up settings as specified in Sublime's docs.
+    https://www.sublimetext.com/docs/3/settings.html
+
+    Keyword Arguments:
+        project_settings {dict} -- `DocblockrPython` settings of the project (default: {None})
+
+    Returns:
+        {core.settings.Settings} -- Layered settings
+    """
+    platform_name = PLATFORM_NAMES.get(sublime.platform(), 'Linux')
+
+    return Settings(
+        DEFAULTS,
+        sublime.load_settings('DocblockrPython.sublime-settings'),
+        sublime.load_settings('DocblockrPython ({}).sublime-settings'.format(platform_name)),
+        project_settings,
+    )
+
+
+def project_settings_of(view):
+    """Return the `DocblockrPython` settings of the project a view belongs to."""
+    window = view.window()
+    project_data = (window.project_data() if window is not None else None) or {}
+
+    return project_data.get('DocblockrPython', {})
+
+
+def parser_settings(view):
+    """Return the settings given to the parser, the view settings over the package settings.
+
+    Arguments:
+        view {sublime.View} -- View the parser reads
+
+    Returns:
+        {core.settings.Settings} -- Layered settings, holding `type_rules` among others
+    """
+    return load_settings(project_settings_of(view)).with_layer(view.settings())
+
+
+def formatter_of(view):
+    """Return the formatter set for the project of a view, or in the settings."""
+    project_settings = project_settings_of(view)
+
+    return get_formatter_instance(load_settings(project_settings).get('formatter'), project_settings)
+
 
 def write(view, string):
     """Write a string to the view as a snippet.
@@ -29,137 +107,422 @@ def write(view, string):
     view.run_command('insert_snippet', {'contents': string})
 
 
-def escape(string):
-    r"""Escape the special characters.
+def write_plain(view, edit, snippet):
+    """Write a snippet to the view as plain text, selecting its first placeholder.
+
+    Inserting a snippet with hundreds of fields is slow, and so is tabbing through
+    them. The text is inserted as is instead, indented like the snippet would be.
 
-    Escapes characters that are also in snippet tab fields so that inserting into the view
-    doesn't accidentally create another tabbable field
     Arguments:
-        string {String} -- String to be excaped
+        view    {sublime.View} -- view to have content written to
+        edit    {sublime.Edit} -- Sublime Edit buffer
+        snippet {String}       -- String representation of a snippet
+    """
+    position = view.sel()[0].begin()
+    indent = re.match(r'[ \t]*', view.substr(view.line(position))).group(0)
+    text, field = plain_text(snippet, indent, get_indent_unit(view.settings()))
+
+    view.insert(edit, position, text)
+
+    if field is not None:
+        view.sel().clear()
+        view.sel().add(sublime.Region(position + field[0], position + field[1]))
+
+
+def select(view, point):
+    """Move the cursor of a view to a point, and scroll it into view."""
+    view.sel().clear()
+    view.sel().add(sublime.Region(point))
+    view.show_at_center(point)
+
+
+def get_indent_unit(view_settings):
+    """Return the text a level of indentation is made of in a view."""
+    if view_settings.get('translate_tabs_to_spaces'):
+        return ' ' * view_settings.get('tab_size', 4)
+
+    return '\t'
+
+
+def capture_invocation(view):
+    """Snapshot everything a run of the docstring command at the cursor depends on.
+
+    Arguments:
+        view {sublime.View} -- View the command runs in
+
+    Returns:
+        {core.profiling.Invocation} -- Buffer text, cursor offset, settings and formatter
+    """
+    project_settings = project_settings_of(view)
+
+    return profiling.Invocation(
+        view.substr(sublime.Region(0, view.size())),
+        view.sel()[0].end(),
+        parser_settings(view).snapshot(),
+        load_settings(project_settings).get('formatter'),
+        project_settings,
+    )
+
+
+def show_profile(window, profile):
+    """Write a profile to the cache directory, and show its hotspots in an output panel.
+
+    Arguments:
+        window  {sublime.Window}   -- Window to show the panel in
+        profile {cProfile.Profile} -- Profile of one or more runs
+    """
+    path = profiling.write_stats(profile, os.path.join(sublime.cache_path(), 'DocBlockr_Python'))
+    text = 'Profile written to {}\n\n{}'.format(path, profiling.summarize(profile))
+
+    panel = window.create_output_panel('docblockr_python_profile')
+    panel.run_command('append', {'characters': text})
+    window.run_command('show_panel', {'panel': 'output.docblockr_python_profile'})
+
+
+class ProfileSession:
+    """Profile gathered over the next runs of the docstring command.
+
+    Variables:
+        remaining {int} -- Runs left to profile
+        profile {cProfile.Profile} -- Profile of the runs so far
+    """
+
+    def __init__(self, runs):
+        """---."""
+        self.remaining = runs
+        self.profile = cProfile.Profile()
+
+    def run(self, function, *args):
+        """Run a function under the profiler, counting down the runs left.
+
+        Arguments:
+            function {callable} -- Function to profile
+            *args {object} -- Arguments of the function
+
+        Returns:
+            {bool} -- Whether it was the last run of the session
+        """
+        self.profile.runcall(function, *args)
+        self.remaining -= 1
+
+        return self.remaining <= 0
+
+
+def get_locator(view):
+    """Return the scope locator of the current state of a view's buffer."""
+    locator = locators.get(view, ScopeLocator, lambda: ScopeLocator(view))
+
+    # Shared by the clones of the view, which may have closed the one it was made for
+    locator.view = view
+    return locator
+
+
+def find_docstring(view, position):
+    """Find the region of the docstring containing a position.
+
+    Uses the scopes of the syntax when it scopes docstrings, and scans the file
+    for definitions otherwise.
+
+    Arguments:
+        view     {sublime.View} -- View to search
+        position {Integer}      -- Position within the docstring
+
+    Returns:
+        {sublime.Region} Region from the opening to the closing quotes, or None
+    """
+    locator = get_locator(view)
+    if locator.docstrings():
+        return locator.docstring_at(position)
 
-    Examples:
-        >>> escape('function $test() {}')
-        'function \$test() \{\}'
+    row = view.rowcol(position)[0]
+    rows = classify_rows(view.substr(sublime.Region(0, view.size())).split('\n'))
+
+    for definition in scan_definitions(rows):
+        if definition.docstring is None or not definition.docstring[0] <= row <= definition.docstring[1]:
+            continue
+
+        first = view.line(view.text_point(definition.docstring[0], 0))
+        text = view.substr(first)
+        begin = first.begin() + len(text) - len(text.lstrip())
+        return sublime.Region(begin, view.line(view.text_point(definition.docstring[1], 0)).end())
+
+    return None
+
+
+def docstring_edits(view, docstring, templates):
+    """Convert the edits regenerating a docstring into view regions.
+
+    Arguments:
+        view      {sublime.View}   -- View holding the docstring
+        docstring {sublime.Region} -- Region of the docstring, spanning several lines
+        templates {list}           -- Template lines of the new docstring sections
 
     Returns:
-        {String} String with escaped characters
+        {list} (region, text) pairs, from the last to the first position
+    """
+    first_line = view.line(docstring.begin())
+    body_begin = first_line.end() + 1
+    body = view.substr(sublime.Region(body_begin, docstring.end()))
+
+    # The closing quotes are kept, along with whatever precedes them on their line
+    body = re.sub(r'("""|\'\'\')\s*$', '', body)
+    old_lines = body.split('\n')
+    closing_own_line = old_lines[-1].strip() == ''
+    if closing_own_line:
+        old_lines.pop()
+
+    indent = re.match(r'\s*', view.substr(first_line)).group(0)
+    starts = [body_begin]
+    for line in old_lines:
+        starts.append(starts[-1] + len(line) + 1)
+
+    regions = []
+    for edit in diff(old_lines, templates):
+        start = starts[edit.row]
+        if edit.kind == 'replace':
+            regions.append((sublime.Region(start + edit.begin, start + edit.end), edit.text))
+        elif edit.kind == 'erase':
+            if edit.row + 1 < len(old_lines) or closing_own_line:
+                regions.append((sublime.Region(start, start + len(old_lines[edit.row]) + 1), ''))
+            else:
+                regions.append((sublime.Region(start - 1, start + len(old_lines[edit.row])), ''))
+        elif edit.row < len(old_lines) or closing_own_line:
+            regions.append((sublime.Region(start), ''.join(line + '\n' for line in edit.text)))
+        else:
+            end = starts[-1] - 1
+            regions.append((sublime.Region(end), ''.join('\n' + line for line in edit.text) + '\n' + indent))
+
+    return sorted(regions, key=lambda pair: (pair[0].begin(), pair[0].size() > 0), reverse=True)
+
+
+def regenerate_edits(view, docstring, parser, formatter):
+    """Compute the edits bringing a docstring up to date with its definition.
+
+    Arguments:
+        view      {sublime.View}         -- View holding the docstring
+        docstring {sublime.Region}       -- Region of the docstring, spanning several lines
+        parser    {PythonParser}         -- Parser of the definition
+        formatter {formatters.base.Base} -- Formatter the docstring is written with
 
+    Returns:
+        {list} (region, text) pairs, from the last to the first position
     """
-    return string.replace('$', r'\$').replace('{', r'\{').replace('}', r'\}')
+    position = docstring.begin()
+    # The lines of the docstring itself aren't part of the definition's contents
+    output = parser.parse(
+        parser.get_definition(view, position, get_locator(view)),
+        parser.read_contents(view, view.line(position).end(), docstring.end()),
+    )
+
+    indent = re.match(r'\s*', view.substr(view.line(position))).group(0)
+    templates = template(formatter, output, indent, get_indent_unit(view.settings()))
+
+    return docstring_edits(view, docstring, templates)
 
 
 class DocblockrPythonCommand(sublime_plugin.TextCommand):
     """Sublime Text Command.
 
-    Command to be run by Sublime Text
+    Command to be run by Sublime Text. Nothing is stored between runs: every run
+    analyzes the view afresh, so that commands of several views never share state.
 
     Extends:
         sublime_plugin.TextCommand
-
-    Variables:
-        position        {Integer}
-        trailing_rgn    {String}
-        trailing_string {String}
-        settings        {String}
-        indent_spaces   {String}
-        parser          {Object}
-        line            {String}
-        contents        {String}
     """
 
-    position = 0
-    trailing_rgn = ''
-    trailing_string = ''
-    settings = ''
-    indent_spaces = ''
-    parser = object
-    line = ''
-    contents = ''
-    view_settings = None
-    project_settings = None
-
     def run(self, edit):
         """Sublime Command Entrypoint.
 
         Entrypoint for the Sublime Text Command. Outputs the result of the parsing to
-        the view.
+        the view, under the profiler while `docblockr_python_profile` asks for it, and
+        recorded when `record_invocations` is set.
 
         Arguments:
             edit {sublime.edit} -- Sublime Edit buffer
         """
-        self.initialize(self.view)
+        global last_invocation, profile_session
+
+        recording = parser_settings(self.view).get('record_invocations')
+        if profile_session is None and not recording:
+            self.write_docstring(edit)
+            return
+
+        invocation = last_invocation = capture_invocation(self.view)
+        start = time.perf_counter()
+        if profile_session is None:
+            self.write_docstring(edit)
+            seconds = time.perf_counter() - start
+            profiled = False
+        else:
+            profiled = profile_session.run(self.write_docstring, edit)
+            # The profiler slows the run down, its time would mislead
+            seconds = None
+
+        if recording:
+            path = os.path.join(sublime.cache_path(), 'DocBlockr_Python', RECORDING_NAME)
+            # Compressing and writing the whole file stays off the UI thread
+            sublime.set_timeout_async(lambda: profiling.record(path, invocation, seconds), 0)
+
+        if profiled:
+            show_profile(self.view.window(), profile_session.profile)
+            profile_session = None
+
+    def write_docstring(self, edit):
+        """Write the docstring opened at the cursor.
+
+        Arguments:
+            edit {sublime.edit} -- Sublime Edit buffer
+        """
+        view = self.view
+        settings = parser_settings(view)
+        context = analyze_view(view, view.sel()[0].end(), settings, get_locator(view))
 
         # If this docstring is already closed, then generate a new line
-        if self.parser.is_docstring_closed(self.view, self.view.sel()[0].end()) is True:
-            write(self.view, '\n')
+        if context.closed:
+            write(view, '\n')
             return
 
-        self.view.erase(edit, self.trailing_rgn)
+        log.debug('definition -- {}'.format(context.definition))
+        view.erase(edit, sublime.Region(*context.erase))
+        snippet = self.create_snippet(context)
+
+        max_fields = settings.get('snippet_max_fields')
+        if max_fields is not None and count_fields(snippet) > max_fields:
+            write_plain(view, edit, snippet)
+        else:
+            write(view, snippet)
+
+    def create_snippet(self, context):
+        """Format a Sublime Text snippet syntax string.
+
+        Iterates through the list of field groups, and then through each item
+        in the group to create the snippets using the user specified formatter.
+
+        Arguments:
+            context {DocstringContext} -- Analysis of the docstring to write
 
-        output = self.parser.parse(self.line, self.contents)
+        Returns:
+            str -- sublime text formatted snippet string
 
-        snippet = self.create_snippet(output)
-        write(self.view, snippet)
+        """
+        summary = escape(context.trailing_string)
+        return create_snippet(self.get_formatter(), context.parsed, summary, context.closing_string)
+
+    def get_formatter(self):
+        """Return the formatter set for the project, or in the settings."""
+        return formatter_of(self.view)
 
-    def initialize(self, view):
-        """Set up the command's settings.
 
-        Begins preparsing the file to gather some basic information.
-        - Which parser to use
-        - Store any trailing characters
+class DocblockrPythonRegenerateCommand(DocblockrPythonCommand):
+    """Bring the docstring under the cursor up to date with its definition.
+
+    Rather than writing the whole docstring again, only the entries that changed are
+    edited: entries of removed parameters are erased, new ones are inserted, and
+    retyped ones have the changed text replaced. The summary, the description, and
+    any text typed in the placeholders are kept.
+
+    Extends:
+        DocblockrPythonCommand
+    """
+
+    def run(self, edit):
+        """Sublime Command Entrypoint.
 
         Arguments:
-            view {sublime.View} -- The view to be edited
+            edit {sublime.edit} -- Sublime Edit buffer
         """
-        self.view_settings = view.settings()
+        view = self.view
+        docstring = find_docstring(view, view.sel()[0].begin())
 
-        project_data = view.window().project_data() or {}
-        self.project_settings = project_data.get('DocblockrPython', {})
+        if docstring is None or view.line(docstring.begin()).end() >= docstring.end():
+            sublime.status_message('DocBlockr Python: no multi-line docstring to regenerate')
+            return
 
-        position = view.sel()[0].end()
+        parser = PythonParser(parser_settings(view))
 
-        # trailing characters are put inside the body of the comment
-        self.trailing_rgn = sublime.Region(position, view.line(position).end())
-        self.trailing_string = view.substr(self.trailing_rgn).strip()
-        # drop trailing '"""'
-        self.trailing_string = escape(re.sub(r'\s*("""|\'\'\')\s*$', '', self.trailing_string))
+        for region, text in regenerate_edits(view, docstring, parser, self.get_formatter()):
+            if region.empty():
+                view.insert(edit, region.begin(), text)
+            elif text:
+                view.replace(edit, region, text)
+            else:
+                view.erase(edit, region)
 
-        self.parser = parser = get_parser(view)
 
-        # read the previous line
-        self.line = parser.get_definition(view, position)
-        self.contents = parser.get_definition_contents(view, view.line(position).end())
-        log.debug('contents -- {}'.format(self.contents))
+class DocblockrPythonDocumentCommand(sublime_plugin.TextCommand):
+    """Document a definition from anywhere in the view.
 
-    def create_snippet(self, parsed_attributes):
-        """Format a Sublime Text snippet syntax string.
+    Opens a docstring under a definition without one and writes it, or brings the
+    docstring of a definition up to date with its signature.
 
-        Iterates through the list of field groups, and then through each item
-        in the group to create the snippets using the user specified formatter.
+    Extends:
+        sublime_plugin.TextCommand
+    """
 
-        Arguments:
-            parsed_attributes {dict} -- key value of attributes groups
+    def run(self, edit, row, body, docstring=None):
+        """Sublime Command Entrypoint.
 
-        Returns:
-            str -- sublime text formatted snippet string
+        Arguments:
+            edit {sublime.edit} -- Sublime Edit buffer
+            row  {int}          -- Row of the `def` or `class` line
+            body {int}          -- First row after the signature
 
+        Keyword Arguments:
+            docstring {int} -- First row of the docstring, None if there is none (default: {None})
         """
-        project_formatter = self.project_settings.get('formatter', None)
-        formatter = get_formatter(project_formatter or get_setting('formatter'))()
+        view = self.view
+
+        if docstring is not None:
+            line = view.substr(view.line(view.text_point(docstring, 0)))
+            # Just inside the opening quotes
+            select(view, view.text_point(docstring, len(line) - len(line.lstrip()) + 3))
+            view.run_command('docblockr_python_regenerate')
+            return
+
+        signature_end = view.line(view.text_point(body - 1, 0))
+        if not strip_comment(view.substr(signature_end)).rstrip().endswith(':'):
+            # The body follows on the same line, there's no room for a docstring
+            select(view, view.text_point(row, 0))
+            return
+
+        definition = view.substr(view.line(view.text_point(row, 0)))
+        indent = definition[:len(definition) - len(definition.lstrip())] + get_indent_unit(view.settings())
+        point = signature_end.end() + view.insert(edit, signature_end.end(), '\n{}"""'.format(indent))
+
+        select(view, point)
+        view.run_command('docblockr_python')
+
+
+class DocblockrPythonProfileCommand(sublime_plugin.TextCommand):
+    """Profile the docstring command, to diagnose a slow run on a given file.
 
-        # Make sure the summary line has the trailing text, or a placeholder
-        if not self.trailing_string:
-            self.trailing_string = formatter.summary()
+    The next runs of the docstring command are profiled, or the last profiled
+    invocation is replayed outside of the view. Either way, the statistics are
+    written to a `.pstats` file and the top functions shown in an output panel.
 
-        snippet = self.trailing_string + formatter.description()
+    Extends:
+        sublime_plugin.TextCommand
+    """
 
-        for attribute_type, attributes in parsed_attributes:
-            if len(attributes) is 0:
-                continue
+    def run(self, edit, runs=1, replay=False):
+        """Sublime Command Entrypoint.
 
-            segment = getattr(formatter, attribute_type)
-            snippet += segment(attributes)
+        Arguments:
+            edit {sublime.edit} -- Sublime Edit buffer
+
+        Keyword Arguments:
+            runs {int} -- Number of runs of the docstring command to profile (default: {1})
+            replay {bool} -- Replay the last profiled invocation instead, or one at the
+                cursor if there is none (default: {False})
+        """
+        global profile_session
 
-        snippet += self.parser.closing_string
+        if not replay:
+            profile_session = ProfileSession(runs)
+            sublime.status_message('DocBlockr Python: profiling the next {} docstrings'.format(runs))
+            return
 
-        return snippet
+        invocation = last_invocation or capture_invocation(self.view)
+        profile = cProfile.Profile()
+        profile.runcall(profiling.replay, invocation)
+        show_profile(self.view.window(), profile)
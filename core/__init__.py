@@ -0,0 +1,73 @@
+"""Editor independent core of DocBlockr Python.
+
+Gathers the parser, the formatters, their registry and the settings model behind a
+single import, none of which imports `sublime`. The Sublime Text adapter lives in
+the top level `commands`, `listeners` and `DocblockrPython` modules.
+
+Submodules are only imported when one of their names is first used, so that tools
+starting in a bare interpreter pay for what they use. Module level `__getattr__`
+needs python 3.7, so the module replaces itself with a module subclass providing it.
+"""
+import importlib
+import sys
+import types
+
+from .settings import DEFAULTS, Settings, default_settings  # noqa: F401
+
+_EXPORTS = {
+    'DocstringContext': 'parsers.context',
+    'analyze': 'parsers.context',
+    'analyze_view': 'parsers.context',
+    'PythonParser': 'parsers.parser',
+    'Region': 'parsers.view',
+    'StringView': 'parsers.view',
+    'parse_definitions': 'parsers.scanner',
+    'create_sections': 'formatters.utils',
+    'create_snippet': 'formatters.utils',
+    'escape': 'formatters.utils',
+    'get_formatter_instance': 'formatters.utils',
+    'REGISTRY': 'formatters.registry',
+    'populate_registry': 'formatters.registry',
+    'warm_up': 'core.warmup',
+}
+
+# Package holding `core`, `parsers` and `formatters`, empty when they are top level
+_PACKAGE = __name__.rpartition('.')[0]
+
+__all__ = [
+    'DEFAULTS',
+    'Settings',
+    'default_settings',
+] + sorted(_EXPORTS)
+
+
+def _submodule(module):
+    """Import a module of the package holding `core`, like `parsers.parser`."""
+    return importlib.import_module('{}.{}'.format(_PACKAGE, module) if _PACKAGE else module)
+
+
+class _LazyModule(types.ModuleType):
+    """Module importing the submodule exporting a name on first use."""
+
+    def __getattr__(self, name):
+        """---."""
+        if name not in _EXPORTS:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(self.__name__, name))
+
+        value = getattr(_submodule(_EXPORTS[name]), name)
+        setattr(self, name, value)
+
+        return value
+
+    def __dir__(self):
+        """---."""
+        return __all__
+
+
+_module = _LazyModule(__name__, __doc__)
+_module.__dict__.update(globals())
+
+# Python before 3.4 clears the globals of a module once it's collected, and the
+# functions above still use them
+_module._original = sys.modules[__name__]
+sys.modules[__name__] = _module
@@ -0,0 +1,106 @@
+"""Incremental docstring checks of a file that keeps changing.
+
+The checks of `formatters.lint` are run on every definition of a file, but the
+findings of each definition are remembered along with a fingerprint of its text.
+When the file is checked again, definitions whose text didn't change, even if they
+moved, reuse their findings, and only the others are parsed and checked again.
+"""
+import hashlib
+
+from . import _submodule
+
+
+def fingerprint(rows, definition):
+    """Hash the text of a definition, from its first row to its last.
+
+    Arguments:
+        rows {list} -- Rows classified by `parsers.scanner.classify_rows`
+        definition {Definition} -- Definition to fingerprint
+
+    Returns:
+        {bytes} -- Digest of the kind and the text of the definition
+    """
+    digest = hashlib.sha1(definition.kind.encode('utf-8'))
+
+    for row in range(definition.start, definition.end + 1):
+        digest.update(b'\n')
+        digest.update(rows[row].text.encode('utf-8', 'replace'))
+
+    return digest.digest()
+
+
+class IncrementalLint:
+    """Docstring findings of a file, kept between checks.
+
+    Variables:
+        findings {list} -- `formatters.lint.Finding` tuples of the last check, by row
+        pending {int} -- Definitions the last check left for later, over its limit
+        change_count {int} -- Change count of the text the findings are about, if given
+    """
+
+    def __init__(self):
+        """---."""
+        self.findings = []
+        self.pending = 0
+        self.change_count = None
+        self._known = {}
+        self._checker = None
+
+    def check(self, text, formatter, settings=None, limit=None, change_count=None):
+        """Check the definitions of a file that changed since the last check.
+
+        Arguments:
+            text {str} -- Contents of the file
+            formatter {formatters.base.Base} -- Formatter the docstrings are written with
+
+        Keyword Arguments:
+            settings {dict} -- Settings given to the parser (default: {None})
+            limit {int} -- Most definitions checked, the others are left for the next
+                check (default: {None})
+            change_count {int} -- Change count of the text, kept with the findings (default: {None})
+
+        Returns:
+            {int} -- Number of definitions checked
+        """
+        scanner = _submodule('parsers.scanner')
+        check_definition = _submodule('formatters.lint').check_definition
+        parser = _submodule('parsers.parser').PythonParser(settings)
+
+        # Findings depend on the formatter and the type rules too
+        checker = (formatter, repr(settings.get('type_rules')) if settings is not None else None)
+        if checker != self._checker:
+            self._known = {}
+            self._checker = checker
+
+        rows = scanner.classify_rows(text.split('\n'))
+        known = {}
+        findings = []
+        checked = pending = 0
+
+        for definition in scanner.scan_definitions(rows):
+            key = fingerprint(rows, definition)
+            relative = known.get(key, self._known.get(key))
+
+            if relative is None:
+                if limit is not None and checked >= limit:
+                    pending += 1
+                    continue
+
+                parsed = ()
+                if definition.kind == 'function' and definition.docstring is not None:
+                    parsed = parser.parse(*scanner.definition_source(rows, definition))
+
+                start = definition.start
+                found = check_definition(formatter, rows, definition, parsed)
+                relative = [finding._replace(row=finding.row - start) for finding in found]
+                checked += 1
+
+            known[key] = relative
+            findings.extend(finding._replace(row=finding.row + definition.start) for finding in relative)
+
+        self._known = known
+        self.findings = sorted(findings)
+        self.pending = pending
+        self.change_count = change_count
+
+        return checked
@@ -0,0 +1,123 @@
+"""Recording, replay and profiling of docstring invocations outside of the editor.
+
+An `Invocation` holds everything a run of the docstring command depends on: the
+text of the buffer, the cursor offset, the settings and the formatter. Replaying
+it runs the parser and formatter path of the command against a string, so a slow
+run can be profiled, or benchmarked, away from the view it happened in.
+
+Recordings are gzip files of JSON lines, one per invocation. Every record is
+compressed as a gzip member of its own, so recording appends to the file without
+rewriting it, and the file reads back as a single stream.
+"""
+import gzip
+import io
+import json
+import os
+import pstats
+import time
+from collections import namedtuple
+
+from . import _submodule
+
+PROFILE_LIMIT = 20
+
+Invocation = namedtuple('Invocation', [
+    'text',                # text of the whole buffer
+    'offset',              # position of the cursor, right after the opening quotes
+    'settings',            # plain dict of the package settings, from `Settings.snapshot`
+    'formatter',           # name of the formatter
+    'formatter_settings',  # settings the formatter instance was created with
+])
+
+
+def replay(invocation):
+    """Generate the docstring of an invocation, as the docstring command would.
+
+    Arguments:
+        invocation {Invocation} -- Invocation to replay
+
+    Returns:
+        {str} -- Snippet the command would write, '\\n' if the docstring was closed
+    """
+    utils = _submodule('formatters.utils')
+    _submodule('formatters.registry').populate_registry()
+
+    context = _submodule('parsers.context').analyze(invocation.text, invocation.offset, invocation.settings)
+    if context.closed:
+        return '\n'
+
+    formatter = utils.get_formatter_instance(invocation.formatter, invocation.formatter_settings or None)
+    return utils.create_snippet(formatter, context.parsed, utils.escape(context.trailing_string),
+                                context.closing_string)
+
+
+def record(path, invocation, seconds):
+    """Append an invocation, and the seconds it took, to a recording.
+
+    Arguments:
+        path {str} -- Path of the recording, created along with its directory if missing
+        invocation {Invocation} -- Invocation to record
+        seconds {float} -- Seconds the invocation took in the editor, None if it was profiled
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    line = json.dumps(dict(invocation._asdict(), seconds=seconds, time=time.time()), separators=(',', ':'))
+    with gzip.open(path, 'ab') as recording:
+        recording.write(line.encode('utf-8') + b'\n')
+
+
+def read_recording(path):
+    """Read the invocations of a recording.
+
+    Arguments:
+        path {str} -- Path of the recording
+
+    Yields:
+        {tuple} -- `Invocation`, and the seconds it took in the editor, None if it was profiled
+    """
+    with gzip.open(path, 'rb') as recording:
+        for line in recording:
+            if not line.strip():
+                continue
+
+            fields = json.loads(line.decode('utf-8'))
+            yield Invocation(*(fields[name] for name in Invocation._fields)), fields.get('seconds')
+
+
+def summarize(profile, limit=PROFILE_LIMIT):
+    """Describe the functions a profile spent the most time in.
+
+    Arguments:
+        profile {cProfile.Profile} -- Profile of one or more runs
+
+    Keyword Arguments:
+        limit {int} -- Number of functions listed (default: {PROFILE_LIMIT})
+
+    Returns:
+        {str} -- Statistics sorted by cumulative time
+    """
+    stream = io.StringIO()
+    pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(limit)
+
+    return stream.getvalue()
+
+
+def write_stats(profile, directory):
+    """Write the statistics of a profile to a new `.pstats` file.
+
+    Arguments:
+        profile {cProfile.Profile} -- Profile of one or more runs
+        directory {str} -- Directory of the file, created if missing
+
+    Returns:
+        {str} -- Path of the file, to be read with `pstats` or `snakeviz`
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    path = os.path.join(directory, 'docblockr_python_{}.pstats'.format(int(time.time() * 1000)))
+    profile.dump_stats(path)
+
+    return path
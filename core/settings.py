@@ -0,0 +1,114 @@
+"""Settings model shared by the editor adapter and the headless tools.
+
+Settings are read through a stack of layers, the last layer holding a key wins. A
+layer is anything with a `get(key, default)` method, so plain dicts and
+`sublime.Settings` objects can be stacked alike, without this module importing the
+editor.
+"""
+import json
+import os
+import re
+
+DEFAULTS = {
+    'formatter': 'docblock',
+    'type_rules': [],
+    'snippet_max_fields': 100,
+    'warm_up': True,
+    'cache_size': 32,
+    'record_invocations': False,
+    'lint_on_save': True,
+    'lint_max_definitions': 200,
+}
+
+SETTINGS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'DocblockrPython.sublime-settings')
+
+COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/|("(?:\\.|[^"\\])*")', re.DOTALL)
+
+_missing = object()
+
+
+class Settings:
+    """Layered, read only settings.
+
+    Variables:
+        layers {tuple} -- Layers from the lowest to the highest precedence
+    """
+
+    def __init__(self, *layers):
+        """Stack the layers, ignoring the ones that are None.
+
+        Arguments:
+            *layers {dict} -- Layers from the lowest to the highest precedence
+        """
+        self.layers = tuple(layer for layer in layers if layer is not None)
+
+    def get(self, key, default=None):
+        """Return the value of a setting from the highest layer holding it.
+
+        Arguments:
+            key {str} -- Name of the setting
+
+        Keyword Arguments:
+            default {object} -- Value if no layer holds the setting (default: {None})
+
+        Returns:
+            {object} -- Value of the setting
+        """
+        for layer in reversed(self.layers):
+            value = layer.get(key, _missing)
+            if value is not _missing:
+                return value
+
+        return default
+
+    def __getitem__(self, key):
+        """---."""
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+
+        return value
+
+    def __contains__(self, key):
+        """---."""
+        return self.get(key, _missing) is not _missing
+
+    def snapshot(self, keys=None):
+        """Return the current values of settings as a plain dict.
+
+        Keyword Arguments:
+            keys {list} -- Names of the settings (default: {None}, every package setting)
+
+        Returns:
+            {dict} -- Values by name, ready to be serialized
+        """
+        return dict((key, self.get(key)) for key in (keys if keys is not None else sorted(DEFAULTS)))
+
+    def with_layer(self, layer):
+        """Return new settings with a layer stacked on top of these."""
+        return Settings(*(self.layers + (layer,)))
+
+
+def read_settings_file(path=SETTINGS_FILE):
+    """Read a `.sublime-settings` file, which is JSON allowing comments.
+
+    Keyword Arguments:
+        path {str} -- Path of the file (default: {SETTINGS_FILE})
+
+    Returns:
+        {dict} -- Settings of the file, empty if it doesn't exist
+    """
+    try:
+        with open(path, encoding='utf-8') as settings_file:
+            text = settings_file.read()
+    except (IOError, OSError):
+        return {}
+
+    # Drop the comments, but keep any string that merely looks like one
+    return json.loads(COMMENT_RE.sub(lambda match: match.group(1) or '', text))
+
+
+def default_settings():
+    """Return the settings of the package defaults, for use outside of the editor."""
+    return Settings(DEFAULTS, read_settings_file())
@@ -0,0 +1,47 @@
+"""Warm-up of the state the first docstring would otherwise build.
+
+Parsing and formatting a sample definition imports every module on the way, fills
+the regex cache for the patterns compiled on the fly, compiles the type rules of
+the settings and creates the shared formatter instance. The first docstring the
+user asks for then costs what any other does.
+"""
+import time
+
+from . import _submodule
+from .settings import default_settings
+
+SAMPLE = (
+    'class Sample(Base):\n'
+    '    @property\n'
+    '    def sample(self, name: str, count=1, *args, is_set=False, **kwargs) -> int:\n'
+    '        """\n'
+    '        raise ValueError(name)\n'
+    '        yield count\n'
+)
+
+
+def warm_up(settings=None, formatter_settings=None):
+    """Parse and format a sample definition with the given settings.
+
+    Keyword Arguments:
+        settings {core.settings.Settings} -- Settings of the parser, and the formatter name
+            (default: {None}, the package defaults)
+        formatter_settings {dict} -- Settings the formatter instance is created with (default: {None})
+
+    Returns:
+        {float} -- Seconds the warm-up took
+    """
+    start = time.perf_counter()
+    settings = settings if settings is not None else default_settings()
+
+    _submodule('formatters.registry').populate_registry()
+    utils = _submodule('formatters.utils')
+    formatter = utils.get_formatter_instance(settings.get('formatter'), formatter_settings)
+
+    context = _submodule('parsers.context').analyze(SAMPLE, SAMPLE.index('"""') + 3, settings)
+    snippet = utils.create_snippet(formatter, context.parsed, '', context.closing_string)
+    utils.plain_text(snippet)
+    _submodule('formatters.regenerate').template(formatter, context.parsed)
+    _submodule('parsers.scanner').parse_definitions(SAMPLE, _submodule('parsers.parser').PythonParser(settings))
+
+    return time.perf_counter() - start
@@ -52,6 +52,7 @@ class Base(metaclass=FormatterMeta):
 
     Variables:
         name {str} -- The name the formatter will be registered under.
+        sections {dict} -- Section dispatch table, built when the class is registered
         tab_index {generator} -- Provides a simple count generator for convenience
                                  in making tabbable fields
     """
@@ -59,24 +60,24 @@ class Base(metaclass=FormatterMeta):
     name = None
     tab_index = counter()
 
+    def __init__(self, settings=None):
+        """Bind the section dispatch table to the instance.
+
+        Keyword Arguments:
+            settings {dict} -- Settings the instance is created for (default: {None})
+        """
+        self.settings = settings or {}
+        self._bound_sections = dict(
+            (section, method.__get__(self, type(self))) for section, method in self.sections.items()
+        )
+
     def __dict__(self):
         """---."""
-        return {
-            'summary': self.summary,
-            'description': self.description,
-            'decorators': self.decorators,
-            'extends': self.extends,
-            'arguments': self.arguments,
-            'keyword_arguments': self.keyword_arguments,
-            'returns': self.returns,
-            'yields': self.yields,
-            'raises': self.raises,
-            'variables': self.variables,
-        }
+        return self._bound_sections
 
     def __iter__(self):
         """---."""
-        for attr, value in self.__dict__().items():
+        for attr, value in self._bound_sections.items():
             yield attr, value
 
     def _generate_field(self, name, value=None):
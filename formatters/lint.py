@@ -0,0 +1,173 @@
+"""Docstring checks of scanned definitions.
+
+Two checks are run on the definitions found by `parsers.scanner`:
+
+- missing docstring: the definition has no docstring at all
+- signature drift: the docstring documents parameters, but they no longer match the
+  signature. Parameters are missing, retyped, or gone from the signature.
+
+Drift is found the same way `regenerate` finds what to edit, by aligning the
+docstring with the entries the formatter would write for the current signature.
+Docstrings that don't document any parameter are left alone.
+"""
+import re
+from collections import namedtuple
+
+from .regenerate import RETYPED, align, is_entry, template
+
+MISSING_DOCSTRING = 'missing-docstring'
+SIGNATURE_DRIFT = 'signature-drift'
+
+QUOTES = ('"""', "'''")
+
+# Stand-in signature, rendered to recognize parameter entries of any name
+PROBE_ARGUMENTS = ('arguments', {
+    'arguments': [{'name': 'name', 'type': None, 'default': None}],
+    'keyword_arguments': [{'name': 'name', 'type': None, 'default': 'None'}],
+})
+
+Finding = namedtuple('Finding', [
+    'row',      # zero based row the finding is about
+    'check',    # MISSING_DOCSTRING or SIGNATURE_DRIFT
+    'name',     # name of the definition
+    'message',  # description of the problem
+])
+
+
+def docstring_lines(rows, definition):
+    """Return the lines of a docstring after its summary line, without the closing quotes.
+
+    Arguments:
+        rows {list} -- Rows classified by `parsers.scanner.classify_rows`
+        definition {Definition} -- Definition holding a docstring
+
+    Returns:
+        {list} -- Lines of the docstring body, empty for a single line docstring
+    """
+    first, last = definition.docstring
+    if first == last:
+        return []
+
+    lines = [rows[row].text for row in range(first + 1, last + 1)]
+    closing = max(lines[-1].rfind(quotes) for quotes in QUOTES)
+    if closing != -1:
+        lines[-1] = lines[-1][:closing]
+
+    if not lines[-1].strip():
+        lines.pop()
+
+    return lines
+
+
+def signature_drift(formatter, rows, definition, parsed):
+    """Compare the parameters documented by a docstring with the signature.
+
+    Arguments:
+        formatter {formatters.base.Base} -- Formatter the docstrings are written with
+        rows {list} -- Rows classified by `parsers.scanner.classify_rows`
+        definition {Definition} -- Function holding a docstring
+        parsed {list} -- (attribute type, attributes) pairs from the parser
+
+    Returns:
+        {list} -- `Finding` for every missing, retyped or removed parameter
+    """
+    lines = docstring_lines(rows, definition)
+    first_text = rows[definition.docstring[0]].text
+    indent = first_text[:len(first_text) - len(first_text.lstrip())]
+    indent_unit = '\t' if '\t' in indent else '    '
+
+    templates, argument_rows = _templates(formatter, parsed, indent, indent_unit)
+    probes = [line for line in template(formatter, [PROBE_ARGUMENTS], indent, indent_unit) if line.key]
+    pairs = align(lines, templates)
+    paired = dict((j, (i, rating)) for i, j, rating in pairs)
+
+    # Lines explained by the other sections, like raised exceptions, aren't parameters
+    explained = set(i for i, j, _ in pairs if j not in argument_rows)
+    documented = {}
+    for i, old in enumerate(lines):
+        name = None if i in explained else _entry_name(old, probes)
+        if name is not None:
+            documented.setdefault(name.lstrip('*'), i)
+
+    if not documented:
+        return []
+
+    findings = []
+    body = definition.docstring[0] + 1
+    signature = ' '.join(rows[row].text for row in range(definition.row, definition.body))
+    names = set()
+
+    for j in sorted(argument_rows):
+        name = templates[j].key and templates[j].key[0].lstrip('*')
+        if not name:
+            continue
+
+        names.add(name)
+        if name not in documented:
+            findings.append((definition.row, 'parameter `{}` is not documented'.format(name)))
+        elif j in paired and paired[j][1] == RETYPED and _annotated(signature, name):
+            findings.append((body + paired[j][0], 'documented type of `{}` differs from the signature'.format(name)))
+
+    for name, i in documented.items():
+        if name not in names:
+            findings.append((body + i, 'documents `{}`, which the signature no longer has'.format(name)))
+
+    return [Finding(row, SIGNATURE_DRIFT, definition.name, message) for row, message in sorted(findings)]
+
+
+def _templates(formatter, parsed, indent, indent_unit):
+    """Render the sections of a signature, telling which lines document arguments."""
+    templates = []
+    argument_rows = set()
+    for attribute_type, attributes in parsed:
+        if not attributes:
+            continue
+
+        section = template(formatter, [(attribute_type, attributes)], indent, indent_unit)
+        if attribute_type == 'arguments':
+            argument_rows.update(range(len(templates), len(templates) + len(section)))
+
+        templates.extend(section)
+
+    return templates, argument_rows
+
+
+def _entry_name(line, probes):
+    """Return the name of the parameter a line documents, or None."""
+    for probe in probes:
+        if is_entry(line, probe.shape, probe.kinds):
+            return probe.shape.match(line).group(probe.kinds.index('name') + 1)
+
+    return None
+
+
+def _annotated(signature, name):
+    """Tell whether a parameter has a type annotation in a signature."""
+    return re.search(r'\b{}\s*:'.format(re.escape(name)), signature) is not None
+
+
+def check_definition(formatter, rows, definition, parsed):
+    """Run every check on a definition.
+
+    Arguments:
+        formatter {formatters.base.Base} -- Formatter the docstrings are written with
+        rows {list} -- Rows classified by `parsers.scanner.classify_rows`
+        definition {Definition} -- Definition to check
+        parsed {list} -- (attribute type, attributes) pairs from the parser
+
+    Returns:
+        {list} -- `Finding` tuples, empty if the definition passes
+    """
+    if definition.docstring is None:
+        # Empty files, like most `__init__.py`, have nothing to document
+        if definition.kind == 'module' and not any(row.text.strip() for row in rows):
+            return []
+
+        message = '{} `{}` has no docstring'.format(definition.kind, definition.name) if definition.name else \
+            'module has no docstring'
+        return [Finding(definition.row or 0, MISSING_DOCSTRING, definition.name, message)]
+
+    if definition.kind != 'function':
+        return []
+
+    return signature_drift(formatter, rows, definition, parsed)
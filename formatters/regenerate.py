@@ -0,0 +1,384 @@
+"""Minimal edits bringing an existing docstring up to date with its definition.
+
+The sections of the new docstring are rendered twice through the formatter: once
+as they would be inserted, and once with every parsed name and value swapped for a
+marker. The first rendering tells whether an existing line is still accurate, with
+placeholder fields matching whatever the user typed in their place. The second one
+tells which existing lines are generated entries, and which entry they document,
+so that a retyped parameter is paired with its old line rather than added again.
+
+Lines are then aligned, lines made of fields alone only with lines of their own
+section, and only the difference is edited: entries for removed names are erased,
+new entries are inserted, and retyped entries have the changed span replaced.
+Summary, description and any other text written by the user is never touched.
+"""
+import re
+from collections import namedtuple
+
+from .utils import FIELD_RE, UNESCAPE_RE, create_sections
+
+NAME = '\x00'
+VALUE = '\x01'
+
+MARKER_RE = re.compile('([{}{}])'.format(NAME, VALUE))
+SPACES_RE = re.compile(' +')
+IDENTIFIER_RE = re.compile(r'\**[A-Za-z_][\w.]*\Z')
+WORD_RE = re.compile(r'\w')
+
+EXACT = 3
+TEMPLATE = 2
+RETYPED = 1
+
+TemplateLine = namedtuple('TemplateLine', 'text pattern shape kinds key anchored')
+Edit = namedtuple('Edit', 'kind row begin end text')
+
+
+def mask_attributes(parsed_attributes):
+    """Replace every parsed name and value with a marker.
+
+    Names of arguments and variables, and the items of plain lists, like raised
+    exceptions, become the `NAME` marker, every other value becomes `VALUE`.
+
+    Arguments:
+        parsed_attributes {list} -- (attribute type, attributes) pairs from the parser
+
+    Returns:
+        {list} -- Attributes of the same shape, holding markers instead of values
+    """
+    def mask(value, marker):
+        if isinstance(value, str):
+            return marker
+
+        if isinstance(value, dict):
+            return dict((key, mask(item, NAME if key == 'name' else VALUE)) for key, item in value.items())
+
+        if isinstance(value, (list, tuple)):
+            return type(value)(mask(item, marker) for item in value)
+
+        return value
+
+    return [(attribute_type, mask(attributes, NAME)) for attribute_type, attributes in parsed_attributes]
+
+
+def split_lines(snippet, indent='', indent_unit='\t'):
+    """Split a snippet into lines of literal text and field segments.
+
+    Arguments:
+        snippet {str} -- Sublime Text snippet
+
+    Keyword Arguments:
+        indent {str} -- Indentation prefixed to every line (default: {''})
+        indent_unit {str} -- Text replacing the tabs of the snippet (default: {'\t'})
+
+    Returns:
+        {list} -- Lines, each a list of (is field, text) segments
+    """
+    lines = [[(False, indent)]]
+
+    def add_literal(text):
+        text = UNESCAPE_RE.sub(r'\1', text).replace('\t', indent_unit)
+        first, *others = text.split('\n')
+        lines[-1].append((False, first))
+
+        for other in others:
+            lines.append([(False, indent), (False, other)])
+
+    position = 0
+    for match in FIELD_RE.finditer(snippet):
+        add_literal(snippet[position:match.start()])
+        lines[-1].append((True, UNESCAPE_RE.sub(r'\1', match.group(1))))
+        position = match.end()
+
+    add_literal(snippet[position:])
+    return lines
+
+
+def compile_line(segments, capture=False):
+    """Compile a line of segments into a pattern matching the line in full.
+
+    Fields and markers match any text. When capturing, each of them is a group.
+
+    Arguments:
+        segments {list} -- (is field, text) segments of the line
+
+    Keyword Arguments:
+        capture {bool} -- Whether to capture fields and markers (default: {False})
+
+    Returns:
+        {tuple} -- Compiled pattern, and the kind of each group: `name`, `value`
+            or `field`
+    """
+    wildcard = '(.*?)' if capture else '.*?'
+    pattern = ''
+    kinds = []
+    indented = False
+
+    for is_field, text in segments:
+        if is_field:
+            pattern += wildcard
+            kinds.append('field')
+            indented = True
+            continue
+
+        for part in MARKER_RE.split(text):
+            if part in (NAME, VALUE):
+                pattern += wildcard
+                kinds.append('name' if part == NAME else 'value')
+                indented = True
+                continue
+
+            # Indentation must match, while spaces after it may be widened to align columns
+            if not indented:
+                indentation = len(part) - len(part.lstrip())
+                pattern += re.escape(part[:indentation])
+                part = part[indentation:]
+                indented = bool(part)
+
+            pattern += r'[ \t]+'.join(re.escape(piece) for piece in SPACES_RE.split(part))
+
+    return re.compile(pattern + r'\Z'), kinds if capture else []
+
+
+def template(formatter, parsed_attributes, indent='', indent_unit='\t'):
+    """Render the sections of a docstring as line templates.
+
+    Arguments:
+        formatter {formatters.base.Base} -- Formatter instance
+        parsed_attributes {list} -- (attribute type, attributes) pairs from the parser
+
+    Keyword Arguments:
+        indent {str} -- Indentation of the docstring (default: {''})
+        indent_unit {str} -- Text of one level of indentation (default: {'\t'})
+
+    Returns:
+        {list} -- `TemplateLine` for every line of the sections. Lines holding
+            literal words besides their fields, like a header or the name of an
+            entry, are anchored
+    """
+    lines = split_lines(create_sections(formatter, parsed_attributes), indent, indent_unit)
+    masked = split_lines(create_sections(formatter, mask_attributes(parsed_attributes)), indent, indent_unit)
+    templates = []
+
+    for segments, masked_segments in zip(lines, masked):
+        text = ''.join(part for _, part in segments)
+        pattern, _ = compile_line(segments)
+        anchored = any(not is_field and WORD_RE.search(part) for is_field, part in segments)
+        shape, kinds, key = None, [], None
+
+        # Blank lines are left without indentation
+        if not text.strip():
+            text = ''
+
+        if any(MARKER_RE.search(part) for _, part in masked_segments):
+            shape, kinds = compile_line(masked_segments, capture=True)
+            key = names(shape.match(text), kinds)
+
+        templates.append(TemplateLine(text, pattern, shape, kinds, key, anchored))
+
+    # Sections end with a line break, drop the empty line following it
+    if templates and templates[-1].text == '':
+        templates.pop()
+
+    return templates
+
+
+def names(match, kinds):
+    """Return the names captured by a shape match, or None if it didn't match."""
+    if match is None:
+        return None
+
+    return tuple(text for text, kind in zip(match.groups(), kinds) if kind == 'name')
+
+
+def section_heads(lines):
+    """Key each line with the first line of its paragraph, which heads its section.
+
+    Arguments:
+        lines {list} -- Lines of a docstring
+
+    Returns:
+        {list} -- Stripped first line of the paragraph of each line, None for blank lines
+    """
+    heads = []
+    head = None
+
+    for text in lines:
+        if not text.strip():
+            head = None
+            heads.append(None)
+            continue
+
+        if head is None:
+            head = text.strip()
+
+        heads.append(head)
+
+    return heads
+
+
+def score(old, line, same_section=True):
+    """Rate how well an existing line matches a template line.
+
+    A line made of fields alone matches any text, it's only credited within its own
+    section, so that it doesn't take the place of an entry of another section.
+
+    Keyword Arguments:
+        same_section {bool} -- Whether both lines are in the same section (default: {True})
+
+    Returns:
+        {int} -- `EXACT`, `TEMPLATE` when only fields differ, `RETYPED` for the entry
+            of the same names with other values, or 0
+    """
+    if old == line.text or not (old.strip() or line.text):
+        return EXACT
+
+    if old.strip() and (line.anchored or same_section) and line.pattern.match(old):
+        return TEMPLATE
+
+    if line.shape is not None and names(line.shape.match(old), line.kinds) == line.key:
+        return RETYPED
+
+    return 0
+
+
+def align(old_lines, templates):
+    """Pair existing lines with template lines, keeping both in order.
+
+    Arguments:
+        old_lines {list} -- Existing lines
+        templates {list} -- `TemplateLine` of the new sections
+
+    Returns:
+        {list} -- (old row, template row, score) of the best scoring alignment
+    """
+    rows = len(old_lines)
+    columns = len(templates)
+    old_heads = section_heads(old_lines)
+    heads = section_heads([line.text for line in templates])
+    scores = [
+        [score(old, line, old_head == head) for line, head in zip(templates, heads)]
+        for old, old_head in zip(old_lines, old_heads)
+    ]
+    best = [[0] * (columns + 1) for _ in range(rows + 1)]
+
+    for i in range(rows - 1, -1, -1):
+        for j in range(columns - 1, -1, -1):
+            best[i][j] = max(best[i + 1][j], best[i][j + 1])
+            if scores[i][j]:
+                best[i][j] = max(best[i][j], best[i + 1][j + 1] + scores[i][j])
+
+    pairs = []
+    i = j = 0
+    while i < rows and j < columns:
+        if scores[i][j] and best[i][j] == best[i + 1][j + 1] + scores[i][j]:
+            pairs.append((i, j, scores[i][j]))
+            i += 1
+            j += 1
+        elif best[i][j] == best[i + 1][j]:
+            i += 1
+        else:
+            j += 1
+
+    return pairs
+
+
+def replace_span(old, line):
+    """Find the smallest span of an existing entry to replace to match a template line.
+
+    Names and values come from the template, while text typed in place of a field,
+    like a description, is kept.
+
+    Arguments:
+        old {str} -- Existing line, matching the shape of the template line
+        line {TemplateLine} -- Template line of the same entry
+
+    Returns:
+        {tuple} -- (begin, end, text) replacing `old[begin:end]`
+    """
+    old_match = line.shape.match(old)
+    new_match = line.shape.match(line.text)
+    merged = old
+
+    for group in range(len(line.kinds), 0, -1):
+        if line.kinds[group - 1] != 'field':
+            merged = merged[:old_match.start(group)] + new_match.group(group) + merged[old_match.end(group):]
+
+    begin = 0
+    while begin < min(len(old), len(merged)) and old[begin] == merged[begin]:
+        begin += 1
+
+    old_end = len(old)
+    new_end = len(merged)
+    while old_end > begin and new_end > begin and old[old_end - 1] == merged[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    return begin, old_end, merged[begin:new_end]
+
+
+def is_entry(old, shape, kinds):
+    """Tell whether an existing line looks like an entry generated with a shape.
+
+    Only names that are identifiers count, so that free text written by the user is
+    never taken for an entry.
+    """
+    captured = names(shape.match(old), kinds)
+    return bool(captured) and all(IDENTIFIER_RE.match(name) for name in captured)
+
+
+def _indentation(text):
+    """Return the width of the indentation of a line."""
+    return len(text.expandtabs()) - len(text.expandtabs().lstrip())
+
+
+def diff(old_lines, templates):
+    """Compute the edits turning existing docstring lines into the new sections.
+
+    Arguments:
+        old_lines {list} -- Lines of the existing docstring, after the summary line and
+            before the closing quotes
+        templates {list} -- `TemplateLine` of the new sections
+
+    Returns:
+        {list} -- `Edit` tuples ordered by row. `insert` edits hold the lines to add
+            before `row`, which is the number of lines to append at the end,
+            `erase` edits remove `row` and `replace` edits swap `begin:end` of `row`
+            for `text`
+    """
+    pairs = align(old_lines, templates)
+    matched_old = set(i for i, _, _ in pairs)
+    edits = []
+
+    for i, j, rating in pairs:
+        if rating == RETYPED:
+            begin, end, text = replace_span(old_lines[i], templates[j])
+            edits.append(Edit('replace', i, begin, end, text))
+
+    shapes = set((line.shape, tuple(line.kinds)) for line in templates if line.key)
+    erased_indent = None
+    for i, old in enumerate(old_lines):
+        if i in matched_old:
+            erased_indent = None
+            continue
+
+        continued = erased_indent is not None and old.strip() and _indentation(old) > erased_indent
+        if continued or any(is_entry(old, shape, kinds) for shape, kinds in shapes):
+            edits.append(Edit('erase', i, None, None, None))
+            if not continued:
+                erased_indent = _indentation(old)
+        else:
+            erased_indent = None
+
+    anchors = dict((j, i) for i, j, _ in pairs)
+    inserts = {}
+    next_row = len(old_lines)
+    for j in range(len(templates) - 1, -1, -1):
+        if j in anchors:
+            next_row = anchors[j]
+        else:
+            inserts.setdefault(next_row, []).insert(0, templates[j].text)
+
+    for row, lines in inserts.items():
+        edits.append(Edit('insert', row, None, None, lines))
+
+    return sorted(edits, key=lambda edit: (edit.row, edit.kind != 'insert'))
@@ -1,11 +1,45 @@
 """Tools for handling registering additional plugins.
 
+A formatter is a class with a `name`, a method for each of the `SECTIONS`, and a
+constructor taking an optional settings dict. Extending `formatters.base.Base`
+registers the class automatically, but any class following that protocol may be
+passed to `register` directly.
+
 Variables:
     REGISTRY {dict} -- Contains the Registered Parsers
+    SECTIONS {tuple} -- Names of the docstring sections a formatter renders
 """
 
 REGISTRY = {}
 
+SECTIONS = (
+    'summary',
+    'description',
+    'decorators',
+    'extends',
+    'arguments',
+    'keyword_arguments',
+    'returns',
+    'yields',
+    'raises',
+    'variables',
+)
+
+
+def build_sections(Cls):
+    """Build the section dispatch table of a formatter class.
+
+    Resolving the section methods once, when the class is registered, spares
+    looking them up every time a docstring is formatted.
+
+    Arguments:
+        Cls {class} -- Uninitialized class object
+
+    Returns:
+        {dict} -- Section name to unbound method
+    """
+    return dict((section, getattr(Cls, section)) for section in SECTIONS if hasattr(Cls, section))
+
 
 def register(Cls):
     """Add the passed class object to the registry of formatters.
@@ -19,6 +53,8 @@ def register(Cls):
     Returns:
         {class} -- Uninitialized class object
     """
+    Cls.sections = build_sections(Cls)
+
     if Cls.name is None:
         return Cls
 
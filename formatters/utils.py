@@ -1,11 +1,17 @@
 """Common Utilities for the default formatters."""
+import json
 import logging
-import sublime
+import re
 
 from .registry import REGISTRY
 
 log = logging.getLogger(__name__)
 
+FIELD_RE = re.compile(r'\$\{\d+:((?:\\.|[^\\}])*)\}')
+UNESCAPE_RE = re.compile(r'\\([${}\\])')
+
+_instances = {}
+
 
 def get_formatter(name):
     """Return the requested formatter by name from the registry.
@@ -29,30 +35,135 @@ def get_formatter(name):
     return formatter
 
 
-def get_setting(key, default=None):
-    """Get the passed setting from the aggregated settings files.
+def get_formatter_instance(name, settings=None):
+    """Return the shared formatter instance for a name and settings snapshot.
 
-    Merges up settings as specified in Sublime's docs.
-    https://www.sublimetext.com/docs/3/settings.html
+    Instances are created once per formatter class and distinct settings, and
+    reused for every docstring after that.
 
     Arguments:
-        key {str} -- String of the key to get
+        name {str} -- Friendly name of the formatter to search
 
     Keyword Arguments:
-        default {str} -- default value in case the setting is not found (default: None)
+        settings {dict} -- Settings to create the formatter with (default: {None})
+
+    Returns:
+        formatters.base.Base -- Formatter instance
+    """
+    formatter = get_formatter(name)
+    key = (formatter, json.dumps(settings or {}, sort_keys=True))
+    instance = _instances.get(key)
+
+    if instance is None:
+        instance = _instances[key] = formatter(settings)
+
+    return instance
+
+
+def escape(string):
+    r"""Escape the special characters.
+
+    Escapes characters that are also in snippet tab fields so that inserting into the view
+    doesn't accidentally create another tabbable field
+    Arguments:
+        string {String} -- String to be excaped
+
+    Examples:
+        >>> escape('function $test() {}')
+        'function \$test() \{\}'
+
+    Returns:
+        {String} String with escaped characters
+
+    """
+    return string.replace('$', r'\$').replace('{', r'\{').replace('}', r'\}')
+
+
+def create_snippet(formatter, parsed_attributes, summary, closing_string):
+    """Format a Sublime Text snippet syntax string.
+
+    Iterates through the list of field groups, and then through each item
+    in the group to create the snippets using the passed formatter.
+
+    Arguments:
+        formatter {formatters.base.Base} -- Formatter instance
+        parsed_attributes {list} -- (attribute type, attributes) pairs from the parser
+        summary {str} -- Summary line text, a placeholder is used if empty
+        closing_string {str} -- Quotes closing the docstring
 
     Returns:
-        {str} or {None} -- value of the setting
+        str -- sublime text formatted snippet string
+
     """
-    settings = sublime.load_settings('DocblockrPython.sublime-settings')
-    os_specific_settings = {}
-
-    os_name = sublime.platform()
-    if os_name == 'osx':
-        os_specific_settings = sublime.load_settings('DocblockrPython (OSX).sublime-settings')
-    elif os_name == 'windows':
-        os_specific_settings = sublime.load_settings('DocblockrPython (Windows).sublime-settings')
-    else:
-        os_specific_settings = sublime.load_settings('DocblockrPython (Linux).sublime-settings')
-
-    return os_specific_settings.get(key, settings.get(key, default))
+    # Make sure the summary line has the trailing text, or a placeholder
+    snippet = (summary or formatter.summary()) + formatter.description()
+
+    return snippet + create_sections(formatter, parsed_attributes) + closing_string
+
+
+def create_sections(formatter, parsed_attributes):
+    """Format the sections following the description of a docstring.
+
+    Arguments:
+        formatter {formatters.base.Base} -- Formatter instance
+        parsed_attributes {list} -- (attribute type, attributes) pairs from the parser
+
+    Returns:
+        str -- sublime text formatted snippet string of every non empty section
+    """
+    sections = formatter.sections
+    snippet = ''
+
+    for attribute_type, attributes in parsed_attributes:
+        if len(attributes) == 0:
+            continue
+
+        snippet += sections[attribute_type](formatter, attributes)
+
+    return snippet
+
+
+def count_fields(snippet):
+    """Count the tab stops of a snippet.
+
+    Arguments:
+        snippet {str} -- Sublime Text snippet
+
+    Returns:
+        {int} -- Number of fields
+
+    >>> count_fields('${1:[summary]}\\n\\n${2:[description]}')
+    2
+    """
+    return sum(1 for _ in FIELD_RE.finditer(snippet))
+
+
+def plain_text(snippet, indent='', indent_unit='\t'):
+    """Turn a snippet into the text it would insert, leaving the placeholders as they read.
+
+    Does what inserting the snippet would: every line after the first is indented like
+    the first, and tabs are replaced with the indentation unit of the view.
+
+    Arguments:
+        snippet {str} -- Sublime Text snippet
+
+    Keyword Arguments:
+        indent {str} -- Indentation of the line the text is inserted on (default: {''})
+        indent_unit {str} -- Text replacing the tabs of the snippet (default: {'\t'})
+
+    Returns:
+        {tuple} -- Text, and the (begin, end) offsets of its first placeholder, None without any
+    """
+    def render(text):
+        lines = UNESCAPE_RE.sub(r'\1', text).replace('\t', indent_unit).split('\n')
+        return '\n'.join([lines[0]] + [indent + line if line else line for line in lines[1:]])
+
+    first = FIELD_RE.search(snippet)
+    text = render(FIELD_RE.sub(lambda match: match.group(1), snippet))
+    if first is None:
+        return text, None
+
+    field = UNESCAPE_RE.sub(r'\1', first.group(1))
+    end = len(render(snippet[:first.start()] + field))
+
+    return text, (end - len(field), end)
@@ -0,0 +1 @@
+"""Headless tooling that runs the parser and formatters outside of Sublime Text."""
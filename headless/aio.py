@@ -0,0 +1,283 @@
+"""Asyncio front end of the batch scan, for trees where reading files is the bottleneck.
+
+On network mounts, waiting on reads costs more than parsing. Files are read by a
+bounded pool of threads and handed to the parser workers through a bounded queue,
+so reads overlap with parsing, and readers wait rather than pile up contents when
+the parsers fall behind. Results are written in path order, whatever order the
+files are read and parsed in.
+
+At most `readers + queue + jobs` files are held in memory at a time: read, queued,
+being parsed, or waiting on an earlier file to be written.
+
+Usage:
+    python -m DocBlockr_Python.headless.aio [--readers N] [--jobs N] [--queue N] [--output FILE] PATH [PATH ...]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ..core.settings import default_settings
+from ..parsers.parser import PythonParser
+from ..parsers.scanner import parse_definitions
+from .batch import iter_python_files
+from .cache import DEFAULT_MAX_BYTES, ParseCache
+from .export import definition_records
+
+DEFAULT_READERS = 16
+
+# Seconds between progress reports on the command line
+PROGRESS_INTERVAL = 0.5
+
+# `async def` and `await` need python 3.5, generator coroutines run everywhere.
+# `asyncio.coroutine` is gone from python 3.11, and `asyncio.async` from 3.10
+coroutine = getattr(types, 'coroutine', None) or asyncio.coroutine
+ensure_future = getattr(asyncio, 'ensure_future', None) or getattr(asyncio, 'async')
+
+_worker_cache = None
+
+
+def read_file(path):
+    """Read the raw contents of a file."""
+    with open(path, 'rb') as source:
+        return source.read()
+
+
+def parse_content(content, cache=None, parser=None):
+    """Parse the definitions of a file's contents, in a parser worker.
+
+    Arguments:
+        content {bytes} -- Raw contents of the file
+
+    Keyword Arguments:
+        cache {ParseCache} -- Cache to read and store the results in (default: {None})
+        parser {PythonParser} -- Parser built from the settings (default: {None})
+
+    Returns:
+        {tuple} parsed definitions, and whether they came from the cache
+    """
+    global _worker_cache
+
+    if cache is None:
+        return parse_definitions(content.decode('utf-8', 'replace'), parser), False
+
+    # Each call to a worker process unpickles a new copy, keep the first connection
+    if _worker_cache is None or _worker_cache.path != cache.path:
+        _worker_cache = cache
+
+    return _worker_cache.parse(content, parser)
+
+
+class Pipeline:
+    """Read, parse and write the python files under some paths, concurrently.
+
+    Variables:
+        found {int} -- Files found so far
+        written {int} -- Files handed to `handle` so far
+    """
+
+    def __init__(self, handle, cache=None, readers=DEFAULT_READERS, jobs=1, queue_size=None, progress=None,
+                 parser=None):
+        """Set up a pipeline.
+
+        Arguments:
+            handle {callable} -- Called with the path, parsed definitions, and whether
+                they came from the cache, of each file in path order
+
+        Keyword Arguments:
+            cache {ParseCache} -- Cache to read and store the results in (default: {None})
+            readers {int} -- Files read at the same time (default: {DEFAULT_READERS})
+            jobs {int} -- Parser worker processes, 1 to parse in a thread (default: {1})
+            queue_size {int} -- Read files waiting on a parser, twice the jobs by
+                default (default: {None})
+            progress {callable} -- Called with the files written and found so far, after
+                each file is written (default: {None})
+            parser {PythonParser} -- Parser built from the settings (default: {None})
+        """
+        self.handle = handle
+        self.cache = cache
+        self.readers = readers
+        self.jobs = jobs
+        self.queue_size = queue_size or 2 * jobs
+        self.progress = progress
+        self.parser = parser
+        self.found = 0
+        self.written = 0
+
+    @coroutine
+    def run(self, paths):
+        """Scan every python file under the paths.
+
+        Arguments:
+            paths {list} -- Files and directories
+
+        Returns:
+            {int} -- Number of files written
+        """
+        self._loop = asyncio.get_event_loop()
+        self._queue = asyncio.Queue(self.queue_size)
+        self._reading = asyncio.Semaphore(self.readers)
+        self._pending = asyncio.Semaphore(self.readers + self.queue_size + self.jobs)
+        self._results = {}
+        self._reads = set()
+
+        # One more thread than readers, for walking the directories
+        self._io = ThreadPoolExecutor(self.readers + 1)
+        self._parsers = ThreadPoolExecutor(1) if self.jobs == 1 else ProcessPoolExecutor(self.jobs)
+
+        workers = [ensure_future(self._parse()) for _ in range(self.jobs)]
+        producer = ensure_future(self._produce(paths, len(workers)))
+
+        try:
+            yield from asyncio.gather(producer, *workers)
+        finally:
+            for task in [producer] + workers + list(self._reads):
+                task.cancel()
+
+            self._io.shutdown()
+            self._parsers.shutdown()
+
+        return self.written
+
+    @coroutine
+    def _produce(self, paths, workers):
+        """Walk the paths and start reading each file, as room frees up."""
+        files = iter_python_files(paths)
+
+        while True:
+            path = yield from self._loop.run_in_executor(self._io, next, files, None)
+            if path is None:
+                break
+
+            yield from self._pending.acquire()
+            read = ensure_future(self._read(self.found, path))
+            read.add_done_callback(self._reads.discard)
+            self._reads.add(read)
+            self.found += 1
+
+        yield from asyncio.gather(*self._reads)
+
+        for _ in range(workers):
+            yield from self._queue.put(None)
+
+    @coroutine
+    def _read(self, index, path):
+        """Read a file and queue it for the parsers, waiting while the queue is full."""
+        yield from self._reading.acquire()
+        try:
+            content = yield from self._loop.run_in_executor(self._io, read_file, path)
+        except OSError as error:
+            # Raised by the parsers, so the scan stops in path order
+            content = error
+        finally:
+            self._reading.release()
+
+        yield from self._queue.put((index, path, content))
+
+    @coroutine
+    def _parse(self):
+        """Parse queued files until told to stop."""
+        while True:
+            item = yield from self._queue.get()
+            if item is None:
+                return
+
+            index, path, content = item
+            if isinstance(content, OSError):
+                raise content
+
+            parsed, hit = yield from self._loop.run_in_executor(
+                self._parsers, parse_content, content, self.cache, self.parser,
+            )
+            self._results[index] = (path, parsed, hit)
+            self._write()
+
+    def _write(self):
+        """Hand over the results that are next in path order."""
+        while self.written in self._results:
+            self.handle(*self._results.pop(self.written))
+            self.written += 1
+            self._pending.release()
+
+            if self.progress is not None:
+                self.progress(self.written, self.found)
+
+
+def scan_async(paths, handle, **options):
+    """Run a `Pipeline` over the paths in a new event loop.
+
+    Arguments:
+        paths {list} -- Files and directories
+        handle {callable} -- Called with the path, parsed definitions, and whether
+            they came from the cache, of each file in path order
+        **options -- Options of `Pipeline`
+
+    Returns:
+        {int} -- Number of files written
+    """
+    loop = asyncio.new_event_loop()
+
+    # Queues, semaphores and tasks of python before 3.10 bind to the current loop
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(Pipeline(handle, **options).run(paths))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def main(argv=None):
+    """Scan the paths from the command line, writing the definitions as NDJSON."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('paths', nargs='+', help='files and directories to scan')
+    arg_parser.add_argument('--output', help='file to write the definitions to, standard output by default')
+    arg_parser.add_argument('--readers', type=int, default=DEFAULT_READERS, help='files read at the same time')
+    arg_parser.add_argument('--jobs', type=int, default=1, help='number of parser worker processes')
+    arg_parser.add_argument('--queue', type=int, default=None, help='read files waiting on a parser')
+    arg_parser.add_argument('--cache', help='location of the parse cache database')
+    arg_parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                            help='size budget of the parse cache, in megabytes')
+    arg_parser.add_argument('--quiet', action='store_true', help='report no progress')
+    args = arg_parser.parse_args(argv)
+
+    cache = ParseCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    output = sys.stdout if args.output is None else open(args.output, 'w', encoding='utf-8')
+    totals = {'definitions': 0, 'hits': 0}
+    reported = [0.0]
+
+    def handle(path, parsed, hit):
+        for record in definition_records(path, parsed):
+            output.write(json.dumps(record, sort_keys=True, separators=(',', ':')))
+            output.write('\n')
+
+        totals['definitions'] += len(parsed)
+        totals['hits'] += hit
+
+    def progress(written, found):
+        now = time.perf_counter()
+        if now - reported[0] >= PROGRESS_INTERVAL:
+            reported[0] = now
+            sys.stderr.write('\r{} of {} files found'.format(written, found))
+            sys.stderr.flush()
+
+    try:
+        files = scan_async(args.paths, handle, cache=cache, readers=args.readers, jobs=args.jobs,
+                           queue_size=args.queue, progress=None if args.quiet else progress,
+                           parser=PythonParser(default_settings()))
+    finally:
+        if args.output is not None:
+            output.close()
+
+    if reported[0]:
+        sys.stderr.write('\n')
+
+    print('{} files, {} definitions, {} cached'.format(files, totals['definitions'], totals['hits']),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Batch scanning of python files.
+
+Parses every definition of every python file under the given paths, spread over a
+pool of worker processes. With a cache, files that haven't changed since the last
+run are not parsed again.
+
+Usage:
+    python -m DocBlockr_Python.headless.batch [--cache FILE] [--jobs N] PATH [PATH ...]
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from multiprocessing import Pool, cpu_count
+
+from ..core.settings import default_settings
+from ..parsers.parser import PythonParser
+from ..parsers.scanner import parse_definitions
+from .cache import DEFAULT_MAX_BYTES, ParseCache
+
+
+def iter_python_files(paths):
+    """Expand files and directories into the python files they contain.
+
+    Arguments:
+        paths {list} -- Files and directories
+
+    Yields:
+        {str} Path of a python file
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+
+        for root, directories, files in os.walk(path):
+            directories[:] = sorted(directory for directory in directories if not directory.startswith('.'))
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    yield os.path.join(root, name)
+
+
+def scan_file(path, cache=None, parser=None):
+    """Parse the definitions of a single file.
+
+    Arguments:
+        path {str} -- Path of the file
+
+    Keyword Arguments:
+        cache {ParseCache} -- Cache to read and store the results in (default: {None})
+        parser {PythonParser} -- Parser built from the settings (default: {None})
+
+    Returns:
+        {tuple} path, parsed definitions, and whether they came from the cache
+    """
+    with open(path, 'rb') as source:
+        content = source.read()
+
+    if cache is not None:
+        parsed, hit = cache.parse(content, parser)
+        return path, parsed, hit
+
+    return path, parse_definitions(content.decode('utf-8', 'replace'), parser), False
+
+
+_worker_cache = None
+_worker_parser = None
+
+
+def _init_worker(cache, parser):
+    """Keep the cache and parser for the lifetime of a pool worker."""
+    global _worker_cache, _worker_parser
+    _worker_cache = cache
+    _worker_parser = parser
+
+
+def _scan_worker(paths):
+    """Scan a chunk of files in a pool worker."""
+    return [scan_file(path, _worker_cache, _worker_parser) for path in paths]
+
+
+def _chunks(items, size):
+    """Split an iterable into lists of up to `size` items."""
+    chunk = []
+
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def scan_paths(paths, cache=None, jobs=None, chunksize=8, parser=None):
+    """Parse every python file under the given paths.
+
+    With a pool, two chunks per worker are in flight at most, so results don't pile
+    up when they're consumed slower than they're parsed.
+
+    Arguments:
+        paths {list} -- Files and directories
+
+    Keyword Arguments:
+        cache {ParseCache} -- Cache to read and store the results in (default: {None})
+        jobs {int} -- Number of worker processes, 1 to scan in process (default: {None})
+        chunksize {int} -- Files handed to a worker at a time (default: {8})
+        parser {PythonParser} -- Parser built from the settings (default: {None})
+
+    Yields:
+        {tuple} path, parsed definitions, and whether they came from the cache, in path order
+    """
+    files = iter_python_files(paths)
+
+    if jobs == 1:
+        for path in files:
+            yield scan_file(path, cache, parser)
+        return
+
+    # Unlike `Pool.imap`, which feeds its whole input to the workers eagerly
+    window = 2 * (jobs or cpu_count())
+    pending = deque()
+
+    with Pool(jobs, _init_worker, (cache, parser)) as pool:
+        for chunk in _chunks(files, chunksize):
+            pending.append(pool.apply_async(_scan_worker, (chunk,)))
+
+            if len(pending) >= window:
+                for result in pending.popleft().get():
+                    yield result
+
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+
+
+def main(argv=None):
+    """Scan the paths from the command line and summarize the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('paths', nargs='+', help='files and directories to scan')
+    arg_parser.add_argument('--cache', help='location of the parse cache database')
+    arg_parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                            help='size budget of the parse cache, in megabytes')
+    arg_parser.add_argument('--jobs', type=int, default=None, help='number of worker processes')
+    args = arg_parser.parse_args(argv)
+
+    cache = ParseCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    parser = PythonParser(default_settings())
+    files = definitions = hits = 0
+
+    for path, parsed, hit in scan_paths(args.paths, cache, args.jobs, parser=parser):
+        files += 1
+        definitions += len(parsed)
+        hits += hit
+
+    print('{} files, {} definitions, {} cached'.format(files, definitions, hits))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""Persistent, content addressed cache of parsed files.
+
+Entries are keyed by the hash of a file's contents plus the parser version and the
+`type_rules` it was configured with, so an unchanged file is never parsed twice,
+and any change to the parser or to its rules invalidates every entry at once.
+Entries live in a single SQLite database, which keeps writers from a process pool
+safe, and the least recently used entries are evicted once the cache grows past its
+size budget.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from ..parsers import scanner
+from ..parsers.parser import PythonParser
+from ..parsers.scanner import Definition
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, size) VALUES (0, 0);
+"""
+
+
+def parser_version():
+    """Fingerprint the parser sources.
+
+    Every module of the `parsers` package is hashed, so that moving code between
+    them, like the type guessing into `guess`, can't leave one out.
+
+    Returns:
+        str -- Hash of the modules that produce the cached output
+    """
+    digest = hashlib.sha1()
+    package = os.path.dirname(os.path.abspath(scanner.__file__))
+
+    for name in sorted(os.listdir(package)):
+        if name.endswith('.py'):
+            with open(os.path.join(package, name), 'rb') as source:
+                digest.update(name.encode('utf-8'))
+                digest.update(source.read())
+
+    return digest.hexdigest()[:16]
+
+
+def content_key(content, version, rules=()):
+    """Build the cache key of a file.
+
+    Arguments:
+        content {bytes} -- Raw contents of the file
+        version {str} -- Parser version
+
+    Keyword Arguments:
+        rules {tuple} -- `(glob, type)` pairs of the `type_rules` the parser was
+            configured with (default: {()})
+
+    Returns:
+        str -- Cache key
+    """
+    rules_hash = hashlib.sha1(json.dumps(rules).encode('utf-8')).hexdigest()[:16]
+    return '{}:{}:{}'.format(hashlib.sha1(content).hexdigest(), version, rules_hash)
+
+
+def encode(parsed):
+    """Compress parsed definitions into a compact record."""
+    records = [[list(definition), output] for definition, output in parsed]
+    return zlib.compress(json.dumps(records, separators=(',', ':')).encode('utf-8'))
+
+
+def decode(payload):
+    """Expand a record made by `encode` back into parsed definitions."""
+    records = json.loads(zlib.decompress(payload).decode('utf-8'))
+    parsed = []
+
+    for definition, output in records:
+        definition = Definition(*definition)
+        if definition.docstring is not None:
+            definition = definition._replace(docstring=tuple(definition.docstring))
+        # JSON turns the (attribute type, attributes) pairs into lists
+        if output is not None:
+            output = [tuple(pair) for pair in output]
+        parsed.append((definition, output))
+
+    return parsed
+
+
+class ParseCache:
+    """SQLite backed cache of `parsers.scanner.parse_definitions` results.
+
+    Connections are opened lazily, and per process and thread, so an instance may
+    be handed to the workers of a process or thread pool.
+
+    Variables:
+        path {str} -- Location of the database
+        max_bytes {int} -- Size budget of the stored records
+        version {str} -- Parser version entries are keyed with
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        """---."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = parser_version()
+        self._local = threading.local()
+
+    def __getstate__(self):
+        """Leave the connections behind when sent to another process."""
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        """---."""
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        """Return the connection of the current thread, opened on first use."""
+        local = self._local
+
+        # A forked process inherits the connection of the thread that forked it
+        if getattr(local, 'pid', None) != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            local.connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            local.connection.execute('PRAGMA journal_mode=WAL')
+            local.connection.executescript(SCHEMA)
+            local.pid = os.getpid()
+
+        return local.connection
+
+    def close(self):
+        """Close the connection of the current thread."""
+        local = self._local
+
+        if getattr(local, 'pid', None) == os.getpid():
+            local.connection.close()
+
+        local.connection = None
+        local.pid = None
+
+    def get(self, key):
+        """Return the parsed definitions stored under a key, or None."""
+        row = self.connection.execute('SELECT payload FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        self.connection.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+        return decode(row[0])
+
+    def put(self, key, parsed):
+        """Store parsed definitions under a key, evicting entries over the budget."""
+        self._store(key, encode(parsed))
+
+    def _store(self, key, payload):
+        """Store a record made by `encode` under a key, evicting entries over the budget."""
+        connection = self.connection
+
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            previous = connection.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            connection.execute(
+                'INSERT OR REPLACE INTO entries (key, size, accessed, payload) VALUES (?, ?, ?, ?)',
+                (key, len(payload), time.time(), payload),
+            )
+            connection.execute(
+                'UPDATE totals SET size = size + ? WHERE id = 0',
+                (len(payload) - (previous[0] if previous else 0),),
+            )
+            self._evict(connection)
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+        connection.execute('COMMIT')
+
+    def _evict(self, connection):
+        """Delete the least recently used entries until the cache fits its budget."""
+        total = connection.execute('SELECT size FROM totals WHERE id = 0').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% of the budget, so eviction doesn't run on every write
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        keys = []
+
+        for key, size in connection.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if freed >= target:
+                break
+            keys.append((key,))
+            freed += size
+
+        connection.executemany('DELETE FROM entries WHERE key = ?', keys)
+        connection.execute('UPDATE totals SET size = size - ? WHERE id = 0', (freed,))
+
+    def size(self):
+        """Return the total size of the stored records, in bytes."""
+        return self.connection.execute('SELECT size FROM totals WHERE id = 0').fetchone()[0]
+
+    def parse(self, content, parser=None):
+        """Return the parsed definitions of a file's contents, parsing only on a miss.
+
+        Arguments:
+            content {bytes} -- Raw contents of the file
+
+        Keyword Arguments:
+            parser {PythonParser} -- Parser to use, built from the settings holding the
+                `type_rules` (default: {None}, a parser without settings)
+
+        Returns:
+            {tuple} parsed definitions, and whether they came from the cache
+        """
+        parser = parser or PythonParser()
+        key = content_key(content, self.version, parser.type_rules.rules)
+        parsed = self.get(key)
+        if parsed is not None:
+            return parsed, True
+
+        payload = encode(scanner.parse_definitions(content.decode('utf-8', 'replace'), parser))
+        self._store(key, payload)
+
+        # Hand out what a hit would, parsers that match nothing return `{}` and not a list
+        return decode(payload), False
@@ -0,0 +1,305 @@
+"""Throughput and robustness benchmark over a corpus of real python code.
+
+Runs every definition of every file under the corpus through the parser and each
+registered formatter, timing each definition and counting the exceptions raised on
+the way. Each class and function is also documented the way the editor does it: a
+docstring is opened under its signature, in place of any it has, and analyzed on a
+view of the file, timed on its own. The corpus defaults to the standard library of the running interpreter,
+which is available offline and holds every shape of definition the language
+allows.
+
+Usage:
+    python -m DocBlockr_Python.headless.corpus [--limit N] [--json] [PATH ...]
+
+Thresholds turn the benchmark into a regression check: the exit status is 1 if the
+throughput, the p99 latency or the number of crashes is worse than allowed.
+"""
+import argparse
+import json
+import math
+import sys
+import sysconfig
+import time
+import traceback
+from collections import Counter
+
+from ..core.settings import default_settings
+from ..formatters.registry import REGISTRY, populate_registry
+from ..formatters.utils import create_snippet, get_formatter_instance
+from ..parsers.context import analyze_view
+from ..parsers.parser import PythonParser
+from ..parsers.scanner import classify_rows, definition_source, scan_definitions, strip_comment
+from ..parsers.view import StringView
+from .batch import iter_python_files
+
+MAX_EXAMPLES = 20
+
+
+def stdlib_path():
+    """Return the directory of the standard library of the running interpreter."""
+    return sysconfig.get_paths()['stdlib']
+
+
+def percentile(values, fraction):
+    """Return the value below which a fraction of the sorted values fall.
+
+    Arguments:
+        values {list} -- Sorted values
+        fraction {float} -- Fraction between 0 and 1
+
+    Returns:
+        {float} -- Nearest ranked value, 0 if there are none
+
+    >>> percentile([1, 2, 3, 4], 0.5)
+    2
+    """
+    if not values:
+        return 0
+
+    return values[max(0, int(math.ceil(fraction * len(values))) - 1)]
+
+
+class CorpusRun:
+    """Timings and failures gathered over a corpus.
+
+    Variables:
+        files {int} -- Files read
+        definitions {int} -- Definitions run through the parser
+        latencies {list} -- Seconds spent on each definition, parser and formatters
+        analyze_latencies {list} -- Seconds spent analyzing each docstring opened in a view
+        crashes {Counter} -- Exceptions counted by stage: `read`, `scan`, `parse`,
+            `analyze`, or the name of the formatter
+        examples {list} -- (location, stage, exception) of the first crashes
+        elapsed {float} -- Seconds the whole run took
+    """
+
+    def __init__(self):
+        """---."""
+        self.files = 0
+        self.definitions = 0
+        self.latencies = []
+        self.analyze_latencies = []
+        self.crashes = Counter()
+        self.examples = []
+        self.elapsed = 0
+
+    def crash(self, location, stage, error):
+        """Count an exception raised at a stage."""
+        self.crashes[stage] += 1
+
+        if len(self.examples) < MAX_EXAMPLES:
+            message = ''.join(traceback.format_exception_only(type(error), error)).strip()
+            self.examples.append((location, stage, message))
+
+    def summary(self):
+        """Summarize the run.
+
+        Returns:
+            {dict} -- Counts, definitions per second, and latency percentiles in ms
+        """
+        latencies = sorted(self.latencies)
+        analyze_latencies = sorted(self.analyze_latencies)
+
+        return {
+            'files': self.files,
+            'definitions': self.definitions,
+            'seconds': round(self.elapsed, 3),
+            'definitions_per_second': round(self.definitions / self.elapsed, 1) if self.elapsed else 0,
+            'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0,
+            'analyze_p50_ms': round(percentile(analyze_latencies, 0.5) * 1000, 3),
+            'analyze_p99_ms': round(percentile(analyze_latencies, 0.99) * 1000, 3),
+            'crashes': dict(self.crashes),
+            'examples': self.examples,
+        }
+
+
+def run_definition(run, parser, formatters, rows, definition, location):
+    """Parse a definition and format it with every formatter, timing the whole."""
+    start = time.perf_counter()
+
+    try:
+        line, contents = definition_source(rows, definition)
+        parsed = parser.parse(line, contents)
+    except Exception as error:
+        run.crash(location, 'parse', error)
+        return
+
+    for name, formatter in formatters:
+        try:
+            create_snippet(formatter, parsed, '', '"""')
+        except Exception as error:
+            run.crash(location, name, error)
+
+    run.latencies.append(time.perf_counter() - start)
+    run.definitions += 1
+
+
+def opened_docstring(rows, definition):
+    """Open a docstring under the signature of a definition, as typed in the editor.
+
+    Arguments:
+        rows {list} -- Rows classified by `classify_rows`
+        definition {Definition} -- Class or function to document
+
+    Returns:
+        {tuple} -- Text of the file with the docstring opened in place of any it had,
+            and the offset right after the opening quotes, or None if the body
+            follows the signature on the same line
+    """
+    body = definition.body
+    if body > len(rows) or not strip_comment(rows[body - 1].text).rstrip().endswith(':'):
+        return None
+
+    after = definition.docstring[1] + 1 if definition.docstring else body
+    indent = ' ' * (definition.indent + 4)
+    for row in rows[body:definition.end + 1]:
+        if row.indent is not None:
+            indent = row.text[:len(row.text) - len(row.text.lstrip())]
+            break
+
+    before = ''.join(row.text + '\n' for row in rows[:body])
+    text = before + indent + '"""\n' + '\n'.join(row.text for row in rows[after:])
+
+    return text, len(before) + len(indent) + 3
+
+
+def run_analyze(run, rows, definition, location, settings=None):
+    """Analyze a docstring opened under a definition in a view, timing the analysis alone."""
+    try:
+        opened = opened_docstring(rows, definition)
+        if opened is None:
+            return
+
+        text, offset = opened
+        view = StringView(text, offset, settings)
+
+        start = time.perf_counter()
+        analyze_view(view, offset, settings)
+        run.analyze_latencies.append(time.perf_counter() - start)
+    except Exception as error:
+        run.crash(location, 'analyze', error)
+
+
+def run_corpus(paths, limit=None, settings=None):
+    """Run every definition of the files under the paths through the parser, formatters and editor analysis.
+
+    Arguments:
+        paths {list} -- Files and directories of the corpus
+
+    Keyword Arguments:
+        limit {int} -- Maximum number of files to read (default: {None})
+        settings {core.settings.Settings} -- Settings of the parser, like `type_rules`
+            (default: {None}, the package defaults)
+
+    Returns:
+        {CorpusRun} -- Timings and failures of the run
+    """
+    populate_registry()
+    settings = settings if settings is not None else default_settings()
+    parser = PythonParser(settings)
+    formatters = [(name, get_formatter_instance(name)) for name in sorted(REGISTRY)]
+    run = CorpusRun()
+    start = time.perf_counter()
+
+    for path in iter_python_files(paths):
+        if limit is not None and run.files >= limit:
+            break
+
+        run.files += 1
+
+        try:
+            with open(path, 'rb') as source:
+                text = source.read().decode('utf-8', 'replace')
+        except (IOError, OSError) as error:
+            run.crash(path, 'read', error)
+            continue
+
+        try:
+            rows = classify_rows(text.split('\n'))
+            definitions = scan_definitions(rows)
+        except Exception as error:
+            run.crash(path, 'scan', error)
+            continue
+
+        for definition in definitions:
+            location = '{}:{}'.format(path, (definition.row or 0) + 1)
+            run_definition(run, parser, formatters, rows, definition, location)
+
+            if definition.kind != 'module':
+                run_analyze(run, rows, definition, location, settings)
+
+    run.elapsed = time.perf_counter() - start
+    return run
+
+
+def check(summary, min_rate=None, max_p99=None, max_crashes=None, max_analyze_p99=None):
+    """List the thresholds a run summary breaks.
+
+    Arguments:
+        summary {dict} -- Summary of a run, from `CorpusRun.summary`
+
+    Keyword Arguments:
+        min_rate {float} -- Minimum definitions per second (default: {None})
+        max_p99 {float} -- Maximum p99 latency, in ms (default: {None})
+        max_crashes {int} -- Maximum number of crashes (default: {None})
+        max_analyze_p99 {float} -- Maximum p99 latency of the editor analysis, in ms
+            (default: {None})
+
+    Returns:
+        {list} -- Descriptions of the broken thresholds
+    """
+    failures = []
+
+    if min_rate is not None and summary['definitions_per_second'] < min_rate:
+        failures.append('{} definitions/s is below {}'.format(summary['definitions_per_second'], min_rate))
+
+    if max_p99 is not None and summary['p99_ms'] > max_p99:
+        failures.append('p99 of {} ms is above {} ms'.format(summary['p99_ms'], max_p99))
+
+    if max_analyze_p99 is not None and summary['analyze_p99_ms'] > max_analyze_p99:
+        failures.append('analyze p99 of {} ms is above {} ms'.format(summary['analyze_p99_ms'], max_analyze_p99))
+
+    crashes = sum(summary['crashes'].values())
+    if max_crashes is not None and crashes > max_crashes:
+        failures.append('{} crashes is above {}'.format(crashes, max_crashes))
+
+    return failures
+
+
+def main(argv=None):
+    """Run the corpus from the command line and report the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('paths', nargs='*', help='files and directories, the standard library by default')
+    arg_parser.add_argument('--limit', type=int, default=None, help='maximum number of files to read')
+    arg_parser.add_argument('--json', action='store_true', help='print the summary as JSON')
+    arg_parser.add_argument('--min-rate', type=float, default=None, help='minimum definitions per second')
+    arg_parser.add_argument('--max-p99', type=float, default=None, help='maximum p99 latency, in ms')
+    arg_parser.add_argument('--max-crashes', type=int, default=None, help='maximum number of crashes')
+    arg_parser.add_argument('--max-analyze-p99', type=float, default=None,
+                            help='maximum p99 latency of the editor analysis, in ms')
+    args = arg_parser.parse_args(argv)
+
+    summary = run_corpus(args.paths or [stdlib_path()], args.limit).summary()
+    failures = check(summary, args.min_rate, args.max_p99, args.max_crashes, args.max_analyze_p99)
+
+    if args.json:
+        print(json.dumps(dict(summary, failures=failures), indent=2))
+    else:
+        print('{files} files, {definitions} definitions in {seconds}s'.format(**summary))
+        print('{definitions_per_second} definitions/s, p50 {p50_ms} ms, p99 {p99_ms} ms, max {max_ms} ms'.format(
+            **summary))
+        print('editor analysis p50 {analyze_p50_ms} ms, p99 {analyze_p99_ms} ms'.format(**summary))
+        for stage, count in sorted(summary['crashes'].items()):
+            print('{} crashes in {}'.format(count, stage))
+        for location, stage, error in summary['examples']:
+            print('  {} [{}] {}'.format(location, stage, error))
+        for failure in failures:
+            print('FAILED: {}'.format(failure))
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""Long running docstring generation daemon.
+
+Speaks JSON-RPC 2.0 over stdio so that other editors and pre-commit hooks can reuse
+the parser and formatters without paying the interpreter start up and import cost
+for every file. Messages are either framed with `Content-Length` headers, as in the
+Language Server Protocol, or sent one per line. Replies use the framing of the
+request they answer.
+
+Requests are answered in the order they are received, as soon as each one has been
+processed, so clients may pipeline any number of requests without waiting on the
+replies. A JSON array of requests is handled as a batch.
+
+Usage:
+    python -m DocBlockr_Python.headless.daemon [--formatter NAME]
+
+Methods:
+    generateDocstring {text, offset, formatter} -- Generate the docstring snippet for
+        the docstring opened at `offset` in `text`
+    listFormatters -- Names of the registered formatters
+    shutdown -- Stop the daemon after replying
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+
+from ..core.settings import default_settings
+from ..core.warmup import warm_up
+from ..formatters.registry import REGISTRY, populate_registry
+from ..formatters.utils import create_snippet, escape, get_formatter_instance
+from ..parsers.context import analyze
+
+log = logging.getLogger(__name__)
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RpcError(Exception):
+    """JSON-RPC error to be sent back to the client.
+
+    Extends:
+        Exception
+
+    Variables:
+        code {int} -- JSON-RPC error code
+    """
+
+    def __init__(self, code, message):
+        """---."""
+        super(RpcError, self).__init__(message)
+        self.code = code
+
+
+class DocstringService:
+    """Warm docstring generation state shared by every request.
+
+    The registry is populated once. Formatter instances are created on first use
+    and shared with every later request, while each request is analyzed without
+    any shared state.
+
+    Variables:
+        default_formatter {str} -- Formatter used when a request doesn't name one
+        settings {core.settings.Settings} -- Settings given to the parser, like `type_rules`
+    """
+
+    def __init__(self, default_formatter='docblock', settings=None):
+        """---."""
+        populate_registry()
+        self.default_formatter = default_formatter
+        self.settings = settings if settings is not None else default_settings()
+
+    def get_formatter(self, name=None):
+        """Return the cached formatter instance for a formatter name.
+
+        Keyword Arguments:
+            name {str} -- Registered formatter name (default: {None})
+
+        Returns:
+            formatters.base.Base -- Formatter instance
+        """
+        return get_formatter_instance(name or self.default_formatter)
+
+    def generate_docstring(self, text, offset, formatter=None):
+        """Generate the docstring for the docstring opened at an offset.
+
+        Mirrors what `DocblockrPythonCommand` does in the editor, against a string.
+
+        Arguments:
+            text {str} -- Source of the whole file
+            offset {int} -- Position right after the opening quotes
+
+        Keyword Arguments:
+            formatter {str} -- Registered formatter name (default: {None})
+
+        Returns:
+            dict -- `snippet` to insert at `offset`, once the `erase` range has been
+                removed, and whether the docstring was already `closed`
+        """
+        context = analyze(text, offset, self.settings)
+
+        if context.closed:
+            return {'closed': True, 'erase': list(context.erase), 'snippet': '\n'}
+
+        snippet = create_snippet(
+            self.get_formatter(formatter), context.parsed, escape(context.trailing_string), context.closing_string,
+        )
+
+        return {'closed': False, 'erase': list(context.erase), 'snippet': snippet}
+
+    def list_formatters(self):
+        """Return the sorted names of the registered formatters."""
+        return sorted(REGISTRY)
+
+
+class Server:
+    """JSON-RPC dispatcher bound to a `DocstringService`.
+
+    Variables:
+        service {DocstringService} -- Service answering the requests
+        running {bool} -- False once a shutdown has been requested
+    """
+
+    def __init__(self, service):
+        """---."""
+        self.service = service
+        self.running = True
+        self.methods = {
+            'generateDocstring': self.generate_docstring,
+            'listFormatters': self.list_formatters,
+            'shutdown': self.shutdown,
+        }
+
+    def generate_docstring(self, text, offset, formatter=None):
+        """Handle `generateDocstring`."""
+        if not isinstance(text, str) or not isinstance(offset, int) or not 0 <= offset <= len(text):
+            raise RpcError(INVALID_PARAMS, 'expected a text and an offset within it')
+
+        return self.service.generate_docstring(text, offset, formatter)
+
+    def list_formatters(self):
+        """Handle `listFormatters`."""
+        return self.service.list_formatters()
+
+    def shutdown(self):
+        """Handle `shutdown`."""
+        self.running = False
+        return None
+
+    def handle(self, message):
+        """Answer a decoded message, which is either a request or a batch.
+
+        Arguments:
+            message {dict|list} -- Decoded JSON-RPC message
+
+        Returns:
+            dict|list|None -- Response(s), None if there is nothing to reply
+        """
+        if isinstance(message, list):
+            if len(message) == 0:
+                return self.error(None, INVALID_REQUEST, 'empty batch')
+
+            responses = [self.handle_request(request) for request in message]
+            return [response for response in responses if response is not None] or None
+
+        return self.handle_request(message)
+
+    def handle_request(self, request):
+        """Dispatch a single request and time it.
+
+        Arguments:
+            request {dict} -- Decoded JSON-RPC request
+
+        Returns:
+            dict|None -- Response, None for notifications
+        """
+        start = time.perf_counter()
+
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self.error(None, INVALID_REQUEST, 'invalid request')
+
+        request_id = request.get('id')
+        method = self.methods.get(request['method'])
+        params = request.get('params', [])
+
+        try:
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, 'unknown method {}'.format(request['method']))
+
+            try:
+                result = method(**params) if isinstance(params, dict) else method(*params)
+            except TypeError as error:
+                raise RpcError(INVALID_PARAMS, str(error))
+        except RpcError as error:
+            response = self.error(request_id, error.code, str(error))
+        except Exception as error:
+            log.exception('request {} failed'.format(request_id))
+            response = self.error(request_id, INTERNAL_ERROR, repr(error))
+        else:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+        if 'id' not in request:
+            return None
+
+        response['latency'] = round((time.perf_counter() - start) * 1000, 3)
+        return response
+
+    def error(self, request_id, code, message):
+        """Build an error response."""
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def read_messages(stream):
+    """Read framed messages from a binary stream.
+
+    Arguments:
+        stream {io.BufferedReader} -- Stream to read from
+
+    Yields:
+        {tuple} Raw message body, None when its `Content-Length` header is malformed,
+            and whether it was framed with headers
+    """
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+
+        if not line.strip():
+            continue
+
+        if not line.lower().startswith(b'content-length:'):
+            yield line, False
+            continue
+
+        try:
+            length = int(line.split(b':', 1)[1])
+        except (IndexError, ValueError):
+            length = -1
+
+        # Skip any remaining headers
+        while line.strip():
+            line = stream.readline()
+
+        yield stream.read(length) if length >= 0 else None, True
+
+
+def write_message(stream, message, framed):
+    """Write an encoded message with the requested framing.
+
+    Arguments:
+        stream {io.BufferedWriter} -- Stream to write to
+        message {dict|list} -- JSON-RPC response(s)
+        framed {bool} -- Whether to prefix the message with a `Content-Length` header
+    """
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+
+    if framed:
+        stream.write('Content-Length: {}\r\n\r\n'.format(len(body)).encode('ascii'))
+        stream.write(body)
+    else:
+        stream.write(body + b'\n')
+
+    stream.flush()
+
+
+def serve(server, instream, outstream):
+    """Answer requests from a stream until it closes or a shutdown is requested.
+
+    Arguments:
+        server {Server} -- Dispatcher answering the requests
+        instream {io.BufferedReader} -- Binary request stream
+        outstream {io.BufferedWriter} -- Binary response stream
+    """
+    for body, framed in read_messages(instream):
+        if body is None:
+            write_message(outstream, server.error(None, PARSE_ERROR, 'invalid Content-Length header'), framed)
+            continue
+
+        try:
+            message = json.loads(body.decode('utf-8'))
+        except ValueError as error:
+            write_message(outstream, server.error(None, PARSE_ERROR, str(error)), framed)
+            continue
+
+        response = server.handle(message)
+        if response is not None:
+            write_message(outstream, response, framed)
+
+        if not server.running:
+            break
+
+
+def main(argv=None):
+    """Run the daemon on stdio."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('--formatter', default=default_settings().get('formatter'), help='default formatter name')
+    args = arg_parser.parse_args(argv)
+
+    service = DocstringService(args.formatter)
+    if service.settings.get('warm_up'):
+        warm_up(service.settings.with_layer({'formatter': args.formatter}))
+
+    server = Server(service)
+    serve(server, sys.stdin.buffer, sys.stdout.buffer)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
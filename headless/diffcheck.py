@@ -0,0 +1,235 @@
+"""Docstring check of the definitions touched by a git diff, for pre-commit hooks.
+
+Reads the hunks of `git diff`, maps the changed rows to the innermost definition
+enclosing them, and runs the missing docstring and signature drift checks of
+`formatters.lint` on those definitions only. Files the diff doesn't touch are
+never read, and only the touched definitions of a file are parsed.
+
+Usage:
+    python -m DocBlockr_Python.headless.diffcheck [--base REF] [--formatter NAME] [--exit-first]
+
+Without `--base`, the staged changes are checked, in the staged version of the
+files rather than the working tree, which may hold unstaged edits. The exit status is 1 if any
+definition fails a check, and 2 if git can't be run.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from ..core.settings import default_settings
+from ..formatters.lint import check_definition
+from ..formatters.registry import populate_registry
+from ..formatters.utils import get_formatter_instance
+from ..parsers.parser import PythonParser
+from ..parsers.scanner import classify_rows, definition_source, scan_definitions
+
+FILE_RE = re.compile(r'\+\+\+ (?:b/)?(.+)')
+HUNK_RE = re.compile(r'@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+def parse_diff(text):
+    """Map the files of a unified diff to the rows changed in them.
+
+    Rows removed without a replacement count as a change to the row before them.
+
+    Arguments:
+        text {str} -- Output of `git diff --unified=0`
+
+    Returns:
+        {dict} -- Zero based rows of the new file by path, deleted files left out
+
+    >>> parse_diff('+++ b/a.py\\n@@ -1,0 +2,2 @@\\n+x\\n+y\\n')
+    {'a.py': {1, 2}}
+    """
+    changes = {}
+    rows = None
+    body = 0
+
+    for line in text.split('\n'):
+        # Lines of a hunk are skipped by count, as their text may look like a header
+        if body:
+            body -= 1
+            continue
+
+        if line.startswith('+++ '):
+            match = FILE_RE.match(line)
+            path = match.group(1) if match is not None else '/dev/null'
+            rows = None if path == '/dev/null' else changes.setdefault(path, set())
+            continue
+
+        match = HUNK_RE.match(line)
+        if match is None:
+            continue
+
+        removed, first, added = (1 if group is None else int(group) for group in match.groups())
+        body = removed + added
+
+        if rows is None:
+            continue
+        elif added:
+            rows.update(range(first - 1, first - 1 + added))
+        else:
+            rows.add(max(first - 1, 0))
+
+    return changes
+
+
+def git_changes(base=None, cwd=None):
+    """Run `git diff` on the python files of a repository.
+
+    Keyword Arguments:
+        base {str} -- Commit to compare the working tree with, the staged changes if None (default: {None})
+        cwd {str} -- Directory inside the repository (default: {None})
+
+    Returns:
+        {tuple} -- Root of the repository, and the changed rows by path relative to it
+    """
+    root = subprocess.check_output(['git', 'rev-parse', '--show-toplevel'], cwd=cwd).decode('utf-8').strip()
+    command = ['git', 'diff', '--unified=0', '--no-color', '--no-ext-diff', '--diff-filter=d']
+    command.append('--cached' if base is None else base)
+    command.extend(['--', '*.py'])
+
+    diff = subprocess.check_output(command, cwd=root).decode('utf-8', 'replace')
+    return root, parse_diff(diff)
+
+
+def touched_definitions(definitions, changed):
+    """Select the innermost definition enclosing each changed row.
+
+    Arguments:
+        definitions {list} -- `Definition` records ordered by their first row
+        changed {set} -- Zero based changed rows
+
+    Returns:
+        {list} -- Touched definitions, in file order
+    """
+    touched = set()
+
+    for row in changed:
+        # Definitions nest, so the last one holding the row is the innermost. The
+        # module sorts first and holds every row the others don't
+        innermost = 0
+        for index, definition in enumerate(definitions):
+            if definition.start > row:
+                break
+            if row <= definition.end:
+                innermost = index
+
+        touched.add(innermost)
+
+    return [definitions[index] for index in sorted(touched)]
+
+
+def read_source(root, path, staged=False):
+    """Read a changed file.
+
+    Arguments:
+        root {str} -- Root of the repository
+        path {str} -- Path of the file relative to the root
+
+    Keyword Arguments:
+        staged {bool} -- Read the version staged in the index rather than the working
+            tree (default: {False})
+
+    Returns:
+        {str} -- Contents of the file
+    """
+    if staged:
+        content = subprocess.check_output(['git', 'show', ':{}'.format(path)], cwd=root)
+    else:
+        with open(os.path.join(root, path), 'rb') as source:
+            content = source.read()
+
+    return content.decode('utf-8', 'replace')
+
+
+def check_source(formatter, text, changed, exit_first=False, parser=None):
+    """Check the definitions of a file touched by the changed rows.
+
+    Arguments:
+        formatter {formatters.base.Base} -- Formatter the docstrings are written with
+        text {str} -- Contents of the file, as of the diff
+        changed {set} -- Zero based changed rows
+
+    Keyword Arguments:
+        exit_first {bool} -- Stop at the first failing definition (default: {False})
+        parser {PythonParser} -- Parser built from the settings (default: {None})
+
+    Returns:
+        {list} -- `formatters.lint.Finding` tuples
+    """
+    rows = classify_rows(text.split('\n'))
+
+    parser = parser or PythonParser()
+    findings = []
+
+    for definition in touched_definitions(scan_definitions(rows), changed):
+        parsed = parser.parse(*definition_source(rows, definition))
+        findings.extend(check_definition(formatter, rows, definition, parsed))
+
+        if findings and exit_first:
+            break
+
+    return findings
+
+
+def check_changes(formatter, root, changes, exit_first=False, staged=False, parser=None):
+    """Check the definitions touched in every changed file.
+
+    Arguments:
+        formatter {formatters.base.Base} -- Formatter the docstrings are written with
+        root {str} -- Directory the paths are relative to
+        changes {dict} -- Zero based changed rows by path
+
+    Keyword Arguments:
+        exit_first {bool} -- Stop at the first failing definition (default: {False})
+        staged {bool} -- Read the files staged in the index, which the changes are
+            about when they're the staged ones (default: {False})
+        parser {PythonParser} -- Parser built from the settings (default: {None})
+
+    Yields:
+        {tuple} path and `formatters.lint.Finding`
+    """
+    for path in sorted(changes):
+        text = read_source(root, path, staged)
+
+        for finding in check_source(formatter, text, changes[path], exit_first, parser):
+            yield path, finding
+
+            if exit_first:
+                return
+
+
+def main(argv=None):
+    """Check the changes from the command line and print the findings."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('--base', default=None, help='commit to compare with, the staged changes by default')
+    arg_parser.add_argument('--formatter', default=None, help='formatter the docstrings are written with')
+    arg_parser.add_argument('--exit-first', action='store_true', help='stop at the first failing definition')
+    args = arg_parser.parse_args(argv)
+
+    populate_registry()
+    settings = default_settings()
+    formatter = get_formatter_instance(args.formatter or settings.get('formatter'))
+    try:
+        root, changes = git_changes(args.base)
+    except (OSError, subprocess.CalledProcessError) as error:
+        print('git diff failed: {}'.format(error), file=sys.stderr)
+        return 2
+
+    failed = False
+
+    findings = check_changes(formatter, root, changes, args.exit_first, staged=args.base is None,
+                             parser=PythonParser(settings))
+
+    for path, finding in findings:
+        print('{}:{}: {} {}'.format(path, finding.row + 1, finding.check, finding.message))
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Streaming export of parsed definitions as newline delimited JSON.
+
+Writes one JSON record per definition, as each file is scanned, for tools that need
+the definitions the parser sees without importing it. A record holds where the
+definition is, its kind and name, and the attributes `PythonParser.parse` found,
+under the same keys: `arguments`, `returns` or `yields`, `raises`, `decorators`,
+`extends` and `variables`.
+
+Only one file is held in memory at a time, whatever the size of the tree, or two
+chunks of files per worker process with `--jobs`. The records can be split into
+shards for parallel consumers; the definitions of a file always land in the same
+shard, picked from a hash of its path relative to the scanned directory.
+
+Usage:
+    python -m DocBlockr_Python.headless.export [--output PREFIX] [--shards N] [--jobs N] PATH [PATH ...]
+"""
+import argparse
+import json
+import os
+import sys
+import zlib
+
+from ..core.settings import default_settings
+from ..parsers.parser import PythonParser
+from .batch import scan_paths
+from .cache import DEFAULT_MAX_BYTES, ParseCache
+
+
+def definition_records(path, parsed):
+    """Build the export records of the definitions of a file.
+
+    Arguments:
+        path {str} -- Path of the file
+        parsed {list} -- (`Definition`, parser output) pairs, ordered by first row
+
+    Yields:
+        {dict} Record of each definition
+    """
+    # Enclosing (end row, qualified name) pairs, to name nested definitions
+    enclosing = []
+
+    for definition, output in parsed:
+        while enclosing and enclosing[-1][0] < definition.start:
+            enclosing.pop()
+
+        qualname = definition.name
+        if definition.kind != 'module':
+            qualname = '{}.{}'.format(enclosing[-1][1], definition.name) if enclosing else definition.name
+            enclosing.append((definition.end, qualname))
+
+        record = {
+            'path': path,
+            'kind': definition.kind,
+            'name': definition.name,
+            'qualname': qualname,
+            'line': (definition.row or 0) + 1,
+            'end_line': definition.end + 1,
+            'documented': definition.docstring is not None,
+        }
+        record.update(dict(output or ()))
+
+        yield record
+
+
+def shard_key(path, root='.'):
+    """Spell a path the same way however it was given, for sharding.
+
+    >>> shard_key('./src/../src/a.py')
+    'src/a.py'
+    """
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(root)).replace(os.sep, '/')
+
+
+def shard_of(path, shards, root='.'):
+    """Pick the shard of a file, the same on every run and platform.
+
+    Arguments:
+        path {str} -- Path of the file
+        shards {int} -- Number of shards
+
+    Keyword Arguments:
+        root {str} -- Directory the file was found under (default: {'.'})
+
+    Returns:
+        {int} -- Index of the shard
+    """
+    return zlib.crc32(shard_key(path, root).encode('utf-8')) % shards
+
+
+def root_of(path, roots):
+    """Return the deepest of the scanned directories holding a file.
+
+    Arguments:
+        path {str} -- Path of the file
+        roots {list} -- Scanned directories
+
+    Returns:
+        {str} -- Directory the file was found under, its own directory if none
+    """
+    absolute = os.path.abspath(path)
+    holding = [root for root in roots if absolute.startswith(os.path.join(os.path.abspath(root), ''))]
+
+    return max(holding, key=lambda root: len(os.path.abspath(root))) if holding else os.path.dirname(absolute)
+
+
+def shard_path(prefix, index, shards):
+    """Name the output file of a shard.
+
+    >>> shard_path('out/definitions', 1, 4)
+    'out/definitions-00001-of-00004.ndjson'
+    """
+    return '{}-{:05d}-of-{:05d}.ndjson'.format(prefix, index, shards)
+
+
+def export(paths, outputs, cache=None, jobs=1, parser=None):
+    """Stream the definitions of every python file under the paths into shards.
+
+    Arguments:
+        paths {list} -- Files and directories
+        outputs {list} -- Writable text streams, one per shard
+
+    Keyword Arguments:
+        cache {ParseCache} -- Cache to read and store the parsed files in (default: {None})
+        jobs {int} -- Number of worker processes, 1 to scan in process (default: {1})
+        parser {PythonParser} -- Parser built from the settings (default: {None})
+
+    Returns:
+        {tuple} -- Number of files and of definitions exported
+    """
+    files = definitions = 0
+    roots = [path for path in paths if os.path.isdir(path)]
+
+    for path, parsed, _ in scan_paths(paths, cache, jobs, parser=parser):
+        output = outputs[shard_of(path, len(outputs), root_of(path, roots))]
+        files += 1
+
+        for record in definition_records(path, parsed):
+            output.write(json.dumps(record, sort_keys=True, separators=(',', ':')))
+            output.write('\n')
+            definitions += 1
+
+    return files, definitions
+
+
+def main(argv=None):
+    """Export the paths from the command line."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('paths', nargs='+', help='files and directories to export')
+    arg_parser.add_argument('--output', help='prefix of the shard files, standard output by default')
+    arg_parser.add_argument('--shards', type=int, default=1, help='number of shard files')
+    arg_parser.add_argument('--cache', help='location of the parse cache database')
+    arg_parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                            help='size budget of the parse cache, in megabytes')
+    arg_parser.add_argument('--jobs', type=int, default=1, help='number of worker processes')
+    args = arg_parser.parse_args(argv)
+
+    if args.output is None and args.shards != 1:
+        arg_parser.error('--shards needs --output')
+
+    cache = ParseCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+
+    if args.output is None:
+        outputs = [sys.stdout]
+    else:
+        outputs = [open(shard_path(args.output, index, args.shards), 'w', encoding='utf-8')
+                   for index in range(args.shards)]
+
+    try:
+        files, definitions = export(args.paths, outputs, cache, args.jobs, PythonParser(default_settings()))
+    finally:
+        if args.output is not None:
+            for output in outputs:
+                output.close()
+
+    print('{} files, {} definitions'.format(files, definitions), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Replay of recorded invocations of the docstring command.
+
+Runs every invocation of a recording, made with the `record_invocations` setting,
+through the parser and formatter against a string backed view, and reports how
+long each took in the editor and when replayed.
+
+Usage:
+    python -m DocBlockr_Python.headless.replay [--repeat N] [--profile] [--json] RECORDING
+"""
+import argparse
+import cProfile
+import json
+import sys
+import time
+
+from ..core.profiling import read_recording, replay, summarize
+from ..core.warmup import warm_up
+
+
+def time_invocation(invocation, repeat=5):
+    """Replay an invocation several times.
+
+    Arguments:
+        invocation {core.profiling.Invocation} -- Invocation to replay
+
+    Keyword Arguments:
+        repeat {int} -- Number of replays (default: {5})
+
+    Returns:
+        {list} -- Seconds each replay took, sorted
+    """
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        replay(invocation)
+        timings.append(time.perf_counter() - start)
+
+    return sorted(timings)
+
+
+def replay_recording(path, repeat=5, profile=None):
+    """Replay and time every invocation of a recording.
+
+    Arguments:
+        path {str} -- Path of the recording
+
+    Keyword Arguments:
+        repeat {int} -- Replays of each invocation (default: {5})
+        profile {cProfile.Profile} -- Profile to run the replays under (default: {None})
+
+    Returns:
+        {list} -- Report of each invocation, in recording order
+    """
+    reports = []
+
+    # Imports and first time compilations would otherwise be billed to the first invocation
+    warm_up()
+
+    for index, (invocation, seconds) in enumerate(read_recording(path)):
+        if profile is not None:
+            timings = profile.runcall(time_invocation, invocation, repeat)
+        else:
+            timings = time_invocation(invocation, repeat)
+
+        reports.append({
+            'index': index,
+            'characters': len(invocation.text),
+            'offset': invocation.offset,
+            'formatter': invocation.formatter,
+            'recorded_ms': round(seconds * 1000, 3) if seconds is not None else None,
+            'min_ms': round(timings[0] * 1000, 3),
+            'median_ms': round(timings[len(timings) // 2] * 1000, 3),
+        })
+
+    return reports
+
+
+def main(argv=None):
+    """Replay a recording from the command line and report the timings."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('recording', help='recording made with the record_invocations setting')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='replays of each invocation')
+    arg_parser.add_argument('--profile', action='store_true', help='profile the replays and print the hotspots')
+    arg_parser.add_argument('--json', action='store_true', help='print the reports as JSON')
+    args = arg_parser.parse_args(argv)
+
+    profile = cProfile.Profile() if args.profile else None
+    reports = replay_recording(args.recording, max(args.repeat, 1), profile)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print('#{index} {characters} characters at {offset} [{formatter}]: recorded {recorded_ms} ms, '
+                  'replayed min {min_ms} ms, median {median_ms} ms'.format(**report))
+
+    if profile is not None:
+        print(summarize(profile))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""DocBlockr for Python.
+
+Author: Adam Bullmer <adam.bullmer@gmail.com>
+Website: https://github.com/adambullmer/sublime-docblockr-python
+
+Event listeners answering the plugin's key binding contexts and completions, and
+the caches they keep.
+"""
+import html
+import os
+import re
+
+import sublime
+import sublime_plugin
+
+from .commands import cache_manager, formatter_of, locators, parser_settings, select
+from .core.lint import IncrementalLint
+from .formatters.lint import SIGNATURE_DRIFT
+from .parsers.cache import ViewCache
+from .parsers.locator import DOCSTRING_SELECTOR
+from .parsers.parser import PythonParser
+from .parsers.scanner import classify_rows, scan_definitions, strip_comment
+
+OPEN_DOCSTRING_RE = re.compile(r'^\s*("""|\'\'\')\s*$')
+
+# Only string prefixes may precede a docstring on its line
+STRING_PREFIX_RE = re.compile(r'[ \t]*[rRuUbB]{0,2}$')
+
+LINT_KEY = 'docblockr_python_lint'
+
+# Milliseconds to wait after a save, so a burst of saves is checked once
+LINT_DELAY = 500
+
+open_docstrings = ViewCache('open_docstrings', cache_manager)
+definition_indexes = ViewCache('definition_indexes', cache_manager)
+
+# Outlive the edits of a buffer, unlike the caches: buffer id to `IncrementalLint`,
+# to the messages of each lint region, and to the number of the latest save
+lint_states = {}
+lint_messages = {}
+lint_saves = {}
+
+# Buffer id to the (definition line, contents) the completions were built for, and
+# the completions. Typing in a docstring changes neither.
+signature_completions = {}
+
+
+def in_open_docstring(view, point):
+    """Check if the text before a point only opens a docstring.
+
+    Arguments:
+        view  {sublime.View} -- View to check
+        point {Integer}      -- Position of the cursor
+
+    Returns:
+        {Bool} True if the line holds nothing but the opening quotes up to the point
+    """
+    def compute():
+        preceding = view.substr(sublime.Region(view.line(point).begin(), point))
+        return OPEN_DOCSTRING_RE.match(preceding) is not None
+
+    return open_docstrings.get(view, point, compute)
+
+
+def get_definition_index(view):
+    """Return the definitions of the current state of a view's buffer, scanned once per edit."""
+    def compute():
+        return scan_definitions(classify_rows(view.substr(sublime.Region(0, view.size())).split('\n')))
+
+    return definition_indexes.get(view, scan_definitions, compute)
+
+
+def undocumented(definitions, findings):
+    """Pick the classes and functions left to document.
+
+    Arguments:
+        definitions {list} -- `Definition` records, from `get_definition_index`
+        findings    {list} -- `formatters.lint.Finding` tuples of the same state of the file
+
+    Returns:
+        {list} (definition, message) pairs, for definitions without a docstring or with
+            a docstring out of date with their signature
+    """
+    drift = {}
+    for finding in findings:
+        if finding.check == SIGNATURE_DRIFT:
+            drift.setdefault(finding.name, []).append(finding)
+
+    items = []
+    for definition in definitions:
+        if definition.kind == 'module':
+            continue
+
+        if definition.docstring is None:
+            items.append((definition, 'no docstring'))
+            continue
+
+        # Drift is reported on the signature, or on the docstring entries
+        messages = [finding.message for finding in drift.get(definition.name, [])
+                    if definition.row <= finding.row <= definition.docstring[1]]
+        if messages:
+            items.append((definition, '; '.join(messages)))
+
+    return items
+
+
+def read_signature(view, docstring):
+    """Read the function a block string documents, from the lines around it.
+
+    Only the lines of the function are read, the scopes of the buffer aren't indexed.
+
+    Arguments:
+        view      {sublime.View}   -- View holding the string
+        docstring {sublime.Region} -- Region of the block string
+
+    Returns:
+        {tuple} Definition line, and lines of the definition without the docstring,
+            or None if the string isn't the docstring of a definition
+    """
+    position = docstring.begin()
+    line = view.line(position)
+    if not STRING_PREFIX_RE.match(view.substr(sublime.Region(line.begin(), position))):
+        return None
+
+    # Anything but the signature between it and the string ends up on the line
+    definition = PythonParser.get_definition(view, position)
+    if definition is None or not strip_comment(definition).rstrip().endswith(':'):
+        return None
+
+    return definition, PythonParser.read_contents(view, line.end(), docstring.end())
+
+
+def build_completions(view, line, contents):
+    """Build completions for the signature of the function a docstring documents.
+
+    Arguments:
+        view     {sublime.View} -- View to complete in
+        line     {String}       -- Definition line above the docstring
+        contents {list}         -- Lines of the definition, without the docstring
+
+    Returns:
+        {list} Completions for the parameters and raised exceptions, empty when the
+            docstring doesn't document a function
+    """
+    parser = PythonParser(parser_settings(view))
+    parsed = dict(parser.process_function(line, contents) or [])
+    completions = []
+
+    arguments = parsed.get('arguments', {'arguments': [], 'keyword_arguments': []})
+    for argument in arguments['arguments'] + arguments['keyword_arguments']:
+        hint = argument['type'] or 'argument'
+        if argument['default'] is not None:
+            hint = '{} = {}'.format(hint, argument['default'])
+
+        completions.append(['{}\t{}'.format(argument['name'], hint), argument['name']])
+
+    for exception in parsed.get('raises', []):
+        completions.append(['{}\traises'.format(exception), exception])
+
+    return completions
+
+
+def lint_regions(view, findings):
+    """Build one region per line holding findings, and the messages of each.
+
+    Arguments:
+        view     {sublime.View} -- View the findings are in
+        findings {list}         -- `formatters.lint.Finding` tuples, ordered by row
+
+    Returns:
+        {tuple} Regions, and the list of messages of each region
+    """
+    regions = []
+    messages = []
+
+    for finding in findings:
+        if regions and messages[-1][0] == finding.row:
+            messages[-1][1].append(finding.message)
+            continue
+
+        regions.append(view.line(view.text_point(finding.row, 0)))
+        messages.append((finding.row, [finding.message]))
+
+    return regions, [found for _, found in messages]
+
+
+def lint_view(view, save):
+    """Check the docstrings of a saved view, and mark the lines with findings.
+
+    Only the definitions that changed since the last check are checked again, at
+    most `lint_max_definitions` of them, so a large file is caught up with over a few
+    saves rather than holding up one. Does nothing if the view was saved again since.
+
+    Arguments:
+        view {sublime.View} -- View that was saved
+        save {Integer}      -- Number of the save that scheduled the check
+    """
+    buffer_id = view.buffer_id()
+    if lint_saves.get(buffer_id) != save or not view.is_valid():
+        return
+
+    settings = parser_settings(view)
+    state = lint_states.setdefault(buffer_id, IncrementalLint())
+
+    # Read ahead of the text, so that an edit in between makes the findings look stale
+    change_count = view.change_count()
+    state.check(view.substr(sublime.Region(0, view.size())), formatter_of(view), settings,
+                settings.get('lint_max_definitions'), change_count)
+
+    regions, lint_messages[buffer_id] = lint_regions(view, state.findings)
+    view.add_regions(LINT_KEY, regions, 'markup.warning', 'dot',
+                     sublime.DRAW_NO_FILL | sublime.DRAW_NO_OUTLINE | sublime.DRAW_SQUIGGLY_UNDERLINE)
+
+    if state.findings:
+        view.set_status(LINT_KEY, 'Docstrings: {} issues'.format(len(state.findings)))
+    else:
+        view.erase_status(LINT_KEY)
+
+
+class DocblockrPythonListener(sublime_plugin.EventListener):
+    """Sublime Text Event Listener.
+
+    Extends:
+        sublime_plugin.EventListener
+    """
+
+    def on_query_context(self, view, key, operator, operand, match_all):
+        """Answer the `docblockr_python_in_open_docstring` context.
+
+        Arguments:
+            view      {sublime.View} -- View the key was pressed in
+            key       {String}       -- Name of the context
+            operator  {Integer}      -- Comparison operator
+            operand   {Bool}         -- Value to compare against
+            match_all {Bool}         -- Whether every selection must match
+
+        Returns:
+            {Bool} Result of the comparison, or None if the context isn't ours
+        """
+        if key != 'docblockr_python_in_open_docstring':
+            return None
+
+        matches = (in_open_docstring(view, region.b) for region in view.sel())
+        value = all(matches) if match_all else any(matches)
+
+        if operator == sublime.OP_EQUAL:
+            return value == operand
+
+        if operator == sublime.OP_NOT_EQUAL:
+            return value != operand
+
+        return None
+
+    def on_query_completions(self, view, prefix, locations):
+        """Offer the documented function's parameters and exceptions inside its docstring.
+
+        The completions are kept until the definition line or the contents of the
+        function change, so typing in the docstring doesn't parse the function again.
+
+        Arguments:
+            view      {sublime.View} -- View to complete in
+            prefix    {String}       -- Text typed so far
+            locations {list}         -- Positions of the cursors
+
+        Returns:
+            {list} Completions, or None to leave completing to Sublime
+        """
+        # Spares other files, code and ordinary strings
+        if not view.match_selector(locations[0], DOCSTRING_SELECTOR):
+            return None
+
+        signature = read_signature(view, view.extract_scope(locations[0]))
+        if signature is None:
+            return None
+
+        buffer_id = view.buffer_id()
+        cached = signature_completions.get(buffer_id)
+        if cached is None or cached[0] != signature:
+            cached = signature_completions[buffer_id] = (signature, build_completions(view, *signature))
+
+        return cached[1] or None
+
+    def on_post_save_async(self, view):
+        """Check the docstrings of a saved python file, once the saves settle.
+
+        Arguments:
+            view {sublime.View} -- View that was saved
+        """
+        if not view.score_selector(0, 'source.python') or not parser_settings(view).get('lint_on_save'):
+            return
+
+        buffer_id = view.buffer_id()
+        save = lint_saves[buffer_id] = lint_saves.get(buffer_id, 0) + 1
+        sublime.set_timeout_async(lambda: lint_view(view, save), LINT_DELAY)
+
+    def on_hover(self, view, point, hover_zone):
+        """Show the docstring findings of a marked line.
+
+        Arguments:
+            view       {sublime.View} -- View hovered
+            point      {Integer}      -- Position under the mouse
+            hover_zone {Integer}      -- Text or gutter
+        """
+        messages = lint_messages.get(view.buffer_id())
+        if not messages:
+            return
+
+        # The regions follow the edits made since the check, the findings don't
+        for index, region in enumerate(view.get_regions(LINT_KEY)):
+            if region.begin() <= point <= region.end() and index < len(messages):
+                content = '<br>'.join(html.escape(message) for message in messages[index])
+                view.show_popup(content, sublime.HIDE_ON_MOUSE_MOVE_AWAY, point)
+                return
+
+    def on_close(self, view):
+        """Drop the cached state of a closed view."""
+        open_docstrings.discard(view)
+        locators.discard(view)
+        definition_indexes.discard(view)
+
+        buffer_id = view.buffer_id()
+        clones = (other for window in sublime.windows() for other in window.views()
+                  if other.buffer_id() == buffer_id and other.id() != view.id())
+
+        if next(clones, None) is None:
+            lint_states.pop(buffer_id, None)
+            lint_messages.pop(buffer_id, None)
+            lint_saves.pop(buffer_id, None)
+            signature_completions.pop(buffer_id, None)
+
+
+def format_usage(usage, max_bytes):
+    """Describe the memory used by each cache, one line per cache.
+
+    Arguments:
+        usage {dict} -- `buffers` and `bytes` by cache name, from `CacheManager.usage`
+        max_bytes {int} -- Budget of all the caches together
+
+    Returns:
+        {str} -- Report for the output panel
+    """
+    total = sum(cache['bytes'] for cache in usage.values())
+    lines = ['DocBlockr Python caches: {:.1f} KB of {:.1f} KB'.format(total / 1024, max_bytes / 1024)]
+
+    for name, cache in sorted(usage.items()):
+        lines.append('  {}: {} buffers, {:.1f} KB'.format(name, cache['buffers'], cache['bytes'] / 1024))
+
+    return '\n'.join(lines) + '\n'
+
+
+class DocblockrPythonCacheUsageCommand(sublime_plugin.WindowCommand):
+    """Show the memory held by the caches in an output panel, for debugging.
+
+    Extends:
+        sublime_plugin.WindowCommand
+    """
+
+    def run(self):
+        """Sublime Command Entrypoint."""
+        panel = self.window.create_output_panel('docblockr_python_cache_usage')
+        panel.run_command('append', {'characters': format_usage(cache_manager.usage(), cache_manager.max_bytes)})
+        self.window.run_command('show_panel', {'panel': 'output.docblockr_python_cache_usage'})
+
+
+class DocblockrPythonUndocumentedCommand(sublime_plugin.WindowCommand):
+    """List the classes and functions left to document in a quick panel.
+
+    Picking one jumps to it, or writes its docstring when `document` is set.
+    Definitions come from the index of each view, scanned once per edit. Docstrings
+    out of date are those the check on save found, so they are only listed while the
+    file is unchanged since its last save.
+
+    Extends:
+        sublime_plugin.WindowCommand
+    """
+
+    def run(self, all_views=False, document=False):
+        """Sublime Command Entrypoint.
+
+        Keyword Arguments:
+            all_views {Bool} -- List the open python files of the window, rather than
+                the active one (default: {False})
+            document  {Bool} -- Document the picked definition (default: {False})
+        """
+        window = self.window
+        views = window.views() if all_views else [window.active_view()]
+        self.items = []
+
+        for view in views:
+            if view is None or not view.score_selector(0, 'source.python'):
+                continue
+
+            state = lint_states.get(view.buffer_id())
+            findings = state.findings if state is not None and state.change_count == view.change_count() else []
+            for definition, message in undocumented(get_definition_index(view), findings):
+                self.items.append((view, definition, message))
+
+        if not self.items:
+            sublime.status_message('Every definition is documented')
+            return
+
+        panel_items = []
+        for view, definition, message in self.items:
+            location = 'line'
+            if all_views:
+                location = os.path.basename(view.file_name() or '') or view.name() or 'untitled'
+
+            panel_items.append([
+                '{} {}'.format('class' if definition.kind == 'class' else 'def', definition.name),
+                '{} {}: {}'.format(location, definition.row + 1, message),
+            ])
+
+        window.show_quick_panel(panel_items, lambda index: self.on_done(index, document),
+                                0, 0, self.on_highlight)
+
+    def on_highlight(self, index):
+        """Show the highlighted definition, if it's in the active view."""
+        view, definition, _ = self.items[index]
+        if view == self.window.active_view():
+            view.show_at_center(view.text_point(definition.row, 0))
+
+    def on_done(self, index, document):
+        """Jump to the picked definition, or document it.
+
+        Arguments:
+            index    {Integer} -- Index of the picked item, -1 if the panel was cancelled
+            document {Bool}    -- Document the definition rather than only jumping to it
+        """
+        if index == -1:
+            return
+
+        view, definition, _ = self.items[index]
+        self.window.focus_view(view)
+
+        if document:
+            docstring = definition.docstring[0] if definition.docstring is not None else None
+            view.run_command('docblockr_python_document',
+                             {'row': definition.row, 'body': definition.body, 'docstring': docstring})
+        else:
+            select(view, view.text_point(definition.row, 0))
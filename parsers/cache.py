@@ -0,0 +1,252 @@
+"""Caches of values computed from the state of a view.
+
+Values are kept per buffer and tagged with the buffer's change count, so that they
+are dropped as soon as the buffer is edited. Views of the same buffer, like the
+panes of a split editor, share their values.
+
+Caches can share a `CacheManager`, holding all of them to a single byte budget. The
+values cached for a buffer are evicted together, least recently used first, across
+every cache.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def estimate_size(value):
+    """Estimate the bytes held by a value and everything it refers to.
+
+    Walks containers and the attributes of objects, counting every object once.
+    Views, and anything else with a `change_count`, belong to the editor and aren't
+    counted, nor are callables.
+
+    Arguments:
+        value {object} -- Value to measure
+
+    Returns:
+        {int} -- Estimated bytes
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or callable(item) or hasattr(item, 'change_count'):
+            continue
+
+        seen.add(id(item))
+        total += sys.getsizeof(item, 64)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, '__dict__'):
+            stack.append(vars(item))
+
+    return total
+
+
+class CacheManager:
+    """Byte budget shared by view caches.
+
+    A buffer's values are measured when one of them is stored. Values like
+    locators fill up as they are used, so the buffers read since are measured again
+    for the usage report.
+
+    Caches may be used from the main and the async threads of the editor, a lock
+    guards the bookkeeping.
+
+    Variables:
+        max_bytes {int} -- Budget of all the caches together
+        caches {dict} -- Managed caches by name
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """---."""
+        self.max_bytes = max_bytes
+        self.caches = {}
+        self._sizes = OrderedDict()
+        self._stale = set()
+        self._lock = threading.RLock()
+
+    def register(self, name, cache):
+        """Hold a cache to the budget under a name, for the usage report."""
+        self.caches[name] = cache
+
+    def touch(self, name, buffer_id, stored=False):
+        """Mark the values of a buffer as the most recently used, evicting others if needed.
+
+        Arguments:
+            name {str} -- Name of the cache
+            buffer_id {int} -- Buffer the values were computed from
+
+        Keyword Arguments:
+            stored {bool} -- Whether a value was just stored (default: {False})
+        """
+        key = (name, buffer_id)
+
+        with self._lock:
+            size = self._sizes.pop(key, 0)
+
+            if stored:
+                size = estimate_size(self.caches[name].entry(buffer_id))
+                self._stale.discard(key)
+            else:
+                self._stale.add(key)
+
+            self._sizes[key] = size
+
+            if stored:
+                self.evict()
+
+    def forget(self, name, buffer_id):
+        """Stop counting the values of a buffer, once they're dropped."""
+        with self._lock:
+            self._sizes.pop((name, buffer_id), None)
+            self._stale.discard((name, buffer_id))
+
+    def total(self):
+        """Return the bytes held by every cache, as of their last measure."""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def measure(self):
+        """Measure again the values of the buffers read since they were last measured."""
+        with self._lock:
+            for name, buffer_id in self._stale:
+                if (name, buffer_id) in self._sizes:
+                    self._sizes[(name, buffer_id)] = estimate_size(self.caches[name].entry(buffer_id))
+            self._stale.clear()
+
+    def evict(self):
+        """Drop the least recently used values until the caches fit the budget."""
+        with self._lock:
+            total = self.total()
+
+            # The most recently used values are kept, even if they alone are over budget
+            while total > self.max_bytes and len(self._sizes) > 1:
+                (name, buffer_id), size = self._sizes.popitem(last=False)
+                self._stale.discard((name, buffer_id))
+                self.caches[name].evict(buffer_id)
+                total -= size
+
+    def usage(self):
+        """Report the bytes and buffers held by each cache.
+
+        Returns:
+            {dict} -- `buffers` and `bytes` by cache name
+        """
+        usage = dict((name, {'buffers': 0, 'bytes': 0}) for name in self.caches)
+
+        with self._lock:
+            self.measure()
+            self.evict()
+
+            for (name, _), size in self._sizes.items():
+                usage[name]['buffers'] += 1
+                usage[name]['bytes'] += size
+
+        return usage
+
+
+class ViewCache:
+    """Per buffer cache invalidated by edits.
+
+    The views using the values of a buffer are counted, so that the values are only
+    forgotten once the last of them is closed.
+
+    Works with anything providing `id()`, `buffer_id()` and `change_count()`, like
+    `sublime.View`.
+    """
+
+    def __init__(self, name=None, manager=None):
+        """Create an empty cache, held to the budget of a manager if given.
+
+        Keyword Arguments:
+            name {str} -- Name the cache is reported under (default: {None})
+            manager {CacheManager} -- Manager of the byte budget (default: {None})
+        """
+        self.name = name
+        self.manager = manager
+        self._entries = {}
+        self._views = {}
+
+        if manager is not None:
+            manager.register(name, self)
+
+    def values(self, view):
+        """Return the values cached for the current state of a view.
+
+        Arguments:
+            view {sublime.View} -- View the values were computed from
+
+        Returns:
+            {dict} -- Cached values, emptied if the view changed since they were stored
+        """
+        buffer_id = view.buffer_id()
+        change_count = view.change_count()
+        entry = self._entries.get(buffer_id)
+
+        if entry is None or entry[0] != change_count:
+            entry = self._entries[buffer_id] = (change_count, {})
+
+        self._views.setdefault(buffer_id, set()).add(view.id())
+
+        return entry[1]
+
+    def get(self, view, key, compute):
+        """Return a cached value, computing and storing it on a miss.
+
+        Arguments:
+            view {sublime.View} -- View the value is computed from
+            key {hashable} -- Key of the value
+            compute {callable} -- Computes the value, when it isn't cached yet
+
+        Returns:
+            {object} -- Cached value
+        """
+        values = self.values(view)
+        stored = key not in values
+
+        if stored:
+            values[key] = compute()
+
+        if self.manager is not None:
+            self.manager.touch(self.name, view.buffer_id(), stored)
+
+        return values[key]
+
+    def entry(self, buffer_id):
+        """Return the (change count, values) entry of a buffer, or None."""
+        return self._entries.get(buffer_id)
+
+    def evict(self, buffer_id):
+        """Forget the values of a buffer, which are computed again on the next use."""
+        self._entries.pop(buffer_id, None)
+
+    def discard(self, view):
+        """Release a closed view, forgetting the values of its buffer if no other view uses them."""
+        buffer_id = view.buffer_id()
+        views = self._views.get(buffer_id, set())
+        views.discard(view.id())
+
+        if not views:
+            self._views.pop(buffer_id, None)
+            self._entries.pop(buffer_id, None)
+
+            if self.manager is not None:
+                self.manager.forget(self.name, buffer_id)
+
+    def clear(self):
+        """Forget everything cached."""
+        if self.manager is not None:
+            for buffer_id in self._entries:
+                self.manager.forget(self.name, buffer_id)
+
+        self._entries.clear()
+        self._views.clear()
@@ -0,0 +1,75 @@
+"""Stateless analysis of the docstring opened at a position.
+
+Everything the commands need to write a docstring is computed by one function call,
+and returned as an immutable `DocstringContext`. No state is kept between calls, on
+the parser or anywhere else, so analyses may run concurrently on threads or
+processes.
+"""
+from collections import namedtuple
+
+from .parser import PythonParser, docstring_closing
+from .view import StringView
+
+QUOTES = ('"""', "'''")
+
+DocstringContext = namedtuple('DocstringContext', [
+    'closed',           # whether the docstring is already closed
+    'closing_string',   # quotes closing the docstring
+    'erase',            # (begin, end) of the text after the opening quotes
+    'trailing_string',  # text after the opening quotes, used as the summary
+    'definition',       # definition line the docstring documents
+    'parsed',           # (attribute type, attributes) pairs, empty if closed
+])
+
+
+def analyze_view(view, position, settings=None, locator=None):
+    """Analyze the docstring opened at a position of a view.
+
+    Arguments:
+        view     {sublime.View} -- View holding the docstring, or a `StringView`
+        position {Integer}      -- Position right after the opening quotes
+
+    Keyword Arguments:
+        settings {dict} -- View settings given to the parser (default: {None})
+        locator {ScopeLocator} -- Locator of the current state of the view (default: {None})
+
+    Returns:
+        {DocstringContext} Analysis of the docstring
+    """
+    closed, closing_string = docstring_closing(view, position)
+
+    if closed:
+        return DocstringContext(True, closing_string, (position, position), '', None, ())
+
+    line = view.line(position)
+    trailing = view.substr(type(line)(position, line.end()))
+
+    # trailing characters are put inside the body of the comment, without the quotes
+    trailing_string = trailing.strip()
+    if trailing_string.endswith(QUOTES):
+        trailing_string = trailing_string[:-3].rstrip()
+
+    parser = PythonParser(settings)
+    definition = parser.get_definition(view, position, locator)
+    contents = parser.read_contents(view, line.end())
+    parsed = parser.parse(definition, contents)
+
+    return DocstringContext(
+        False, closing_string, (position, line.end()), trailing_string, definition, tuple(parsed),
+    )
+
+
+def analyze(text, offset, settings=None):
+    """Analyze the docstring opened at an offset of a source string.
+
+    Arguments:
+        text   {str}     -- Source of the whole file
+        offset {Integer} -- Position right after the opening quotes
+
+    Keyword Arguments:
+        settings {dict} -- View settings given to the parser (default: {None})
+
+    Returns:
+        {DocstringContext} Analysis of the docstring
+    """
+    return analyze_view(StringView(text, offset, settings), offset, settings)
@@ -0,0 +1,186 @@
+"""Educated guesses of types from names and values.
+
+Names are matched against the rules of the `type_rules` setting first, then against
+the built in naming conventions. A rule is a `[glob, type]` pair, like
+`["*_id", "int"]` or `["df*", "pandas.DataFrame"]`, and the first matching rule
+wins.
+
+Each set of rules is compiled once into a single regex, every rule an alternative
+of it, and the type guessed for each name is remembered. Adding rules doesn't add a
+regex match per rule to every argument of every signature.
+"""
+import re
+
+# Naming conventions, matched after the rules of the settings
+NAME_RULES = (
+    (r'(?:is|has)[A-Z_].*', 'bool'),
+    (r'(?:cb|callback|done|next|fn)', 'function'),
+)
+
+# Prefixes of the source of a value
+VALUE_RULES = (
+    (r'["\']', 'str'),
+    (r'\[', 'list'),
+    (r'\{', 'dict'),
+    (r'\(', 'tuple'),
+    (r'(?:True|False)\Z', 'bool'),
+    (r'[rR]["\']', 'regexp'),
+    (r'[uU]["\']', 'unicode'),
+    (r'lambda ', 'function'),
+)
+
+MAX_MEMO = 4096
+
+
+def glob_pattern(glob):
+    """Translate a glob on names into a regex.
+
+    Arguments:
+        glob {str} -- Glob where `*` matches any run of characters, and `?` any one
+
+    Returns:
+        {str} -- Regex matching the same names
+
+    >>> glob_pattern('df*')
+    'df.*'
+    """
+    return ''.join('.*' if char == '*' else '.' if char == '?' else re.escape(char) for char in glob)
+
+
+def combine(rules, anchor=''):
+    """Compile (regex, type) rules into one regex, with a named group per rule.
+
+    Arguments:
+        rules {list} -- (regex, type) pairs, from the highest precedence
+
+    Keyword Arguments:
+        anchor {str} -- Appended to every rule (default: {''})
+
+    Returns:
+        {tuple} -- Compiled regex, and the type of each rule
+    """
+    pattern = '|'.join('(?P<rule{}>{}){}'.format(index, regex, anchor) for index, (regex, _) in enumerate(rules))
+    return re.compile(pattern), [type_name for _, type_name in rules]
+
+
+def _guess(matcher, types, text):
+    """Return the type of the first rule matching a text, or None."""
+    match = matcher.match(text)
+    return types[int(match.lastgroup[4:])] if match is not None else None
+
+
+class TypeRules:
+    """Name rules compiled into a single matcher.
+
+    Variables:
+        rules {tuple} -- `(glob, type)` pairs of the settings
+        matcher {re.Pattern} -- Regex with an alternative per rule
+        types {list} -- Type of each rule, by position
+        memo {dict} -- Type guessed for each name seen so far
+    """
+
+    def __init__(self, rules=()):
+        """Compile the rules of the settings ahead of the naming conventions.
+
+        Keyword Arguments:
+            rules {list} -- `[glob, type]` pairs (default: {()})
+        """
+        self.rules = tuple(tuple(rule) for rule in rules)
+        self.matcher, self.types = combine(
+            tuple((glob_pattern(glob), type_name) for glob, type_name in self.rules) + NAME_RULES, r'\Z',
+        )
+        self.memo = {}
+
+    def guess(self, name):
+        """Make an educated guess about the type of a variable based on its name.
+
+        Arguments:
+            name {str} -- variable name
+
+        Returns:
+            {str} -- type of the first matching rule or None if none matches
+        """
+        try:
+            return self.memo[name]
+        except KeyError:
+            pass
+
+        if len(self.memo) >= MAX_MEMO:
+            self.memo.clear()
+
+        self.memo[name] = type_name = _guess(self.matcher, self.types, name)
+        return type_name
+
+
+VALUE_MATCHER, VALUE_TYPES = combine(VALUE_RULES)
+
+_compiled = {}
+
+
+def _is_rule(rule):
+    """Tell whether a setting entry is a `[glob, type]` pair of strings."""
+    return isinstance(rule, (list, tuple)) and len(rule) == 2 and all(isinstance(part, str) for part in rule)
+
+
+def get_type_rules(rules=None):
+    """Return the compiled rules of a `type_rules` setting, compiling them on first use.
+
+    Keyword Arguments:
+        rules {list} -- `[glob, type]` pairs, entries that aren't pairs of strings are
+            ignored (default: {None})
+
+    Returns:
+        {TypeRules} -- Rules shared by every parser using the same setting
+    """
+    key = tuple(tuple(rule) for rule in rules or () if _is_rule(rule))
+
+    if key not in _compiled:
+        _compiled[key] = TypeRules(key)
+
+    return _compiled[key]
+
+
+def is_numeric(val):
+    """Check if string is numeric.
+
+    Arguments:
+        val {str} -- potentially stringified number
+
+    Returns:
+        bool -- if the passed value is numeric
+    """
+    try:
+        float(val)
+        return True
+    except ValueError:
+        return False
+
+
+def guess_type_from_name(name):
+    """Make an educated guess about the type of a variable based on common naming conventions.
+
+    Arguments:
+        name {str} -- variable name
+
+    Returns:
+        {str} -- string of the builtin type or None if one cannot be found
+    """
+    return get_type_rules().guess(name)
+
+
+def guess_type_from_value(value):
+    """Make educated assertion about the type of the value.
+
+    Arguments:
+        value {str} -- string representation of a value
+
+    Returns:
+        {str} -- string of the builtin type or None if one cannot be found
+    """
+    if value is None or not isinstance(value, str):
+        return None
+
+    if is_numeric(value):
+        return "number"
+
+    return _guess(VALUE_MATCHER, VALUE_TYPES, value)
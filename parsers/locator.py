@@ -0,0 +1,110 @@
+"""Definition lookup from the syntax engine's scopes.
+
+The syntax definition has already tokenized the whole buffer, so rather than reading
+lines one at a time in python, the regions of every definition and docstring are
+fetched with a single `view.find_by_selector` call each. Syntaxes that don't scope
+definitions return no regions, in which case callers fall back to the line scanner.
+"""
+import re
+from bisect import bisect_right
+
+DEFINITION_SELECTOR = 'meta.function.python, meta.class.python'
+DOCSTRING_SELECTOR = ', '.join([
+    'comment.block.documentation.python',
+    'comment.block.python',
+    'string.quoted.docstring.multi.python',
+    'string.quoted.double.block',
+    'string.quoted.single.block.python',
+])
+
+DEFINITION_KEYWORD_RE = re.compile(r'\s*(?:async\s+)?(?:def|class)\b')
+
+
+class ScopeLocator:
+    """Find definitions and docstrings through the scopes of a view.
+
+    Regions are fetched on first use and kept, so a locator should not outlive the
+    state of the view it was created for.
+
+    Variables:
+        view {sublime.View} -- View to search
+    """
+
+    def __init__(self, view):
+        """---."""
+        self.view = view
+        self._definitions = None
+        self._definition_ends = None
+        self._docstrings = None
+        self._docstring_begins = None
+
+    def definitions(self):
+        """Return the regions of every function and class definition line.
+
+        Returns:
+            {list} -- Regions ordered by position
+        """
+        if self._definitions is None:
+            self._definitions = list(self.view.find_by_selector(DEFINITION_SELECTOR))
+            self._definition_ends = [region.end() for region in self._definitions]
+
+        return self._definitions
+
+    def docstrings(self):
+        """Return the regions of every block string.
+
+        Returns:
+            {list} -- Regions ordered by position
+        """
+        if self._docstrings is None:
+            self._docstrings = list(self.view.find_by_selector(DOCSTRING_SELECTOR))
+            self._docstring_begins = [region.begin() for region in self._docstrings]
+
+        return self._docstrings
+
+    def is_available(self):
+        """Tell whether the syntax of the view scopes definitions at all."""
+        return len(self.definitions()) > 0
+
+    def docstring_at(self, position):
+        """Return the region of the docstring containing a position, or None."""
+        docstrings = self.docstrings()
+        index = bisect_right(self._docstring_begins, position) - 1
+
+        if index >= 0 and position <= docstrings[index].end():
+            return docstrings[index]
+
+        return None
+
+    def definition_before(self, position):
+        """Get the definition line directly above the line of a position.
+
+        Definitions wrapped over several lines are joined onto a single line, the same
+        way `PythonParser.get_definition` does.
+
+        Arguments:
+            position {int} -- Position of the docstring
+
+        Returns:
+            {str} Definition line, or None if no definition ends right above the position
+        """
+        view = self.view
+        line_begin = view.line(position).begin()
+        definitions = self.definitions()
+        index = bisect_right(self._definition_ends, line_begin) - 1
+
+        if index < 0:
+            return None
+
+        definition_lines = view.line(definitions[index])
+
+        # Only whitespace may separate the definition from the docstring
+        between = type(definition_lines)(definition_lines.end(), line_begin)
+        if view.substr(between).strip():
+            return None
+
+        lines = view.substr(definition_lines).split('\n')
+        if not DEFINITION_KEYWORD_RE.match(lines[0]):
+            return None
+
+        return ' '.join(line.strip() for line in lines)
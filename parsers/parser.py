@@ -1,9 +1,52 @@
 """Parsing Class for python files."""
 import logging
 import re
+from collections import namedtuple
+
+from .guess import get_type_rules, guess_type_from_value
 
 log = logging.getLogger(__name__)
 
+# Hard limit on the lines read above a docstring while looking for its definition
+MAX_DEFINITION_LINES = 500
+
+# Every pattern below runs in linear time, even on long or malformed lines:
+# - patterns over several lines only skip `[ \t]`, as `\s` would run over line breaks
+#   and retry each following line from every line start
+# - no nested or adjacent repetitions can match the same text
+# - repeated searches only start at the beginning of a word
+DEFINITION_KEYWORD_RE = re.compile(r'(?:async\s+)?(?:def|class)\b')
+DECORATOR_RE = re.compile(r'^[ \t]*@([a-zA-Z0-9_\.]*)(\(.*\)|$)', re.MULTILINE)
+CLASS_RE = re.compile(r'\s*class ')
+FUNCTION_RE = re.compile(r'\s*def ')
+EXTENDS_RE = re.compile(r'\s*class \w*\((.*)\):\s*$')
+ARGUMENTS_RE = re.compile(r'\s*def\s+\w+\s*\((.*)\)')
+ANNOTATION = r'[\w\.]+(?:\[[^:]*\])?'
+HINT_RE = re.compile(r'\b(\w+)\s*:\s*(' + ANNOTATION + ')')
+HINT_ANNOTATION_RE = re.compile(r':\s*' + ANNOTATION + r'\s*')
+FUNCTION_ARGUMENTS_RE = re.compile(r'\s*def\s+\w+\s*\(')
+RETURN_HINT_RE = re.compile(r'\s*->\s*(' + ANNOTATION + r')\s*:')
+RETURNS_RE = re.compile(r'^[ \t]*(return|yield) (\w+)', re.MULTILINE)
+RAISES_RE = re.compile(r'^[ \t]*(raise) (\w+)', re.MULTILINE)
+VARIABLE_EXCLUDED_RE = re.compile(r'from |import |def |class |@')
+
+# Kinds of lines told apart by `tokenize_lines`
+BLANK = 'blank'
+COMMENT = 'comment'
+CODE = 'code'
+
+Token = namedtuple('Token', [
+    'kind',         # BLANK, COMMENT or CODE
+    'region',       # region of the line in the view
+    'text',         # text of the line
+    'indentation',  # indentation level of the line, None if blank
+])
+
+DefinitionHeader = namedtuple('DefinitionHeader', [
+    'docstring_type',  # 'module', 'class' or 'function'
+    'lines',           # decorator and definition lines, in file order
+])
+
 
 def get_parser(view):
     """Return the class of the parser to use.
@@ -87,6 +130,120 @@ def split_by_commas(string):
     return out
 
 
+def _brackets(string, start=0):
+    """Yield the brackets of a string, skipping those inside of quotes and comments.
+
+    Arguments:
+        string {String} -- Code
+
+    Keyword Arguments:
+        start {int} -- Index to start reading from (default: {0})
+
+    Yields:
+        {tuple} Index of the bracket, and the number of brackets left open after it
+    """
+    balance = 0
+    quote = None
+    index = start
+
+    while index < len(string):
+        char = string[index]
+
+        if quote is not None:
+            if char == '\\':
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '#':
+            index = string.find('\n', index)
+            if index == -1:
+                return
+        elif char in '([{':
+            balance += 1
+            yield index, balance
+        elif char in ')]}':
+            balance -= 1
+            yield index, balance
+
+        index += 1
+
+
+def bracket_balance(string):
+    """Count the brackets a string leaves open.
+
+    Brackets inside of quotes, and comments, are not counted.
+
+    Arguments:
+        string {String} -- Line of code
+
+    Examples:
+        >>> bracket_balance('def foo(a, b=")",')
+        1
+
+    Returns:
+        {int} Number of opened brackets minus the number of closed brackets
+    """
+    balance = 0
+
+    for _, balance in _brackets(string):
+        pass
+
+    return balance
+
+
+def closing_bracket(string, start):
+    """Find the bracket closing the one a string opens at some index.
+
+    Brackets inside of quotes, and comments, are not counted.
+
+    Arguments:
+        string {String} -- Code
+        start {int} -- Index of the opening bracket
+
+    Examples:
+        >>> closing_bracket('def foo(a=(1, ")")) -> int:', 7)
+        18
+
+    Returns:
+        {int} Index of the closing bracket, -1 if it's never closed
+    """
+    for index, balance in _brackets(string, start):
+        if balance == 0:
+            return index
+
+    return -1
+
+
+def contents_lines(contents):
+    """Return the lines of contents given as text, or as a list of lines."""
+    return contents.split('\n') if isinstance(contents, str) else contents
+
+
+def contents_text(contents):
+    """Return contents given as a list of lines as text, each line ending with a newline."""
+    return contents if isinstance(contents, str) else ''.join(line + '\n' for line in contents)
+
+
+def get_definition_type(line):
+    """Tell which kind of definition a line opens.
+
+    Arguments:
+        line {String} -- Definition line
+
+    Returns:
+        {String} 'class', 'function', or 'module' for anything else
+    """
+    if CLASS_RE.match(line):
+        return 'class'
+
+    if FUNCTION_RE.match(line):
+        return 'function'
+
+    return 'module'
+
+
 def read_next_line(view, position, reverse=False):
     """Get the next line of the view.
 
@@ -126,81 +283,98 @@ def read_next_line(view, position, reverse=False):
         yield current_line
 
 
-def is_numeric(val):
-    """Check if string is numeric.
+def iter_lines(view, position, reverse=False):
+    """Read the text of the lines following a position, as they are consumed.
 
     Arguments:
-        val {str} -- potentially stringified number
+        view     {sublime.View} -- View to be read
+        position {Integer}      -- Position in the view
 
-    Returns:
-        bool -- if the passed value is numeric
+    Keyword Arguments:
+        reverse {Bool} -- If true, read towards the beginning of the file (default False)
+
+    Yields:
+        {tuple} Region and text of the next line
     """
-    try:
-        float(val)
-        return True
-    except ValueError:
-        return False
+    for current_line in read_next_line(view, position, reverse):
+        yield current_line, view.substr(current_line)
 
 
-def guess_type_from_name(name):
-    """Make an educated guess about the type of a variable based on common naming conventions.
+def tokenize_lines(view, lines):
+    """Classify lines as blank, comment, or code.
+
+    The indentation level is only looked up for lines that aren't blank.
 
     Arguments:
-        name {str} -- variable name
+        view  {sublime.View} -- View the lines were read from
+        lines {iterable}     -- Region and text pairs, as given by `iter_lines`
 
-    Returns:
-        {str} -- string of the builtin type or None if one cannot be found
+    Yields:
+        {Token} Classified line
     """
-    if re.match("(?:is|has)[A-Z_]", name):
-        return 'bool'
+    for region, text in lines:
+        stripped = text.lstrip()
 
-    if re.match("^(?:cb|callback|done|next|fn)$", name):
-        return 'function'
+        if not stripped:
+            yield Token(BLANK, region, text, None)
+        elif stripped[0] == '#':
+            yield Token(COMMENT, region, text, view.indentation_level(region.end()))
+        else:
+            yield Token(CODE, region, text, view.indentation_level(region.end()))
 
-    return None
 
+def docstring_closing(view, position):
+    """Check if a docstring is closed, and which quotes it uses.
 
-def guess_type_from_value(value):
-    """Make educated assertion about the type of the value.
+    Keep reading lines until we reach the end of the file, class, or function
+    We will assume that if the indentation level is ever lower than present, and no
+    closing docstring has been found yet, the component has ended and needs to be closed
 
     Arguments:
-        value {str} -- string representation of a value
+        view     {sublime.View} -- Current Sublime Text View
+        position {Integer}      -- Position in the view where the docstring is
 
     Returns:
-        {str} -- string of the builtin type or None if one cannot be found
+        {tuple} True if the docstring is confirmed closed, and the quotes closing it
     """
-    if value is None or not isinstance(value, str):
-        return None
+    def quotes(match, default='"""'):
+        if match is None:
+            return default
 
-    first_char = value[0:1]
+        s = match.group(0).strip()[0:3]
+        if s not in ['"""', "'''"]:
+            raise Exception('could not find closing string.  Match was: {}'.format(match))
 
-    if is_numeric(value):
-        return "number"
+        return s
 
-    char_map = {
-        '\"': "str",
-        '\'': "str",
-        '[': "list",
-        '{': "dict",
-        '(': "tuple",
-    }
+    indentation_level = view.indentation_level(position)
 
-    if char_map.get(first_char) is not None:
-        return char_map.get(first_char)
+    # Check the current line first, and ignore if docstring is closed on this line
+    line = view.substr(view.line(position))
+    match = re.search(r'^\s*(""".*"""|\'\'\'.*\'\'\')\s*$', line)
 
-    if value in ['True', 'False']:
-        return 'bool'
+    if match is not None:
+        return False, quotes(match)
 
-    if value[:2] in ["r'", 'r"', "R'", 'R"']:
-        return 'regexp'
+    for token in tokenize_lines(view, iter_lines(view, position)):
+        # Not an empty line
+        if token.kind == BLANK:
+            continue
 
-    if value[:2] in ["u'", 'u"', "U'", 'U"']:
-        return 'unicode'
+        # Not on a more indented line
+        if token.indentation > indentation_level:
+            continue
 
-    if value[:7] == 'lambda ':
-        return 'function'
+        # Still within the same indentation level
+        if token.indentation < indentation_level:
+            break
 
-    return None
+        # Line only contains whitespace and """
+        match = re.search(r'^\s*("""|\'\'\')', token.text)
+        if match is not None:
+            return True, quotes(match)
+
+    return False, quotes(re.search(r'^\s*("""|\'\'\')', line))
 
 
 class PythonParser:
@@ -213,10 +387,11 @@ class PythonParser:
     def __init__(self, view_settings=None):
         """---."""
         self.view_settings = view_settings
+        self.type_rules = get_type_rules(view_settings.get('type_rules') if view_settings is not None else None)
         self.closing_string = '"""'
 
     @classmethod
-    def get_definition(self, view, position):
+    def get_definition(self, view, position, locator=None):
         """Get the definition line.
 
         String representation fo the line above the docstring
@@ -225,6 +400,11 @@ class PythonParser:
             view {sublime.View} -- The sublime view in which this is executing
             position {Integer} -- Position of the docstring
 
+        Keyword Arguments:
+            locator {ScopeLocator} -- Locator of the current state of the view, kept
+                between calls since it indexes the whole buffer. Lines are read when
+                None (default: {None})
+
         Decorators:
             classmethod
 
@@ -238,19 +418,38 @@ class PythonParser:
         if position == 0:
             return None
 
+        # Let the syntax engine find the definition, when it scopes them
+        if locator is not None and locator.is_available():
+            line = locator.definition_before(position)
+            if line is not None:
+                return line
+
         indentation_level = view.indentation_level(position)
-        line = ''
+        lines = []
+        balance = 0
 
-        for current_line in read_next_line(view, position, True):
-            current_line_string = view.substr(current_line).strip()
-            line = current_line_string + ' ' + line
+        for index, token in enumerate(tokenize_lines(view, iter_lines(view, position, True))):
+            if index == MAX_DEFINITION_LINES:
+                break
 
-            # When we move up in scope, stop reading
-            current_indentation = view.indentation_level(current_line.end())
-            if current_indentation < indentation_level:
+            if token.kind != CODE:
+                continue
+
+            current_line_string = token.text.strip()
+            lines.append(current_line_string)
+            balance += bracket_balance(current_line_string)
+
+            # Reached the line the definition starts on
+            if balance >= 0 and DEFINITION_KEYWORD_RE.match(current_line_string):
                 break
 
-        return line
+            # Lines inside of open brackets are continuations of the definition,
+            # whatever their indentation. Otherwise when we move up in scope, stop reading
+            if balance >= 0 and token.indentation < indentation_level:
+                break
+
+        lines.reverse()
+        return ' '.join(lines)
 
     @classmethod
     def read_above(cls, view, position):
@@ -264,47 +463,53 @@ class PythonParser:
             position {Integer} -- Position of the docstring
 
         Returns:
-            string, string -- type of definition, stringified definition contents
+            {DefinitionHeader} type of definition, and the decorator and definition lines
         """
         indentation_level = view.indentation_level(position)
         docstring_type = None
-        definition = ''
+        lines = []
+        continuation = []
+        balance = 0
 
-        for current_line in read_next_line(view, position, True):
-            # Not an empty line
-            current_line_string = view.substr(current_line).strip()
-            if len(current_line_string) is 0:
+        for token in tokenize_lines(view, iter_lines(view, position, True)):
+            # Skip empty lines and comments
+            if token.kind != CODE:
                 continue
 
-            # Ignore comments
-            if re.match(r'^\s*(\#)', current_line_string):
+            # Definitions and decorators wrapped over several lines are joined back together
+            current_line_string = token.text.strip()
+            balance += bracket_balance(current_line_string)
+            if balance < 0:
+                if len(continuation) == MAX_DEFINITION_LINES:
+                    break
+                continuation.append(current_line_string)
                 continue
 
+            if continuation:
+                continuation.append(current_line_string)
+                continuation.reverse()
+                current_line_string = ' '.join(continuation)
+                continuation = []
+
             # When we move up in scope, stop reading
-            current_indentation = view.indentation_level(current_line.end())
-            if not current_indentation == indentation_level - 1:
+            if not token.indentation == indentation_level - 1:
                 break
 
-            # Keeping it simple, will not parse multiline decorators
-            if docstring_type is not None and not re.match(r'^\s*(\@)', current_line_string):
+            if docstring_type is not None and not current_line_string.startswith('@'):
                 break
 
             # Set to module, class, or function
             if docstring_type is None:
-                if re.match(r'^\s*(class )', current_line_string):
-                    docstring_type = 'class'
-                elif re.match(r'^\s*(def )', current_line_string):
-                    docstring_type = 'function'
-                else:
-                    docstring_type = 'module'
+                docstring_type = get_definition_type(current_line_string)
 
-            definition = current_line_string + '\n' + definition
+            lines.append(current_line_string)
 
-        return docstring_type, definition
+        lines.reverse()
+        return DefinitionHeader(docstring_type, lines)
 
     @classmethod
-    def get_definition_contents(cls, view, position):
-        """Get the relevant contents of the module/class/function.
+    def read_contents(cls, view, position, body=None):
+        """Read the relevant lines of the module/class/function.
 
         For Modules and Classes, will only provide the lines on the same
         indentation level as the docstring, so that the interpreter is only looking
@@ -316,43 +521,59 @@ class PythonParser:
             view {sublime.View} -- The sublime view in which this is executing
             position {Integer} -- Position the docstring was created on
 
+        Keyword Arguments:
+            body {Integer} -- Position the contents are read after, the end of an
+                existing docstring so that its lines are left out (default: {position})
+
         Decorators:
             classmethod
 
         Returns:
-            {String} Contents that matter
+            {list} Decorator and definition lines, then the lines of the body that matter
         """
         indentation_level = view.indentation_level(position)
-        definition = ''
 
-        docstring_type, definition = cls.read_above(view, position)
         # Read above the docstring for function/class definition and decorators
+        docstring_type, lines = cls.read_above(view, position)
+        lines = list(lines)
 
         # Read the class/function contents
-        for current_line in read_next_line(view, position):
-            # Not an empty line
-            current_line_string = view.substr(current_line).rstrip()
-            if len(current_line_string) == 0:
-                continue
-
-            # Remove comments
-            if re.match(r'^\s*(\#)', current_line_string):
+        for token in tokenize_lines(view, iter_lines(view, position if body is None else body)):
+            # Skip empty lines and comments
+            if token.kind != CODE:
                 continue
 
-            current_indentation = view.indentation_level(current_line.end())
-
             # Exit if this has de-indented below the current level
-            if current_indentation < indentation_level:
+            if token.indentation < indentation_level:
                 break
 
             # If this is a module or a class, we only care about the lines on
             # the same indentation level for contextual reasons
-            if not docstring_type == 'function' and not current_indentation == indentation_level:
+            if not docstring_type == 'function' and not token.indentation == indentation_level:
                 continue
 
-            definition += current_line_string + '\n'
+            lines.append(token.text.rstrip())
+
+        return lines
+
+    @classmethod
+    def get_definition_contents(cls, view, position, body=None):
+        """Get the relevant contents of the module/class/function, as text.
+
+        Arguments:
+            view {sublime.View} -- The sublime view in which this is executing
+            position {Integer} -- Position the docstring was created on
+
+        Keyword Arguments:
+            body {Integer} -- Position the contents are read after (default: {position})
+
+        Decorators:
+            classmethod
 
-        return definition
+        Returns:
+            {String} Lines given by `read_contents`, each ending with a newline
+        """
+        return contents_text(cls.read_contents(view, position, body))
 
     def parse(self, line, contents):
         """Central command to parse the areas above and below the docstring.
@@ -362,7 +583,8 @@ class PythonParser:
 
         Arguments:
             line {String} -- Definition Line
-            contents {String} -- Contents of the module/class/function
+            contents {String|list} -- Contents of the module/class/function, as text
+                or as the lines given by `read_contents`
 
         Returns:
             {Dictionary} Store of attributes and their values
@@ -415,7 +637,7 @@ class PythonParser:
         params['name'] = variable
         params['type'] = hints.get(variable, None) or \
             guess_type_from_value(params.get('default')) or \
-            guess_type_from_name(variable)
+            self.type_rules.guess(variable)
 
         return params
 
@@ -423,22 +645,24 @@ class PythonParser:
         """Parse module level variables.
 
         Arguments:
-            contents {String} -- Module Body
+            contents {String|list} -- Module Body, as text or as lines
 
         Returns:
             {Dictionary} -- Dictionary of attributes to create snippets from
         """
         variables = []
-        contents + '\n'
-        regex = re.compile(r'^\s*((?:(?!from |import |def |class |@).)+$)', re.MULTILINE)
-        matches = re.findall(regex, contents)
 
-        if len(matches) == 0:
-            return None
+        for line in contents_lines(contents):
+            line = line.lstrip()
+
+            # Imports, definitions and decorators aren't variables
+            if not line or VARIABLE_EXCLUDED_RE.search(line):
+                continue
 
-        for match in matches:
-            variable = self.process_variable(match)
-            variables.append(variable)
+            variables.append(self.process_variable(line))
+
+        if len(variables) == 0:
+            return None
 
         return variables
 
@@ -447,7 +671,7 @@ class PythonParser:
 
         Reads the lines in the module contents to get the names of the module level variables.
         Arguments:
-            contents {String} -- Module Body
+            contents {String|list} -- Module Body, as text or as lines
 
         Decorators:
             classmethod
@@ -475,7 +699,7 @@ class PythonParser:
         Returns:
             {Dictionary} -- Dictionary of attributes to create snippets from
         """
-        extends = re.search(r'^\s*class \w*\((.*)\):\s*$', line)
+        extends = EXTENDS_RE.match(line)
 
         if not extends:
             return None
@@ -495,8 +719,8 @@ class PythonParser:
 
         Reads the class line to determine what other classes it extends
         Arguments:
-            line     {String} -- Line containing the class definition
-            contents {String} -- Class Body
+            line     {String}      -- Line containing the class definition
+            contents {String|list} -- Class Body, as text or as lines
 
         Decorators:
             classmethod
@@ -504,7 +728,7 @@ class PythonParser:
         Returns:
             {Dictionary} Dictionary of attributes to create snippets from
         """
-        if not re.match(r'^\s*(class )', line):
+        if not CLASS_RE.match(line):
             return None
 
         parsed_class = []
@@ -532,20 +756,16 @@ class PythonParser:
         Returns:
             {list} -- list of decorators
         """
-        lines = content.split('\n')
         excluded_decorators = ['classmethod', 'staticmethod', 'property']
         decorators = []
 
-        for line in lines:
-            if line == definition:
-                break
-
-            match = re.findall(r'^\s*@([a-zA-Z0-9_\.]*)(\(.*\)|$)', line)
+        # Only the lines above the definition line can hold its decorators
+        end = content.find(definition)
+        if end == -1:
+            end = len(content)
 
-            if len(match) == 0:
-                continue
-
-            decorator = match[0][0]
+        for match in DECORATOR_RE.finditer(content, 0, end):
+            decorator = match.group(1)
             if decorator in excluded_decorators:
                 continue
 
@@ -568,13 +788,15 @@ class PythonParser:
             'keyword_arguments': [],
         }
 
-        arguments = re.search(r'^\s*def\s+\w+\((.*)\)', line)
+        arguments = ARGUMENTS_RE.match(line)
+        if arguments is None:
+            return None
 
         # Parse type hints
-        hints = dict(re.findall(r'(\w+)\s*:\s*([\w\.]+\[[^:]*\]|[\w\.]+)\s*', arguments.group(1)))
+        hints = dict(HINT_RE.findall(arguments.group(1)))
 
         # Remove type hints
-        arguments = re.sub(r':\s*([\w\.]+\[[^:]*\]|[\w\.]+)\s*', "", arguments.group(1))
+        arguments = HINT_ANNOTATION_RE.sub("", arguments.group(1))
 
         if not arguments:
             return None
@@ -586,6 +808,10 @@ class PythonParser:
             if index == 0 and argument in excluded_parameters:
                 continue
 
+            # Trailing comma
+            if not argument:
+                continue
+
             argument_type = 'keyword_arguments' if '=' in argument else 'arguments'
             params = self.process_variable(argument, hints)
             parsed_arguments[argument_type].append(params)
@@ -604,13 +830,19 @@ class PythonParser:
         Returns:
             {tuple} -- type of return and a dict for the return value type
         """
-        regex = re.compile(r'^\s*(return|yield) (\w+)', re.MULTILINE)
-        match = re.findall(regex, contents)
+        match = RETURNS_RE.findall(contents)
 
         if len(match) == 0:
             return None
 
-        hint = re.search(r'^\s*def\s+\w+\(.*\)\s*->\s*([\w\.]+\[[^:]*\]|[\w\.]+)\s*:', contents)
+        # Look for the hint after the argument list, rather than after its last
+        # closing bracket on the line, which takes quadratic time to find
+        hint = None
+        arguments = FUNCTION_ARGUMENTS_RE.match(contents)
+        if arguments:
+            end = closing_bracket(contents, arguments.end() - 1)
+            hint = RETURN_HINT_RE.match(contents, end + 1) if end > -1 else None
+
         if hint:
             hint = hint.group(1)
 
@@ -632,8 +864,7 @@ class PythonParser:
         Returns:
             {list} -- list of exception types
         """
-        regex = re.compile(r'^\s*(raise) (\w+)', re.MULTILINE)
-        match = re.findall(regex, contents)
+        match = RAISES_RE.findall(contents)
 
         if len(match) == 0:
             return None
@@ -650,8 +881,8 @@ class PythonParser:
 
         Reads the function line to parse out the args and kwargs.
         Arguments:
-            line     {String} -- Line containing the function definition
-            contents {String} -- Function body
+            line     {String}      -- Line containing the function definition
+            contents {String|list} -- Function body, as text or as lines
 
         Decorators:
             classmethod
@@ -659,9 +890,11 @@ class PythonParser:
         Returns:
             {Dictionary} Parsed valued group by type
         """
-        if not re.match(r'^\s*(def )', line):
+        if not FUNCTION_RE.match(line):
             return None
 
+        # Returns, raises and decorators are found by patterns spanning the lines
+        contents = contents_text(contents)
         parsed_function = []
 
         decorators = self.parse_decorators(line, contents)
@@ -685,9 +918,8 @@ class PythonParser:
     def is_docstring_closed(self, view, position):
         """Check if the current docstring is supposed to be closed.
 
-        Keep reading lines until we reach the end of the file, class, or function
-        We will assume that if the indentation level is ever lower than present, and no
-        closing docstring has been found yet, the component has ended and needs to be closed
+        Also stores the quotes of the docstring in `closing_string`. Use
+        `docstring_closing` instead, which leaves the parser untouched.
 
         Arguments:
             view     {sublime.View} -- Current Sublime Text View
@@ -696,44 +928,5 @@ class PythonParser:
         Returns:
             {Bool} True if the docstring is confirmed closed
         """
-        def set_closing_string(match):
-            if match is not None:
-                s = match.group(0).strip()[0:3]
-                if s in ['"""', "'''"]:
-                    self.closing_string = s
-                else:
-                    raise Exception('could not find closing string.  Match was: {}'.format(match))
-
-        indentation_level = view.indentation_level(position)
-
-        # Check the current line first, and ignore if docstring is closed on this line
-        line = view.substr(view.line(position))
-        match = re.search(r'^\s*(""".*"""|\'\'\'.*\'\'\')\s*$', line)
-
-        if match is not None:
-            set_closing_string(match)
-            return False
-
-        for current_line in read_next_line(view, position):
-            # Not an empty line
-            current_line_string = view.substr(current_line).rstrip()
-            if len(current_line_string) is 0:
-                continue
-
-            # Not on a more indented line
-            current_indentation = view.indentation_level(current_line.end())
-            if current_indentation > indentation_level:
-                continue
-
-            # Still within the same indentation level
-            if current_indentation < indentation_level:
-                break
-
-            # Line only contains whitespace and """
-            match = re.search(r'^\s*("""|\'\'\')', current_line_string)
-            if match is not None:
-                set_closing_string(match)
-                return True
-
-        set_closing_string(re.search(r'^\s*("""|\'\'\')', line))
-        return False
+        closed, self.closing_string = docstring_closing(view, position)
+        return closed
@@ -0,0 +1,254 @@
+"""Whole file scanner for module, class and function definitions.
+
+Where `PythonParser` works outwards from a single docstring in a view, the scanner
+walks a whole file once to list every definition in it, for tools that work on
+many definitions at a time.
+"""
+import re
+from collections import namedtuple
+
+from .parser import PythonParser
+
+DEFINITION_RE = re.compile(r'(?:async\s+)?(def|class)\s+(\w+)')
+DOCSTRING_RE = re.compile(r'[rRuUbB]{0,2}("""|\'\'\'|"|\')')
+
+Definition = namedtuple('Definition', [
+    'kind',       # 'module', 'class' or 'function'
+    'name',       # name of the class or function, '' for the module
+    'indent',     # indentation width of the definition line
+    'start',      # first row, including decorators
+    'row',        # row of the `def`/`class` keyword
+    'body',       # first row after the signature
+    'end',        # last non blank row of the body
+    'docstring',  # (first row, last row) of the docstring, or None
+])
+
+Row = namedtuple('Row', [
+    'text',     # text of the row, without the line ending
+    'logical',  # whether the row starts a logical line
+    'indent',   # indentation width, None if blank or a comment
+])
+
+
+def _scan_row(line, quote, depth):
+    """Track open strings and brackets through a row.
+
+    Arguments:
+        line {str} -- Row to scan
+        quote {str} -- Quote of the string open at the start of the row, or None
+        depth {int} -- Bracket depth at the start of the row
+
+    Returns:
+        {tuple} quote of the string still open, and bracket depth, at the end of the
+            row, and where its comment starts, None if it has none
+    """
+    index = 0
+    length = len(line)
+
+    while index < length:
+        if quote is not None:
+            close = line.find(quote, index)
+            escape = line.find('\\', index)
+            if escape != -1 and (close == -1 or escape < close):
+                index = escape + 2
+                continue
+            if close == -1:
+                # Only triple quoted strings run over to the next row
+                return (quote if len(quote) == 3 else None), depth, None
+            index = close + len(quote)
+            quote = None
+            continue
+
+        char = line[index]
+        if char == '#':
+            return None, depth, index
+        if char in '"\'':
+            quote = char * 3 if line.startswith(char * 3, index) else char
+            index += len(quote)
+            continue
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth = max(depth - 1, 0)
+        index += 1
+
+    return (quote if quote is not None and len(quote) == 3 else None), depth, None
+
+
+def strip_comment(line):
+    """Return a row without its trailing comment, leaving `#` in strings alone.
+
+    The row must start outside of any string.
+
+    >>> strip_comment("def f(a='#'):  # comment")
+    "def f(a='#'):  "
+    """
+    comment = _scan_row(line, None, 0)[2]
+    return line if comment is None else line[:comment]
+
+
+def _indent(line, tab_size=4):
+    """Return the indentation width of a row, or None if it holds no code."""
+    stripped = line.lstrip()
+    if not stripped or stripped[0] == '#':
+        return None
+
+    prefix = line[:len(line) - len(stripped)]
+    return len(prefix.expandtabs(tab_size))
+
+
+def classify_rows(lines):
+    """Classify each row of a file.
+
+    Arguments:
+        lines {list} -- Rows of the file
+
+    Returns:
+        {list} -- One `Row` per row
+    """
+    rows = []
+    quote = None
+    depth = 0
+
+    for line in lines:
+        logical = quote is None and depth == 0
+        rows.append(Row(line, logical, _indent(line) if logical else None))
+        quote, depth, _ = _scan_row(line, quote, depth)
+
+    return rows
+
+
+def _logical_end(rows, row):
+    """Return the last row of the logical line starting at a row."""
+    row += 1
+    while row < len(rows) and not rows[row].logical:
+        row += 1
+
+    return row - 1
+
+
+def _docstring(rows, row, end):
+    """Return the rows of the docstring starting at a row, if there is one."""
+    while row <= end and rows[row].indent is None:
+        row += 1
+
+    if row > end or not DOCSTRING_RE.match(rows[row].text.lstrip()):
+        return None
+
+    return row, _logical_end(rows, row)
+
+
+def _close(rows, open_definitions, definitions, indent, last_row):
+    """Close every open definition the row at `indent` is not part of."""
+    while open_definitions and open_definitions[-1][2] >= indent:
+        kind, name, def_indent, start, row, body = open_definitions.pop()
+        end = max(last_row, body - 1)
+        definitions.append(Definition(kind, name, def_indent, start, row, body, end, _docstring(rows, body, end)))
+
+
+def scan_definitions(rows):
+    """List the module, and every class and function definition, of a file.
+
+    Arguments:
+        rows {list} -- Rows classified by `classify_rows`
+
+    Returns:
+        {list} -- `Definition` records, ordered by their first row
+    """
+    definitions = []
+    open_definitions = []
+    decorator_row = None
+    last_row = -1
+
+    for index, row in enumerate(rows):
+        if row.indent is None:
+            continue
+
+        _close(rows, open_definitions, definitions, row.indent, last_row)
+        last_row = _logical_end(rows, index)
+        stripped = row.text.lstrip()
+
+        if stripped.startswith('@'):
+            decorator_row = index if decorator_row is None else decorator_row
+            continue
+
+        match = DEFINITION_RE.match(stripped)
+        if match is not None:
+            kind = 'class' if match.group(1) == 'class' else 'function'
+            start = index if decorator_row is None else decorator_row
+            open_definitions.append((kind, match.group(2), row.indent, start, index, last_row + 1))
+
+        decorator_row = None
+
+    _close(rows, open_definitions, definitions, -1, last_row)
+    module_end = max(last_row, 0)
+    definitions.append(Definition('module', '', 0, 0, None, 0, module_end, _docstring(rows, 0, module_end)))
+
+    # The module sorts ahead of a definition on its first row
+    return sorted(definitions, key=lambda definition: (definition.start, definition.kind != 'module'))
+
+
+def definition_source(rows, definition):
+    """Build the definition line and contents `PythonParser.parse` expects.
+
+    Arguments:
+        rows {list} -- Rows classified by `classify_rows`
+        definition {Definition} -- Definition to gather the source of
+
+    Returns:
+        {tuple} definition line (None for the module) and contents
+    """
+    if definition.kind == 'module':
+        line = None
+        contents = []
+    else:
+        line = ' '.join(rows[row].text.strip() for row in range(definition.row, definition.body))
+        # Decorators spanning several rows are joined onto a single line
+        contents = [
+            ' '.join(rows[row].text.strip() for row in range(start, _logical_end(rows, start) + 1))
+            for start in range(definition.start, definition.row) if rows[start].logical
+        ]
+        contents.append(line)
+
+    docstring = definition.docstring or (None, None)
+    body_indent = None
+
+    for index in range(definition.body, definition.end + 1):
+        row = rows[index]
+        if docstring[0] is not None and docstring[0] <= index <= docstring[1]:
+            continue
+
+        if row.logical and row.indent is not None:
+            body_indent = row.indent if body_indent is None else body_indent
+
+        if definition.kind == 'function':
+            if row.indent is not None or not row.logical:
+                contents.append(row.text.rstrip())
+        elif row.indent is not None and row.indent == body_indent:
+            contents.append(row.text.rstrip())
+
+    return line, '\n'.join(contents) + '\n'
+
+
+def parse_definitions(text, parser=None):
+    """Scan a file and parse each of its definitions.
+
+    Arguments:
+        text {str} -- Contents of the file
+
+    Keyword Arguments:
+        parser {PythonParser} -- Parser to use, built from the settings holding the
+            `type_rules` (default: {None}, a parser without settings)
+
+    Returns:
+        {list} -- (`Definition`, parser output) pairs
+    """
+    parser = parser or PythonParser()
+    rows = classify_rows(text.split('\n'))
+    parsed = []
+
+    for definition in scan_definitions(rows):
+        line, contents = definition_source(rows, definition)
+        parsed.append((definition, parser.parse(line, contents)))
+
+    return parsed
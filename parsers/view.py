@@ -0,0 +1,172 @@
+"""String backed stand-in for a Sublime Text view.
+
+Implements the small slice of the `sublime.View` API that the parser relies on, so
+that parsing can run outside of the editor, e.g. in the headless tools.
+"""
+from bisect import bisect_right
+from itertools import count
+
+_view_ids = count(1)
+
+
+class Region:
+    """Minimal equivalent of `sublime.Region`.
+
+    Variables:
+        a {int} -- First point of the region
+        b {int} -- Second point of the region
+    """
+
+    __slots__ = ('a', 'b')
+
+    def __init__(self, a, b=None):
+        """---."""
+        self.a = a
+        self.b = a if b is None else b
+
+    def __repr__(self):
+        """---."""
+        return 'Region({}, {})'.format(self.a, self.b)
+
+    def __eq__(self, other):
+        """---."""
+        return isinstance(other, Region) and (self.a, self.b) == (other.a, other.b)
+
+    def __hash__(self):
+        """---."""
+        return hash((self.a, self.b))
+
+    def begin(self):
+        """Return the smaller of the two points."""
+        return min(self.a, self.b)
+
+    def end(self):
+        """Return the larger of the two points."""
+        return max(self.a, self.b)
+
+    def size(self):
+        """Return the number of characters spanned by the region."""
+        return abs(self.b - self.a)
+
+    def empty(self):
+        """Return True if the region spans no characters."""
+        return self.a == self.b
+
+
+class StringView:
+    """Read only view over a string.
+
+    Line starts are indexed once on creation, so that `line` and
+    `indentation_level` are a binary search rather than a scan.
+
+    Variables:
+        text {str} -- Contents of the view
+    """
+
+    def __init__(self, text, position=0, settings=None, scope='source.python'):
+        """Index the text and place a single cursor at `position`.
+
+        Arguments:
+            text {str} -- Contents of the view
+
+        Keyword Arguments:
+            position {int} -- Cursor position (default: {0})
+            settings {dict} -- View settings (default: {None})
+            scope {str} -- Base scope reported by `scope_name` (default: {'source.python'})
+        """
+        self.text = text
+        self._settings = settings or {}
+        self._scope = scope + ' '
+        self._selection = [Region(position)]
+        self._id = next(_view_ids)
+        self._line_starts = [0]
+
+        index = text.find('\n')
+        while index != -1:
+            self._line_starts.append(index + 1)
+            index = text.find('\n', index + 1)
+
+    def id(self):
+        """Return the unique id of the view."""
+        return self._id
+
+    def buffer_id(self):
+        """Return the id of the buffer, which no other view shares."""
+        return self._id
+
+    def change_count(self):
+        """Return the number of edits made to the view, which is read only."""
+        return 0
+
+    def size(self):
+        """Return the number of characters in the view."""
+        return len(self.text)
+
+    def settings(self):
+        """Return the view settings."""
+        return self._settings
+
+    def window(self):
+        """Return the window of the view, None as it isn't shown in any."""
+        return None
+
+    def sel(self):
+        """Return the list of selected regions."""
+        return self._selection
+
+    def scope_name(self, point):
+        """Return the scope at the given point."""
+        return self._scope
+
+    def find_by_selector(self, selector):
+        """Return the regions matching a scope selector.
+
+        There is no syntax engine behind a string, so nothing ever matches.
+        """
+        return []
+
+    def substr(self, region):
+        """Return the text of a region, or the character at a point."""
+        if isinstance(region, Region):
+            return self.text[region.begin():region.end()]
+
+        return self.text[region:region + 1]
+
+    def rowcol(self, point):
+        """Return the zero based (row, column) of a point."""
+        row = bisect_right(self._line_starts, point) - 1
+        return row, point - self._line_starts[row]
+
+    def text_point(self, row, col):
+        """Return the point of a zero based (row, column)."""
+        row = max(0, min(row, len(self._line_starts) - 1))
+        return self._line_starts[row] + col
+
+    def line(self, point):
+        """Return the region of the line(s) containing a point or region."""
+        if isinstance(point, Region):
+            return Region(self.line(point.begin()).begin(), self.line(point.end()).end())
+
+        row = bisect_right(self._line_starts, point) - 1
+        begin = self._line_starts[row]
+
+        if row + 1 < len(self._line_starts):
+            return Region(begin, self._line_starts[row + 1] - 1)
+
+        return Region(begin, len(self.text))
+
+    def indentation_level(self, point):
+        """Return the indentation level of the line containing a point."""
+        tab_size = self._settings.get('tab_size', 4)
+        line = self.line(point)
+        columns = 0
+
+        for char in self.text[line.begin():line.end()]:
+            if char == ' ':
+                columns += 1
+            elif char == '\t':
+                columns += tab_size - columns % tab_size
+            else:
+                break
+
+        return columns // tab_size
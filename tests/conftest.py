@@ -36,3 +36,9 @@ def root_commands():
 def root_DocblockrPython():
     from .. import DocblockrPython
     return DocblockrPython
+
+
+@pytest.fixture()
+def root_listeners():
+    from .. import listeners
+    return listeners
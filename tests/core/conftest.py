@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.fixture()
+def core():
+    import core
+    return core
+
+
+@pytest.fixture()
+def core_settings():
+    from core import settings
+    return settings
+
+
+@pytest.fixture()
+def core_warmup():
+    from core import warmup
+    return warmup
+
+
+@pytest.fixture()
+def core_profiling():
+    from core import profiling
+    return profiling
+
+
+@pytest.fixture()
+def core_lint():
+    from core import lint
+    return lint
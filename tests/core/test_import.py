@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+
+# Times faster importing the lazy core must be, than importing every submodule it
+# exports, of the fastest of a few runs so that a busy runner doesn't fail
+LAZY_SPEEDUP = 4
+RUNS = 5
+
+SCRIPT = '''
+import importlib, json, sys, time
+start = time.perf_counter()
+import core
+if sys.argv[1] == 'eager':
+    for module in sorted(set(core._EXPORTS.values())):
+        importlib.import_module(module)
+elapsed = time.perf_counter() - start
+lazy = 'parsers.parser' not in sys.modules
+core.populate_registry()
+context = core.analyze('def foo(a):\\n    """\\n', 19)
+core.create_snippet(core.get_formatter_instance('docblock'), context.parsed, '', context.closing_string)
+print(json.dumps({
+    'elapsed': elapsed,
+    'lazy': lazy,
+    'editor': sorted(name for name in ('sublime', 'sublime_plugin') if name in sys.modules),
+}))
+'''
+
+
+def import_core(mode):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT, mode], cwd=root)
+    return json.loads(output.decode('utf-8'))
+
+
+def test_core_imports_without_editor():
+    lazy = [import_core('lazy') for _ in range(RUNS)]
+    eager = [import_core('eager') for _ in range(RUNS)]
+
+    assert all(result['editor'] == [] for result in lazy + eager)
+    assert all(result['lazy'] is True for result in lazy)
+    assert min(result['elapsed'] for result in lazy) * LAZY_SPEEDUP < min(result['elapsed'] for result in eager)
+
+
+def test_facade_does_not_rely_on_module_getattr(core):
+    # Module level `__getattr__` is ignored before python 3.7
+    assert '__getattr__' not in vars(core)
+    assert core.analyze is core.analyze
+    assert 'analyze' in dir(core)
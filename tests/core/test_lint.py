@@ -0,0 +1,55 @@
+SOURCE = '''"""Module."""
+
+
+def first(a, b):
+    """Add.
+
+    Arguments:
+        a {} -- First
+    """
+    return a + b
+
+
+def second(c):
+    return c
+'''
+
+
+def test_exists(core_lint):
+    assert core_lint
+
+
+def test_check_reuses_unchanged_definitions(core, core_lint):
+    core.populate_registry()
+    formatter = core.get_formatter_instance('docblock')
+    lint = core_lint.IncrementalLint()
+
+    assert lint.check(SOURCE, formatter, change_count=7) == 3
+    assert lint.change_count == 7
+    assert [(finding.row, finding.check) for finding in lint.findings] == [
+        (3, 'signature-drift'),
+        (12, 'missing-docstring'),
+    ]
+
+    # Moving definitions doesn't check them again
+    moved = SOURCE.replace('"""Module."""\n', '"""Module."""\nimport os\n')
+    assert lint.check(moved, formatter) == 1
+    assert [finding.row for finding in lint.findings] == [4, 13]
+
+    fixed = moved.replace('def second(c):\n', 'def second(c):\n    """Return c."""\n')
+    assert lint.check(fixed, formatter) == 2
+    assert [finding.row for finding in lint.findings] == [4]
+
+
+def test_check_limit(core, core_lint):
+    core.populate_registry()
+    formatter = core.get_formatter_instance('docblock')
+    lint = core_lint.IncrementalLint()
+
+    assert lint.check(SOURCE, formatter, limit=1) == 1
+    assert lint.pending == 2
+
+    assert lint.check(SOURCE, formatter, limit=1) == 1
+    assert lint.check(SOURCE, formatter, limit=1) == 1
+    assert lint.pending == 0
+    assert len(lint.findings) == 2
@@ -0,0 +1,32 @@
+import cProfile
+import os
+
+
+def test_exists(core_profiling):
+    assert core_profiling
+
+
+def test_replay(core_profiling):
+    text = 'def foo(user_id):\n    """Summary.\n'
+    invocation = core_profiling.Invocation(text, text.index('"""') + 3, {'type_rules': [['*_id', 'int']]},
+                                           'docblock', {})
+
+    snippet = core_profiling.replay(invocation)
+
+    assert snippet.startswith('Summary.')
+    assert 'user_id {int}' in snippet
+
+    closed = 'def foo():\n    """\n    Body.\n    """\n'
+    assert core_profiling.replay(invocation._replace(text=closed, offset=closed.index('"""') + 3)) == '\n'
+
+
+def test_profile_report(core_profiling, tmpdir):
+    profile = cProfile.Profile()
+    profile.runcall(core_profiling.replay, core_profiling.Invocation('def foo(a):\n    """\n', 19, {}, 'google', {}))
+
+    assert 'replay' in core_profiling.summarize(profile)
+
+    path = core_profiling.write_stats(profile, str(tmpdir.join('profiles')))
+    assert os.path.dirname(path) == str(tmpdir.join('profiles'))
+    assert path.endswith('.pstats')
+    assert os.path.getsize(path) > 0
@@ -0,0 +1,24 @@
+def test_exists(core_settings):
+    assert core_settings
+
+
+def test_layers(core_settings):
+    settings = core_settings.Settings({'formatter': 'docblock', 'a': 1}, None, {'formatter': 'google'})
+
+    assert settings.get('formatter') == 'google'
+    assert settings['a'] == 1
+    assert 'b' not in settings
+    assert settings.get('b', 2) == 2
+    assert settings.with_layer({'a': 3})['a'] == 3
+
+
+def test_default_settings(core_settings):
+    assert core_settings.default_settings().get('formatter') == 'docblock'
+
+
+def test_snapshot(core_settings):
+    settings = core_settings.Settings(core_settings.DEFAULTS, {'formatter': 'google', 'unrelated': 1})
+
+    assert settings.snapshot()['formatter'] == 'google'
+    assert 'unrelated' not in settings.snapshot()
+    assert settings.snapshot(['unrelated']) == {'unrelated': 1}
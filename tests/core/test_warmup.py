@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+# Times faster the first docstring of a warmed up interpreter must be, than of a cold one
+WARM_SPEEDUP = 4
+
+SCRIPT = '''
+import json, sys, time
+import core
+warm_up = core.warm_up() if sys.argv[1] == 'warm' else core.populate_registry()
+start = time.perf_counter()
+context = core.analyze('def bar(x, is_y=False, *args):\\n    """\\n    return {}\\n', 34)
+snippet = core.create_snippet(core.get_formatter_instance('docblock'), context.parsed, '', context.closing_string)
+print(json.dumps({'warm_up': warm_up, 'first': time.perf_counter() - start, 'snippet': snippet}))
+'''
+
+
+def test_exists(core_warmup):
+    assert core_warmup
+
+
+def test_warm_up(core_warmup):
+    assert core_warmup.warm_up({'formatter': 'google', 'type_rules': [['*_id', 'int']]}) > 0
+
+
+def first_invocation(mode):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT, mode], cwd=root)
+    return json.loads(output.decode('utf-8'))
+
+
+def test_first_invocation_after_warm_up():
+    warm = first_invocation('warm')
+    cold = first_invocation('cold')
+
+    assert 'is_y {bool}' in warm['snippet']
+    assert 'is_y {bool}' in cold['snippet']
+    assert warm['first'] * WARM_SPEEDUP < cold['first']
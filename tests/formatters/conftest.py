@@ -47,3 +47,15 @@ def formatter_sphinx():
 def formatter_utils():
     from formatters import utils
     return utils
+
+
+@pytest.fixture()
+def formatter_regenerate():
+    from formatters import regenerate
+    return regenerate
+
+
+@pytest.fixture()
+def formatter_lint():
+    from formatters import lint
+    return lint
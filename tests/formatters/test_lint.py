@@ -0,0 +1,77 @@
+SOURCE = (
+    'def documented(a: int, b, flag=False):\n'
+    '    """Summary.\n'
+    '\n'
+    '    Arguments:\n'
+    '        a {str} -- Retyped\n'
+    '        b   {list} -- Aligned by hand\n'
+    '        gone {int} -- Removed\n'
+    '\n'
+    '    Keyword Arguments:\n'
+    '        flag {bool} -- Free form default (default False)\n'
+    '    """\n'
+    '\n'
+    '\n'
+    'def missing(c):\n'
+    '    return c\n'
+    '\n'
+    '\n'
+    'def prose(d):\n'
+    '    """Summary only, parameters aren\'t documented."""\n'
+    '\n'
+    '\n'
+    'def partial(e, f):\n'
+    '    """Summary.\n'
+    '\n'
+    '    Arguments:\n'
+    '        e {[type]} -- [description]\n'
+    '    """\n'
+)
+
+
+def check(formatter_lint, formatter_registry, formatter_utils, source):
+    from parsers.parser import PythonParser
+    from parsers.scanner import classify_rows, definition_source, scan_definitions
+
+    formatter_registry.populate_registry()
+    formatter = formatter_utils.get_formatter_instance('docblock')
+    rows = classify_rows(source.split('\n'))
+    findings = []
+
+    for definition in scan_definitions(rows):
+        parsed = PythonParser().parse(*definition_source(rows, definition))
+        findings.extend(formatter_lint.check_definition(formatter, rows, definition, parsed))
+
+    return findings
+
+
+def test_exists(formatter_lint):
+    assert formatter_lint
+
+
+def test_check_definition(formatter_lint, formatter_registry, formatter_utils):
+    findings = check(formatter_lint, formatter_registry, formatter_utils, SOURCE)
+
+    assert [(row, check, name) for row, check, name, _ in findings] == [
+        (0, 'missing-docstring', ''),
+        (4, 'signature-drift', 'documented'),
+        (6, 'signature-drift', 'documented'),
+        (13, 'missing-docstring', 'missing'),
+        (21, 'signature-drift', 'partial'),
+    ]
+    assert '`f`' in findings[4].message
+    assert '`a`' in findings[1].message
+    assert '`gone`' in findings[2].message
+
+
+def test_empty_module(formatter_lint, formatter_registry, formatter_utils):
+    assert check(formatter_lint, formatter_registry, formatter_utils, '\n') == []
+
+
+def test_docstring_lines(formatter_lint):
+    from parsers.scanner import classify_rows, scan_definitions
+
+    rows = classify_rows('"""Summary.\n\nBody\n"""\n'.split('\n'))
+    module = scan_definitions(rows)[0]
+
+    assert formatter_lint.docstring_lines(rows, module) == ['', 'Body']
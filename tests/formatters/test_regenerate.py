@@ -0,0 +1,69 @@
+def test_exists(formatter_regenerate):
+    assert formatter_regenerate
+
+
+def test_diff_keeps_user_text(formatter_regenerate, formatter_registry, formatter_utils):
+    from parsers.parser import PythonParser
+
+    formatter_registry.populate_registry()
+    formatter = formatter_utils.get_formatter_instance('sphinx')
+    output = PythonParser().parse('def foo(a: int, b):', '    raise ValueError\n')
+    templates = formatter_regenerate.template(formatter, output)
+    old_lines = [
+        ':param a: Described by hand',
+        ':type a: str',
+        ':param gone: Removed',
+        ':type gone: int',
+        ':raises: ValueError',
+    ]
+
+    assert formatter_regenerate.diff(old_lines, templates) == [
+        ('replace', 1, 9, 12, 'int'),
+        ('erase', 2, None, None, None),
+        ('erase', 3, None, None, None),
+        ('insert', 4, None, None, [':param b: [description]', ':type b: [type]']),
+    ]
+
+
+def test_diff_fields_stay_in_their_section(formatter_regenerate, formatter_registry, formatter_utils):
+    from parsers.parser import PythonParser
+
+    formatter_registry.populate_registry()
+    formatter = formatter_utils.get_formatter_instance('google')
+    output = PythonParser().parse('def foo(a, c):', '    return a\n')
+    templates = formatter_regenerate.template(formatter, output)
+    old_lines = [
+        '',
+        'Args:',
+        '\ta: About a',
+        '\tb: About b (default: {2})',
+    ]
+
+    assert formatter_regenerate.diff(old_lines, templates) == [
+        ('erase', 3, None, None, None),
+        ('insert', 4, None, None, ['\tc: [description]', '', 'Returns:', '\t[description]', '\t[type]']),
+    ]
+
+
+def test_diff_keeps_entries_in_their_section(formatter_regenerate, formatter_registry, formatter_utils):
+    from parsers.parser import PythonParser
+
+    formatter_registry.populate_registry()
+    formatter = formatter_utils.get_formatter_instance('docblock')
+    output = PythonParser().parse('def foo(x, a, b=3, c=None):', '    return a\n')
+    templates = formatter_regenerate.template(formatter, output)
+    old_lines = [
+        '',
+        'Arguments:',
+        '\ta {[type]} -- About a',
+        '',
+        'Keyword Arguments:',
+        '\tb {number} -- About b (default: {2})',
+    ]
+
+    assert formatter_regenerate.diff(old_lines, templates) == [
+        ('insert', 2, None, None, ['\tx {[type]} -- [description]']),
+        ('replace', 5, 34, 35, '3'),
+        ('insert', 6, None, None, ['\tc {[type]} -- [description] (default: {None})', '', 'Returns:',
+                                   '\t[type] -- [description]']),
+    ]
@@ -1,2 +1,21 @@
 def test_exists(formatter_registry):
     assert formatter_registry
+
+
+def test_register_builds_sections(formatter_registry):
+    class Custom:
+        name = 'test-custom'
+
+        def __init__(self, settings=None):
+            self.settings = settings
+
+        def raises(self, attributes):
+            return ', '.join(attributes)
+
+    formatter_registry.register(Custom)
+
+    assert formatter_registry.REGISTRY['test-custom'] is Custom
+    assert list(Custom.sections) == ['raises']
+    assert Custom.sections['raises'](Custom(), ['ValueError']) == 'ValueError'
+
+    del formatter_registry.REGISTRY['test-custom']
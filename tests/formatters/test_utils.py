@@ -1,2 +1,30 @@
 def test_exists(formatter_utils):
     assert formatter_utils
+
+
+def test_get_formatter_instance(formatter_utils, formatter_google):
+    instance = formatter_utils.get_formatter_instance('google', {'a': 1})
+
+    assert isinstance(instance, formatter_google.GoogleFormatter)
+    assert formatter_utils.get_formatter_instance('google', {'a': 1}) is instance
+    assert formatter_utils.get_formatter_instance('google', {'a': 2}) is not instance
+
+
+def test_create_snippet(formatter_utils, formatter_google):
+    formatter = formatter_utils.get_formatter_instance('google')
+    snippet = formatter_utils.create_snippet(formatter, [('raises', ['ValueError']), ('extends', [])], 'Foo.', '"""')
+
+    assert snippet.startswith('Foo.\n\n')
+    assert '\nRaises:\n\tValueError: ' in snippet
+    assert snippet.endswith('"""')
+
+
+def test_plain_text(formatter_utils):
+    snippet = 'Foo \\$1.\n\n${1:[description]}\n\nArguments:\n\tbar ${2:[type]}\n"""'
+
+    assert formatter_utils.count_fields(snippet) == 2
+    assert formatter_utils.plain_text(snippet, '    ', '    ') == (
+        'Foo $1.\n\n    [description]\n\n    Arguments:\n        bar [type]\n    """',
+        (13, 26),
+    )
+    assert formatter_utils.plain_text('Foo.\n"""') == ('Foo.\n"""', None)
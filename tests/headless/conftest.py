@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.fixture()
+def headless_daemon():
+    from ...headless import daemon
+    return daemon
+
+
+@pytest.fixture()
+def headless_batch():
+    from ...headless import batch
+    return batch
+
+
+@pytest.fixture()
+def headless_cache():
+    from ...headless import cache
+    return cache
+
+
+@pytest.fixture()
+def headless_corpus():
+    from ...headless import corpus
+    return corpus
+
+
+@pytest.fixture()
+def headless_diffcheck():
+    from ...headless import diffcheck
+    return diffcheck
+
+
+@pytest.fixture()
+def headless_replay():
+    from ...headless import replay
+    return replay
+
+
+@pytest.fixture()
+def headless_export():
+    from ...headless import export
+    return export
+
+
+@pytest.fixture()
+def headless_aio():
+    from ...headless import aio
+    return aio
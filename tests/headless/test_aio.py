@@ -0,0 +1,37 @@
+import pytest
+
+
+def test_exists(headless_aio):
+    assert headless_aio
+
+
+def test_scan_async_in_order(headless_aio, headless_batch, tmpdir):
+    for index in range(30):
+        tmpdir.join('module_{:02d}.py'.format(index)).write('def foo{}(a):\n    pass\n'.format(index) * (index % 4 + 1))
+
+    results = []
+    progress = []
+    files = headless_aio.scan_async([str(tmpdir)], lambda *result: results.append(result), readers=4,
+                                    queue_size=1, progress=lambda written, found: progress.append((written, found)))
+
+    expected = list(headless_batch.scan_paths([str(tmpdir)], jobs=1))
+    assert files == 30
+    assert [(path, len(parsed)) for path, parsed, _ in results] == [(path, len(parsed)) for path, parsed, _ in expected]
+    assert [written for written, _ in progress] == list(range(1, 31))
+    assert all(written <= found for written, found in progress)
+
+
+def test_scan_async_cache(headless_aio, headless_cache, tmpdir):
+    tmpdir.join('a.py').write('def foo():\n    pass\n')
+    cache = headless_cache.ParseCache(str(tmpdir.join('cache', 'parse.db')))
+    hits = []
+
+    headless_aio.scan_async([str(tmpdir.join('a.py'))], lambda path, parsed, hit: hits.append(hit), cache=cache)
+    headless_aio.scan_async([str(tmpdir.join('a.py'))], lambda path, parsed, hit: hits.append(hit), cache=cache)
+
+    assert hits == [False, True]
+
+
+def test_scan_async_missing_file(headless_aio, tmpdir):
+    with pytest.raises(OSError):
+        headless_aio.scan_async([str(tmpdir.join('missing.py'))], lambda *result: None)
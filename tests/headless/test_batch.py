@@ -0,0 +1,22 @@
+def test_exists(headless_batch):
+    assert headless_batch
+
+
+def test_scan_paths(headless_batch, tmpdir):
+    tmpdir.join('a.py').write('def foo():\n    pass\n')
+    tmpdir.join('b.txt').write('def foo():\n    pass\n')
+
+    results = list(headless_batch.scan_paths([str(tmpdir)], jobs=1))
+
+    assert [len(parsed) for _, parsed, _ in results] == [2]
+
+
+def test_scan_paths_with_type_rules(headless_batch, tmpdir):
+    from ...parsers.parser import PythonParser
+
+    tmpdir.join('a.py').write('def foo(a_widget):\n    pass\n')
+    parser = PythonParser({'type_rules': [['*_widget', 'Widget']]})
+
+    for jobs in (1, 2):
+        [(_, parsed, _)] = headless_batch.scan_paths([str(tmpdir)], jobs=jobs, parser=parser)
+        assert "'type': 'Widget'" in repr(parsed)
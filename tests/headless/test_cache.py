@@ -0,0 +1,83 @@
+def test_exists(headless_cache):
+    assert headless_cache
+
+
+def test_parse_is_cached(headless_cache, tmpdir):
+    cache = headless_cache.ParseCache(str(tmpdir.join('cache.db')))
+    content = (
+        b'import os\n\n\n'
+        b'@decorator\n'
+        b'class Foo(Base):\n'
+        b'    size = 1\n\n'
+        b'    def foo(self, a: int, *args, b=None, **kwargs):\n'
+        b'        """Foo."""\n'
+        b'        if a:\n'
+        b'            raise ValueError(a)\n'
+        b'        yield a\n'
+    )
+
+    parsed, hit = cache.parse(content)
+    cached, cached_hit = cache.parse(content)
+
+    assert (hit, cached_hit) == (False, True)
+    assert cached == parsed
+
+
+def test_eviction(headless_cache, tmpdir):
+    cache = headless_cache.ParseCache(str(tmpdir.join('cache.db')), max_bytes=400)
+
+    for index in range(20):
+        cache.parse('x{} = {}\n'.format(index, index).encode())
+
+    assert 0 < cache.size() <= 400
+    assert cache.parse(b'x19 = 19\n')[1] is True
+    assert cache.parse(b'x0 = 0\n')[1] is False
+
+
+def test_connection_per_thread(headless_cache, tmpdir):
+    import pickle
+    import threading
+
+    cache = headless_cache.ParseCache(str(tmpdir.join('cache.db')))
+    connection = cache.connection
+    hits = []
+
+    def parse():
+        hits.append(cache.parse(b'x = 1\n')[1])
+        hits.append(cache.connection is not connection)
+
+    for _ in range(2):
+        thread = threading.Thread(target=parse)
+        thread.start()
+        thread.join()
+
+    assert hits == [False, True, True, True]
+    assert cache.connection is connection
+    assert pickle.loads(pickle.dumps(cache)).parse(b'x = 1\n')[1] is True
+
+
+def test_parse_keyed_on_type_rules(headless_cache, tmpdir):
+    from ...parsers.parser import PythonParser
+
+    cache = headless_cache.ParseCache(str(tmpdir.join('cache.db')))
+    content = b'def foo(a_widget):\n    pass\n'
+
+    parsed, hit = cache.parse(content)
+    typed, typed_hit = cache.parse(content, PythonParser({'type_rules': [['*_widget', 'Widget']]}))
+
+    assert (hit, typed_hit) == (False, False)
+    assert "'type': 'Widget'" not in repr(parsed)
+    assert "'type': 'Widget'" in repr(typed)
+    assert cache.parse(content, PythonParser({'type_rules': [['*_widget', 'Widget']]})) == (typed, True)
+
+
+def test_hit_equals_miss(headless_cache, tmpdir):
+    cache = headless_cache.ParseCache(str(tmpdir.join('cache.db')))
+    content = b'async def foo(a):\n    pass\n'
+
+    parsed, hit = cache.parse(content)
+    cached, cached_hit = cache.parse(content)
+
+    assert (hit, cached_hit) == (False, True)
+    assert cached == parsed
+    assert [type(output) for _, output in cached] == [type(output) for _, output in parsed]
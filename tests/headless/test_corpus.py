@@ -0,0 +1,48 @@
+def test_exists(headless_corpus):
+    assert headless_corpus
+
+
+def test_run_corpus(headless_corpus, tmpdir):
+    tmpdir.join('a.py').write(
+        'class Foo(object):\n'
+        '    @property\n'
+        '    def bar(self) -> int:\n'
+        '        def baz(a, *args, b: str = "x", **kwargs):\n'
+        '            raise ValueError(a)\n'
+        '        return 1\n'
+    )
+
+    summary = headless_corpus.run_corpus([str(tmpdir)]).summary()
+
+    assert summary['files'] == 1
+    assert summary['definitions'] == 4
+    assert summary['crashes'] == {}
+    assert summary['p99_ms'] >= summary['p50_ms'] > 0
+    assert summary['analyze_p99_ms'] >= summary['analyze_p50_ms'] > 0
+    assert headless_corpus.check(summary, max_crashes=0) == []
+    assert len(headless_corpus.check(summary, min_rate=float('inf'))) == 1
+
+
+def test_opened_docstring(headless_corpus):
+    from ...parsers.scanner import classify_rows, scan_definitions
+
+    rows = classify_rows([
+        'def foo(a):',
+        '    \'\'\'Old.',
+        '',
+        '    \'\'\'',
+        '    return a',
+        'def bar(): pass',
+    ])
+    foo, bar = [definition for definition in scan_definitions(rows) if definition.kind != 'module']
+
+    text, offset = headless_corpus.opened_docstring(rows, foo)
+
+    assert text == 'def foo(a):\n    \"\"\"\n    return a\ndef bar(): pass'
+    assert text[:offset].endswith('    \"\"\"')
+    assert headless_corpus.opened_docstring(rows, bar) is None
+
+
+def test_percentile(headless_corpus):
+    assert headless_corpus.percentile([], 0.99) == 0
+    assert headless_corpus.percentile(list(range(1, 101)), 0.99) == 99
@@ -0,0 +1,49 @@
+import io
+import json
+
+
+def test_exists(headless_daemon):
+    assert headless_daemon
+
+
+def test_generate_docstring(headless_daemon):
+    service = headless_daemon.DocstringService('google')
+    text = 'def foo(a, b=1):\n    """\n    return a\n'
+
+    result = service.generate_docstring(text, text.index('"""') + 3)
+
+    assert result['closed'] is False
+    assert '\ta: ' in result['snippet']
+    assert result['snippet'].endswith('"""')
+
+
+def test_serve_pipelined_requests(headless_daemon):
+    requests = [
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'listFormatters'},
+        [{'jsonrpc': '2.0', 'id': 2, 'method': 'missing'}],
+        {'jsonrpc': '2.0', 'id': 3, 'method': 'shutdown'},
+        {'jsonrpc': '2.0', 'id': 4, 'method': 'listFormatters'},
+    ]
+    instream = io.BytesIO(b''.join(json.dumps(request).encode() + b'\n' for request in requests))
+    outstream = io.BytesIO()
+
+    headless_daemon.serve(headless_daemon.Server(headless_daemon.DocstringService()), instream, outstream)
+    responses = [json.loads(line) for line in outstream.getvalue().splitlines()]
+
+    assert [response['id'] for response in responses[:1] + responses[2:]] == [1, 3]
+    assert responses[1][0]['error']['code'] == headless_daemon.METHOD_NOT_FOUND
+    assert all('latency' in response for response in responses[:1] + responses[2:])
+
+
+def test_serve_malformed_content_length(headless_daemon):
+    body = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'listFormatters'}).encode()
+    header = 'Content-Length: {}\r\n\r\n'.format(len(body)).encode()
+    instream = io.BytesIO(b'Content-Length: many\r\n\r\n' + header + body)
+    outstream = io.BytesIO()
+
+    headless_daemon.serve(headless_daemon.Server(headless_daemon.DocstringService()), instream, outstream)
+    outstream.seek(0)
+    responses = [json.loads(body.decode()) for body, _ in headless_daemon.read_messages(outstream)]
+
+    assert responses[0]['error']['code'] == headless_daemon.PARSE_ERROR
+    assert responses[1]['id'] == 1
@@ -0,0 +1,85 @@
+import shutil
+import subprocess
+
+import pytest
+
+SOURCE = (
+    'def old(a):\n'
+    '    return a\n'
+    '\n'
+    '\n'
+    'def new(b):\n'
+    '    return b\n'
+)
+
+
+def test_exists(headless_diffcheck):
+    assert headless_diffcheck
+
+
+def test_parse_diff(headless_diffcheck):
+    diff = (
+        'diff --git a/a.py b/a.py\n'
+        '--- a/a.py\n'
+        '+++ b/a.py\n'
+        '@@ -1 +1 @@\n'
+        '-x\n'
+        '+y\n'
+        '@@ -5,2 +5,0 @@\n'
+        '-z\n'
+        '-w\n'
+        '@@ -9,0 +8,3 @@\n'
+        '+@@ -1 +1 @@\n'
+        '+++ c.py\n'
+        '+x\n'
+        '--- b.py\n'
+        '+++ /dev/null\n'
+        '@@ -1,2 +0,0 @@\n'
+    )
+
+    assert headless_diffcheck.parse_diff(diff) == {'a.py': {0, 4, 7, 8, 9}}
+
+
+def test_touched_definitions(headless_diffcheck):
+    from ...parsers.scanner import classify_rows, scan_definitions
+
+    rows = classify_rows('"""Module."""\nclass A:\n    def b(self):\n        pass\n\n    c = 1\n'.split('\n'))
+    definitions = scan_definitions(rows)
+
+    def touched(changed):
+        return [definition.name for definition in headless_diffcheck.touched_definitions(definitions, changed)]
+
+    assert touched({0}) == ['']
+    assert touched({3}) == ['b']
+    assert touched({3, 5}) == ['A', 'b']
+    assert touched({6}) == ['']
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+def test_git_changes(headless_diffcheck, tmpdir):
+    from ...formatters.registry import populate_registry
+    from ...formatters.utils import get_formatter_instance
+
+    def git(*args):
+        subprocess.check_call(('git', '-c', 'user.name=test', '-c', 'user.email=test@test') + args, cwd=str(tmpdir))
+
+    git('init', '-q')
+    tmpdir.join('a.py').write('"""Module."""\n' + SOURCE.split('\n\n\n')[0] + '\n')
+    tmpdir.join('untouched.py').write('def untouched(c):\n    pass\n')
+    git('add', '.')
+    git('commit', '-q', '-m', 'initial')
+
+    tmpdir.join('a.py').write('"""Module."""\n' + SOURCE)
+    tmpdir.join('untouched.py').remove()
+    git('add', 'a.py')
+
+    # Unstaged edits shift the rows of the working tree
+    tmpdir.join('a.py').write('"""Module."""\n\n\n' + SOURCE)
+
+    root, changes = headless_diffcheck.git_changes(cwd=str(tmpdir))
+    assert list(changes) == ['a.py']
+
+    populate_registry()
+    formatter = get_formatter_instance('docblock')
+    findings = list(headless_diffcheck.check_changes(formatter, root, changes, staged=True))
+    assert [(path, finding.name, finding.row) for path, finding in findings] == [('a.py', 'new', 5)]
@@ -0,0 +1,51 @@
+import io
+import json
+
+
+def test_exists(headless_export):
+    assert headless_export
+
+
+def test_export(headless_export, tmpdir):
+    tmpdir.join('a.py').write(
+        '"""Module."""\n'
+        'class Foo(Base):\n'
+        '    def bar(self, a: int, b=1):\n'
+        '        def baz():\n'
+        '            raise ValueError\n'
+        '\n'
+        '    def qux(self):\n'
+        '        return value\n'
+    )
+    tmpdir.join('b.py').write('def other(c):\n    pass\n')
+    outputs = [io.StringIO(), io.StringIO()]
+
+    assert headless_export.export([str(tmpdir)], outputs) == (2, 7)
+
+    records = [json.loads(line) for output in outputs for line in output.getvalue().splitlines()]
+    by_name = dict((record['qualname'], record) for record in records if record['path'].endswith('a.py'))
+
+    assert sorted(by_name) == ['', 'Foo', 'Foo.bar', 'Foo.bar.baz', 'Foo.qux']
+    assert by_name['Foo']['extends'] == ['Base']
+    assert by_name['Foo.bar']['line'] == 3
+    assert by_name['Foo.bar']['arguments']['arguments'] == [{'name': 'a', 'type': 'int', 'default': None}]
+    assert by_name['Foo.bar.baz']['raises'] == ['ValueError']
+    assert by_name['Foo.qux']['returns'] == {'type': None}
+    assert by_name['']['documented'] is True
+
+    # Every definition of a file lands in the shard of the file
+    for output in outputs:
+        paths = set(json.loads(line)['path'] for line in output.getvalue().splitlines())
+        assert all(headless_export.shard_of(path, 2, str(tmpdir)) == outputs.index(output) for path in paths)
+
+
+def test_shard_of_normalizes_paths(headless_export, tmpdir):
+    root = str(tmpdir)
+    shard = headless_export.shard_of(tmpdir.join('src', 'a.py').strpath, 1000, root)
+
+    with tmpdir.as_cwd():
+        assert headless_export.shard_of('./src/a.py', 1000) == shard
+        assert headless_export.shard_of('src/../src/a.py', 1000) == shard
+
+    assert headless_export.root_of(tmpdir.join('src', 'a.py').strpath, [root, str(tmpdir.join('src'))]) == \
+        str(tmpdir.join('src'))
@@ -0,0 +1,24 @@
+def test_exists(headless_replay):
+    assert headless_replay
+
+
+def test_replay_recording(headless_replay, tmpdir):
+    from ...core.profiling import Invocation, read_recording, record
+
+    path = str(tmpdir.join('recordings', 'invocations.jsonl.gz'))
+    text = 'def foo(a, b=1):\n    """\n'
+    record(path, Invocation(text, text.index('"""') + 3, {'type_rules': []}, 'docblock', {}), 0.002)
+    record(path, Invocation(text, text.index('"""') + 3, {}, 'numpy', {'extra': 1}), 0.004)
+    record(path, Invocation(text, text.index('"""') + 3, {}, 'google', {}), None)
+
+    invocations = list(read_recording(path))
+    assert [invocation.formatter for invocation, _ in invocations] == ['docblock', 'numpy', 'google']
+    assert invocations[1][0].formatter_settings == {'extra': 1}
+    assert invocations[1][1] == 0.004
+
+    reports = headless_replay.replay_recording(path, repeat=3)
+    assert [report['index'] for report in reports] == [0, 1, 2]
+    assert reports[0]['recorded_ms'] == 2
+    assert reports[2]['recorded_ms'] is None
+    assert reports[0]['characters'] == len(text)
+    assert 0 < reports[0]['min_ms'] <= reports[0]['median_ms']
@@ -5,3 +5,39 @@ import pytest
 def parser():
     from parsers import parser
     return parser
+
+
+@pytest.fixture()
+def view():
+    from parsers import view
+    return view
+
+
+@pytest.fixture()
+def scanner():
+    from parsers import scanner
+    return scanner
+
+
+@pytest.fixture()
+def locator():
+    from parsers import locator
+    return locator
+
+
+@pytest.fixture()
+def cache():
+    from parsers import cache
+    return cache
+
+
+@pytest.fixture()
+def context():
+    from parsers import context
+    return context
+
+
+@pytest.fixture()
+def guess():
+    from parsers import guess
+    return guess
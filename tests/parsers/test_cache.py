@@ -0,0 +1,151 @@
+def test_exists(cache):
+    assert cache
+
+
+def test_view_cache_invalidated_by_edits(cache):
+    class View:
+        changes = 0
+
+        def id(self):
+            return 1
+
+        def buffer_id(self):
+            return 1
+
+        def change_count(self):
+            return self.changes
+
+    view = View()
+    view_cache = cache.ViewCache()
+
+    assert view_cache.get(view, 'key', lambda: 'first') == 'first'
+    assert view_cache.get(view, 'key', lambda: 'second') == 'first'
+
+    view.changes += 1
+    assert view_cache.get(view, 'key', lambda: 'second') == 'second'
+
+
+def test_view_cache_shared_by_clones(cache):
+    class View:
+        def __init__(self, view_id, buffer_id):
+            self.view_id = view_id
+            self.buffer = buffer_id
+
+        def id(self):
+            return self.view_id
+
+        def buffer_id(self):
+            return self.buffer
+
+        def change_count(self):
+            return 0
+
+    view, clone, other = View(1, 10), View(2, 10), View(3, 20)
+    view_cache = cache.ViewCache()
+
+    assert view_cache.get(view, 'key', lambda: 'first') == 'first'
+    assert view_cache.get(clone, 'key', lambda: 'second') == 'first'
+    assert view_cache.get(other, 'key', lambda: 'other') == 'other'
+
+    view_cache.discard(view)
+    assert view_cache.get(clone, 'key', lambda: 'second') == 'first'
+
+    view_cache.discard(clone)
+    assert view_cache.get(clone, 'key', lambda: 'second') == 'second'
+
+
+def test_estimate_size(cache):
+    class View:
+        def change_count(self):
+            return 0
+
+    class Holder:
+        def __init__(self):
+            self.view = View()
+            self.items = ['x' * 1000]
+
+    assert cache.estimate_size(['x' * 1000]) > 1000
+    assert cache.estimate_size(Holder()) > 1000
+    assert cache.estimate_size([Holder().view]) < 100
+
+
+def test_cache_manager_evicts_least_recently_used(cache):
+    class View:
+        def __init__(self, view_id):
+            self.view_id = view_id
+
+        def id(self):
+            return self.view_id
+
+        def buffer_id(self):
+            return self.view_id
+
+        def change_count(self):
+            return 0
+
+    manager = cache.CacheManager(max_bytes=25000)
+    texts = cache.ViewCache('texts', manager)
+    flags = cache.ViewCache('flags', manager)
+    first, second, third = View(1), View(2), View(3)
+
+    texts.get(first, 'text', lambda: 'x' * 10000)
+    flags.get(first, 'flag', lambda: True)
+    texts.get(second, 'text', lambda: 'y' * 10000)
+    texts.get(first, 'text', lambda: 'recomputed')
+    texts.get(third, 'text', lambda: 'z' * 10000)
+
+    assert texts.get(first, 'text', lambda: 'recomputed') == 'x' * 10000
+    assert texts.get(second, 'text', lambda: 'recomputed') == 'recomputed'
+
+    usage = manager.usage()
+    assert usage['texts']['buffers'] == 3
+    assert usage['flags']['buffers'] == 0
+    assert manager.total() <= manager.max_bytes
+
+    texts.discard(first)
+    assert manager.usage()['texts']['buffers'] == 2
+
+
+class EditedView:
+    """View edited between every read."""
+
+    def __init__(self, view_id):
+        self.view_id = view_id
+        self.changes = 0
+
+    def id(self):
+        return self.view_id
+
+    def buffer_id(self):
+        return self.view_id
+
+    def change_count(self):
+        self.changes += 1
+        return self.changes
+
+
+def test_cache_manager_shared_by_threads(cache):
+    import threading
+
+    manager = cache.CacheManager(max_bytes=5000)
+    texts = cache.ViewCache('texts', manager)
+    errors = []
+
+    def use(first):
+        try:
+            views = [EditedView(first + index) for index in range(20)]
+            for _ in range(200):
+                for view in views:
+                    texts.get(view, 'text', lambda: 'x' * 500)
+                manager.usage()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=use, args=(index * 100,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert manager.total() <= manager.max_bytes
@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_exists(context):
+    assert context
+
+
+def test_analyze(context):
+    source = "def foo(a, b=1):\n    '''Summary\n    return a\n"
+    result = context.analyze(source, source.index("'''") + 3)
+
+    assert result.closed is False
+    assert result.closing_string == "'''"
+    assert result.trailing_string == 'Summary'
+    assert result.erase == (source.index('Summary'), source.index('Summary') + len('Summary'))
+    assert result.parsed[0][0] == 'arguments'
+
+
+def test_analyze_concurrently(context):
+    sources = ['def foo(a{}):\n    """\n'.format(i) for i in range(20)]
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda source: context.analyze(source, source.index('"""') + 3), sources))
+
+    names = [result.parsed[0][1]['arguments'][0]['name'] for result in results]
+    assert names == ['a{}'.format(i) for i in range(20)]
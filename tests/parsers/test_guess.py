@@ -0,0 +1,48 @@
+def test_exists(guess):
+    assert guess
+
+
+def test_guess_type_from_name(guess):
+    assert guess.guess_type_from_name('is_valid') == 'bool'
+    assert guess.guess_type_from_name('hasItems') == 'bool'
+    assert guess.guess_type_from_name('callback') == 'function'
+    assert guess.guess_type_from_name('callbacks') is None
+    assert guess.guess_type_from_name('island') is None
+
+
+def test_guess_type_from_value(guess):
+    assert guess.guess_type_from_value('1.5') == 'number'
+    assert guess.guess_type_from_value('"a"') == 'str'
+    assert guess.guess_type_from_value('[]') == 'list'
+    assert guess.guess_type_from_value('True') == 'bool'
+    assert guess.guess_type_from_value('Truthy') is None
+    assert guess.guess_type_from_value('r"\\d"') == 'regexp'
+    assert guess.guess_type_from_value('lambda: 1') is None
+    assert guess.guess_type_from_value('lambda x: x') == 'function'
+    assert guess.guess_type_from_value(None) is None
+
+
+def test_type_rules(guess):
+    rules = guess.get_type_rules([
+        ['*_id', 'int'],
+        ['df*', 'pandas.DataFrame'],
+        ['is_*', 'str'],
+        'malformed',
+        [1, 'int'],
+        ['*_at', None],
+    ])
+
+    assert rules is guess.get_type_rules([('*_id', 'int'), ('df*', 'pandas.DataFrame'), ('is_*', 'str')])
+    assert rules.guess('user_id') == 'int'
+    assert rules.guess('df_sales') == 'pandas.DataFrame'
+    assert rules.guess('is_ready') == 'str'
+    assert rules.guess('hasItems') == 'bool'
+    assert rules.guess('user_ids') is None
+    assert rules.memo['user_id'] == 'int'
+
+
+def test_parser_type_rules(parser):
+    settings = {'type_rules': [['*_at', 'datetime']]}
+    arguments = dict(parser.PythonParser(settings).parse('def foo(created_at, is_x, other):', ''))['arguments']
+
+    assert [argument['type'] for argument in arguments['arguments']] == ['datetime', 'bool', None]
@@ -0,0 +1,50 @@
+def scoped_view(view, source, selectors):
+    class ScopedView(view.StringView):
+        def find_by_selector(self, selector):
+            return selectors.get(selector, [])
+
+    return ScopedView(source)
+
+
+def test_exists(locator):
+    assert locator
+
+
+def test_definition_before(locator, view):
+    source = 'def foo(a,\n        b):\n    """\n\nx = 1\n    """\n'
+    definition = view.Region(0, source.index(':') + 1)
+    string_view = scoped_view(view, source, {locator.DEFINITION_SELECTOR: [definition]})
+    scope_locator = locator.ScopeLocator(string_view)
+
+    assert scope_locator.definition_before(source.index('"""')) == 'def foo(a, b):'
+    assert scope_locator.definition_before(source.rindex('"""')) is None
+
+
+def test_unscoped_view_falls_back(locator, view, parser):
+    source = 'def foo(a):\n    """\n'
+    string_view = view.StringView(source)
+
+    assert locator.ScopeLocator(string_view).is_available() is False
+    assert parser.PythonParser.get_definition(string_view, source.index('"""')) == 'def foo(a):'
+
+
+def test_get_definition_scans_only_with_locator(locator, view, parser):
+    source = 'def foo(a,\n        b):\n    """\n'
+    definition = view.Region(0, source.index(':') + 1)
+    scans = []
+
+    class CountingView(view.StringView):
+        def find_by_selector(self, selector):
+            scans.append(selector)
+            return {locator.DEFINITION_SELECTOR: [definition]}.get(selector, [])
+
+    string_view = CountingView(source)
+    scope_locator = locator.ScopeLocator(string_view)
+    position = source.index('"""')
+
+    assert parser.PythonParser.get_definition(string_view, position) == 'def foo(a, b):'
+    assert scans == []
+
+    for _ in range(2):
+        assert parser.PythonParser.get_definition(string_view, position, scope_locator) == 'def foo(a, b):'
+    assert scans == [locator.DEFINITION_SELECTOR]
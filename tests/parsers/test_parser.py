@@ -1,2 +1,87 @@
 def test_exists(parser):
     assert parser
+
+
+def test_get_definition_wrapped(parser, view):
+    source = (
+        'class Foo:\n'
+        '    @decorator(\n'
+        '        x=1)\n'
+        '    def foo(\n'
+        '        self,\n'
+        '        a: int,\n'
+        '        b=")",\n'
+        '    ) -> int:\n'
+        '        """\n'
+        '        return a\n'
+    )
+    string_view = view.StringView(source)
+    position = source.index('"""') + 3
+    python_parser = parser.PythonParser()
+
+    line = python_parser.get_definition(string_view, position)
+    contents = python_parser.get_definition_contents(string_view, string_view.line(position).end())
+    output = python_parser.parse(line, contents)
+
+    assert line == 'def foo( self, a: int, b=")", ) -> int:'
+    assert contents.startswith('@decorator( x=1)\n')
+    assert output[0] == ('decorators', ['decorator'])
+    assert [argument['name'] for argument in output[1][1]['arguments']] == ['a']
+    assert output[2][0] == 'returns'
+
+
+def test_get_definition_single_line(parser, view):
+    source = 'def foo(a):\n    """\n'
+    string_view = view.StringView(source)
+
+    assert parser.PythonParser.get_definition(string_view, source.index('"""')) == 'def foo(a):'
+
+
+def test_tokenize_lines(parser, view):
+    string_view = view.StringView('x = 1\n\n    # comment\ny = 2\nz = 3\n')
+    tokens = parser.tokenize_lines(string_view, parser.iter_lines(string_view, 0))
+
+    assert [token.kind for token in tokens][:3] == [parser.BLANK, parser.COMMENT, parser.CODE]
+
+
+def test_tokenize_lines_is_lazy(parser, view):
+    class BlankView(view.StringView):
+        def indentation_level(self, point):
+            raise AssertionError('indentation looked up for a blank line')
+
+    string_view = BlankView('x = 1\n\n    # comment\ny = 2\nz = 3\n')
+
+    def first_line():
+        lines = parser.iter_lines(string_view, 0)
+        yield next(lines)
+        raise AssertionError('read past the first line')
+
+    token = next(parser.tokenize_lines(string_view, first_line()))
+
+    assert token.kind == parser.BLANK
+    assert token.indentation is None
+
+
+def test_parse_lines(parser, view):
+    source = (
+        'class Foo(Base):\n'
+        '    """\n'
+        '    x = 1\n'
+        '\n'
+        '    @property\n'
+        '    def bar(self, a: int) -> str:\n'
+        '        """\n'
+        '        raise ValueError\n'
+        '        return a\n'
+    )
+    string_view = view.StringView(source)
+    python_parser = parser.PythonParser()
+
+    for quotes in (source.index('"""'), source.rindex('"""')):
+        position = string_view.line(quotes).end()
+        line = python_parser.get_definition(string_view, quotes)
+        lines = python_parser.read_contents(string_view, position)
+
+        assert isinstance(lines, list)
+        assert python_parser.parse(line, lines) == python_parser.parse(
+            line, python_parser.get_definition_contents(string_view, position))
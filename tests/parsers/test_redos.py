@@ -0,0 +1,60 @@
+import random
+import time
+
+import pytest
+
+# Characters each line is long, and seconds a line may take to parse
+LENGTH = 50000
+LINE_BUDGET = 0.5
+
+ADVERSARIAL = [
+    ' ' * LENGTH + 'from x',
+    '\n' * LENGTH + 'from x',
+    'a' * LENGTH,
+    'a: b[' * (LENGTH // 5),
+    ')' * LENGTH,
+    '): ' + ' ' * LENGTH + 'x',
+    '@' + 'a' * LENGTH + '(' + ')' * LENGTH,
+    '"""' + '"' * LENGTH,
+    'x = ' + '[' * LENGTH,
+    ')->x[' * (LENGTH // 2) + '):',
+]
+
+
+def fuzz_lines(count=20, seed=0):
+    alphabet = ' \t\n:,()[]{}=@-><.\'"\\#*aA_'
+    generator = random.Random(seed)
+    return [''.join(generator.choice(alphabet) for _ in range(LENGTH // 10)) for _ in range(count)]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize('line', ADVERSARIAL + fuzz_lines(), ids=lambda line: repr(line[:12]))
+def test_parse_bounded(parser, line):
+    python_parser = parser.PythonParser()
+
+    assert timed(python_parser.parse, None, line) < LINE_BUDGET
+    assert timed(python_parser.parse, 'class A(' + line + '):', line) < LINE_BUDGET
+    assert timed(python_parser.parse, 'def f(' + line + ') -> ' + line + ':', 'def f():\n' + line) < LINE_BUDGET
+    assert timed(python_parser.parse, 'def f(' + line, 'def f(' + line + '\n    return x\n') < LINE_BUDGET
+
+
+@pytest.mark.parametrize('line', ADVERSARIAL, ids=lambda line: repr(line[:12]))
+def test_docstring_bounded(parser, view, line):
+    source = 'def f(' + line + '):\n    """\n' + line
+    string_view = view.StringView(source)
+    position = source.index('"""') + 3
+
+    assert timed(parser.docstring_closing, string_view, position) < LINE_BUDGET
+    assert timed(parser.PythonParser.get_definition, string_view, position) < LINE_BUDGET
+
+
+@pytest.mark.parametrize('line', ADVERSARIAL, ids=lambda line: repr(line[:12]))
+def test_analyze_bounded(context, line):
+    source = 'def f(a):\n    """a' + line.replace('\n', ' ') + 'b\n'
+
+    assert timed(context.analyze, source, source.index('"""') + 3) < LINE_BUDGET
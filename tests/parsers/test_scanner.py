@@ -0,0 +1,50 @@
+SOURCE = '''"""Module."""
+x = 1
+
+
+@decorator(
+    arg=1)
+def foo(a,
+        b=2):
+    """Foo.
+
+    def fake():
+    """
+    return a
+
+
+class Bar(Base):
+    y = 'y'
+
+    def baz(self):
+        pass
+'''
+
+
+def test_exists(scanner):
+    assert scanner
+
+
+def test_scan_definitions(scanner):
+    definitions = scanner.scan_definitions(scanner.classify_rows(SOURCE.split('\n')))
+
+    assert [(d.kind, d.name, d.start, d.row, d.body, d.end, d.docstring) for d in definitions] == [
+        ('module', '', 0, None, 0, 19, (0, 0)),
+        ('function', 'foo', 4, 6, 8, 12, (8, 11)),
+        ('class', 'Bar', 15, 15, 16, 19, None),
+        ('function', 'baz', 18, 18, 19, 19, None),
+    ]
+
+
+def test_parse_definitions(scanner):
+    parsed = dict((definition.name, output) for definition, output in scanner.parse_definitions(SOURCE))
+
+    assert parsed['foo'][0] == ('decorators', ['decorator'])
+    assert parsed['foo'][2] == ('returns', {'type': None})
+    assert parsed['Bar'] == [('extends', ['Base']), ('variables', [{'name': 'y', 'type': 'str', 'default': "'y'"}])]
+
+
+def test_strip_comment(scanner):
+    assert scanner.strip_comment('def f(a):  # comment') == 'def f(a):  '
+    assert scanner.strip_comment("def f(a='#', b=\"#\"):") == "def f(a='#', b=\"#\"):"
+    assert scanner.strip_comment('x = 1') == 'x = 1'
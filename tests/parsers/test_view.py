@@ -0,0 +1,11 @@
+def test_exists(view):
+    assert view
+
+
+def test_line_and_indentation(view):
+    string_view = view.StringView('class A:\n    x = 1\n\tdef b():\n')
+
+    assert string_view.substr(string_view.line(12)) == '    x = 1'
+    assert string_view.indentation_level(12) == 1
+    assert string_view.indentation_level(string_view.text_point(2, 0)) == 1
+    assert string_view.line(string_view.size()) == view.Region(29, 29)
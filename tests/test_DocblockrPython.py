@@ -1,2 +1,9 @@
 def test_exists(root_DocblockrPython):
     assert root_DocblockrPython
+
+
+def test_plugin_loaded_without_cache_size(root_DocblockrPython, sublime):
+    sublime.load_settings.return_value = {'cache_size': None}
+    root_DocblockrPython.plugin_loaded()
+
+    assert root_DocblockrPython.cache_manager.max_bytes == 32 * 1024 * 1024
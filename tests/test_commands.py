@@ -1,2 +1,140 @@
 def test_exists(root_commands):
     assert root_commands
+
+
+def test_docstring_edits(root_commands, monkeypatch):
+    from formatters.registry import populate_registry
+    from formatters.regenerate import template
+    from formatters.utils import get_formatter_instance
+    from parsers.parser import PythonParser
+    from parsers.view import Region, StringView
+
+    monkeypatch.setattr(root_commands.sublime, 'Region', Region)
+    populate_registry()
+    source = (
+        'def foo(a: int, d):\n'
+        '    """Summary.\n'
+        '\n'
+        '    Kept as written.\n'
+        '\n'
+        '    Arguments:\n'
+        '        a {str} -- First\n'
+        '        c {[type]} -- Gone\n'
+        '    """\n'
+    )
+    view = StringView(source)
+    docstring = root_commands.find_docstring(view, source.index('Kept'))
+    parser = PythonParser()
+    output = parser.parse('def foo(a: int, d):', '')
+    templates = template(get_formatter_instance('docblock'), output, '    ', '    ')
+
+    for region, text in root_commands.docstring_edits(view, docstring, templates):
+        source = source[:region.begin()] + text + source[region.end():]
+
+    assert source == (
+        'def foo(a: int, d):\n'
+        '    """Summary.\n'
+        '\n'
+        '    Kept as written.\n'
+        '\n'
+        '    Arguments:\n'
+        '        a {int} -- First\n'
+        '        d {[type]} -- [description]\n'
+        '    """\n'
+    )
+
+
+def test_write_plain(root_commands, monkeypatch):
+    from parsers.view import Region, StringView
+
+    class Selection(list):
+        add = list.append
+
+    class EditableView(StringView):
+        def insert(self, edit, position, text):
+            self.text = self.text[:position] + text + self.text[position:]
+
+    monkeypatch.setattr(root_commands.sublime, 'Region', Region)
+    view = EditableView('def foo():\n    """', position=18, settings={'translate_tabs_to_spaces': True})
+    view._selection = Selection(view.sel())
+
+    root_commands.write_plain(view, None, '${1:[summary]}\n\n${2:[description]}\n"""')
+
+    assert view.text == 'def foo():\n    """[summary]\n\n    [description]\n    """'
+    assert list(view.sel()) == [Region(18, 27)]
+
+
+def test_profile_session(root_commands):
+    calls = []
+    session = root_commands.ProfileSession(2)
+
+    assert session.run(calls.append, 1) is False
+    assert session.run(calls.append, 2) is True
+    assert calls == [1, 2]
+
+
+def test_regenerate_class(root_commands, monkeypatch):
+    from formatters.registry import populate_registry
+    from formatters.utils import get_formatter_instance
+    from parsers.parser import PythonParser
+    from parsers.view import Region, StringView
+
+    monkeypatch.setattr(root_commands.sublime, 'Region', Region)
+    populate_registry()
+    source = (
+        'class Foo(Base):\n'
+        '    """Summary.\n'
+        '\n'
+        '    Some description here.\n'
+        '\n'
+        '    Extends:\n'
+        '        Base\n'
+        '\n'
+        '    Variables:\n'
+        '        x {number} -- Kept\n'
+        '    """\n'
+        '\n'
+        '    x = 1\n'
+        '    y = \'a\'\n'
+    )
+    view = StringView(source, settings={'translate_tabs_to_spaces': True})
+    docstring = root_commands.find_docstring(view, source.index('Some'))
+    edits = root_commands.regenerate_edits(view, docstring, PythonParser(), get_formatter_instance('docblock'))
+
+    for region, text in edits:
+        source = source[:region.begin()] + text + source[region.end():]
+
+    assert source == (
+        'class Foo(Base):\n'
+        '    """Summary.\n'
+        '\n'
+        '    Some description here.\n'
+        '\n'
+        '    Extends:\n'
+        '        Base\n'
+        '\n'
+        '    Variables:\n'
+        '        x {number} -- Kept\n'
+        '        y {str} -- [description]\n'
+        '    """\n'
+        '\n'
+        '    x = 1\n'
+        '    y = \'a\'\n'
+    )
+
+
+def test_get_locator_per_change(root_commands):
+    from parsers.view import StringView
+
+    class EditedView(StringView):
+        edits = 0
+
+        def change_count(self):
+            return self.edits
+
+    view = EditedView('def foo():\n    """Foo."""\n')
+    locator = root_commands.get_locator(view)
+
+    assert root_commands.get_locator(view) is locator
+    view.edits += 1
+    assert root_commands.get_locator(view) is not locator
@@ -0,0 +1,94 @@
+from parsers.view import Region, StringView
+
+
+def test_exists(root_listeners):
+    assert root_listeners
+
+
+def test_in_open_docstring(root_listeners, monkeypatch):
+    monkeypatch.setattr(root_listeners.sublime, 'Region', Region)
+    source = 'def foo():\n    """\n    """text\n'
+    view = StringView(source)
+
+    assert root_listeners.in_open_docstring(view, source.index('"""') + 3) is True
+    assert root_listeners.in_open_docstring(view, source.index('text') + 4) is False
+
+
+def test_build_completions(root_listeners, monkeypatch):
+    source = 'def foo(a, b: int = 1):  # note\n    """\n    raise KeyError\n    """\n    raise ValueError(a)\n'
+    view = StringView(source)
+    monkeypatch.setattr(root_listeners.sublime, 'Region', Region)
+    signature = root_listeners.read_signature(view, Region(source.index('"""'), source.rindex('"""') + 3))
+
+    assert signature[1] == ['def foo(a, b: int = 1):  # note', '    raise ValueError(a)']
+    assert root_listeners.build_completions(view, *signature) == [
+        ['a\targument', 'a'],
+        ['b\tint = 1', 'b'],
+        ['ValueError\traises', 'ValueError'],
+    ]
+
+
+def test_read_signature_of_other_strings(root_listeners, monkeypatch):
+    source = 'def foo(a):\n    x = 1\n    """Not a docstring."""\n    y = """Nor this."""\n'
+    view = StringView(source)
+    monkeypatch.setattr(root_listeners.sublime, 'Region', Region)
+
+    for text in ('"""Not', '"""Nor'):
+        begin = source.index(text)
+        assert root_listeners.read_signature(view, Region(begin, source.index('."""', begin) + 4)) is None
+
+
+def test_format_usage(root_listeners):
+    usage = {'locators': {'buffers': 2, 'bytes': 2048}, 'open_docstrings': {'buffers': 0, 'bytes': 0}}
+
+    assert root_listeners.format_usage(usage, 4096) == (
+        'DocBlockr Python caches: 2.0 KB of 4.0 KB\n'
+        '  locators: 2 buffers, 2.0 KB\n'
+        '  open_docstrings: 0 buffers, 0.0 KB\n'
+    )
+
+
+def test_lint_regions(root_listeners, monkeypatch):
+    from formatters.lint import Finding
+
+    monkeypatch.setattr(root_listeners.sublime, 'Region', Region)
+    view = StringView('def foo(a):\n    """Foo."""\n\n\ndef bar():\n    pass\n')
+    findings = [
+        Finding(0, 'signature-drift', 'foo', 'first'),
+        Finding(0, 'signature-drift', 'foo', 'second'),
+        Finding(4, 'missing-docstring', 'bar', 'third'),
+    ]
+
+    regions, messages = root_listeners.lint_regions(view, findings)
+
+    assert regions == [Region(0, 11), Region(29, 39)]
+    assert messages == [['first', 'second'], ['third']]
+
+
+def test_undocumented(root_listeners, monkeypatch):
+    from formatters.lint import Finding
+
+    monkeypatch.setattr(root_listeners.sublime, 'Region', Region)
+    source = (
+        'class Foo:\n'
+        '    def bar(self, a):\n'
+        '        """Bar.\n'
+        '\n'
+        '        Arguments:\n'
+        '            b {} -- Gone\n'
+        '        """\n'
+        '\n'
+        '    def baz(self):\n'
+        '        """Baz."""\n'
+    )
+    view = StringView(source)
+    definitions = root_listeners.get_definition_index(view)
+    findings = [Finding(5, 'signature-drift', 'bar', 'documents `b`, which the signature no longer has')]
+
+    assert root_listeners.get_definition_index(view) is definitions
+    items = root_listeners.undocumented(definitions, findings)
+
+    assert [(definition.name, message) for definition, message in items] == [
+        ('Foo', 'no docstring'),
+        ('bar', 'documents `b`, which the signature no longer has'),
+    ]